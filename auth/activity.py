@@ -0,0 +1,86 @@
+import atexit
+import os
+import threading
+import time
+
+from .user_management import update_users_activity
+
+"""
+Write-behind tracking of users.last_active.
+
+Requests only record the user in memory. A background thread writes the
+collected timestamps in one multi-row UPDATE every ACTIVITY_FLUSH_SECONDS,
+and whatever is still pending is flushed when the process exits. Each user is
+written at most once per interval, which is plenty for the anonymous cleanup
+(its max age is measured in hours).
+"""
+
+ACTIVITY_FLUSH_SECONDS = int(os.getenv("ACTIVITY_FLUSH_SECONDS", 60))
+
+_lock = threading.Lock()
+_pending = {}        # user_id -> epoch seconds of latest activity, not yet written
+_last_written = {}   # user_id -> epoch seconds of the last write that included them
+_flusher = None
+
+
+def record_activity(user_id):
+    """
+    Notes that the user was active now. Never touches the database.
+    """
+    user_id = int(user_id)
+    now = time.time()
+    with _lock:
+        last = _last_written.get(user_id)
+        if user_id not in _pending and last is not None and now - last < ACTIVITY_FLUSH_SECONDS:
+            return
+        _pending[user_id] = now
+    _ensure_flusher()
+
+
+def flush():
+    """
+    Writes all pending timestamps. Returns the number of users written.
+    On failure they are put back so the next flush retries them.
+    """
+    global _pending
+    with _lock:
+        batch, _pending = _pending, {}
+    if not batch:
+        return 0
+
+    try:
+        update_users_activity(batch)
+    except Exception as e:
+        with _lock:
+            for user_id, ts in batch.items():
+                _pending[user_id] = max(ts, _pending.get(user_id, 0))
+        print(f"Activity flush failed: {type(e).__name__}")
+        return 0
+
+    now = time.time()
+    with _lock:
+        _last_written.update(batch)
+        # Entries older than one interval no longer throttle anything
+        for user_id in [u for u, ts in _last_written.items() if now - ts >= ACTIVITY_FLUSH_SECONDS]:
+            del _last_written[user_id]
+    return len(batch)
+
+
+def _run():
+    while True:
+        time.sleep(ACTIVITY_FLUSH_SECONDS)
+        flush()
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _lock:
+        if _flusher is not None and _flusher.is_alive():
+            return
+        _flusher = threading.Thread(target=_run, name="activity-flusher", daemon=True)
+        _flusher.start()
+
+
+atexit.register(flush)
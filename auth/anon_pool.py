@@ -0,0 +1,93 @@
+import os
+import threading
+from contextlib import closing
+
+from db.functions.connect import get_auth_db
+from .user_management import claim_anonymous_user, count_anonymous_pool, create_anonymous_user
+
+"""
+Pool of pre-provisioned anonymous users for "try anonymous".
+
+Creating an anonymous user (password hash, user + tenant inserts) is slow, so
+a background thread keeps ANON_POOL_SIZE of them ready with role
+'AnonymousPool'. A sign-up claims one with a single UPDATE and only falls
+back to creating a user inline when the pool is empty. Pooled users are not
+'Anonymous' until claimed, so the anonymous cleanup leaves them alone.
+
+Refills are serialized across workers with a MySQL named lock, so the pool
+isn't overfilled by several processes topping it up at once.
+"""
+
+ANON_POOL_SIZE = int(os.getenv("ANON_POOL_SIZE", 20))
+ANON_POOL_REFILL_SECONDS = int(os.getenv("ANON_POOL_REFILL_SECONDS", 60))
+
+_REFILL_LOCK_NAME = "anon_pool_refill"
+
+_wake = threading.Event()
+_filler = None
+_filler_lock = threading.Lock()
+
+
+def claim():
+    """
+    Returns (user_id, tenant_id) for a new anonymous session.
+    """
+    claimed = None
+    if ANON_POOL_SIZE > 0:
+        _ensure_filler()
+        try:
+            claimed = claim_anonymous_user()
+        except Exception as e:
+            print(f"Anonymous pool claim failed: {type(e).__name__}")
+        _wake.set()
+
+    if claimed is None:
+        return create_anonymous_user()
+    return claimed
+
+
+def refill():
+    """
+    Tops the pool up to ANON_POOL_SIZE. Returns the number of users created,
+    or 0 if another worker holds the refill lock.
+    """
+    conn = get_auth_db()
+    if conn is None:
+        return 0
+
+    created = 0
+    try:
+        with closing(conn.cursor()) as cur:
+            cur.execute("SELECT GET_LOCK(%s, 0)", (_REFILL_LOCK_NAME,))
+            if cur.fetchone()[0] != 1:
+                return 0
+            try:
+                missing = ANON_POOL_SIZE - count_anonymous_pool()
+                for _ in range(max(missing, 0)):
+                    create_anonymous_user(role="AnonymousPool")
+                    created += 1
+            finally:
+                cur.execute("SELECT RELEASE_LOCK(%s)", (_REFILL_LOCK_NAME,))
+                cur.fetchone()
+    finally:
+        conn.close()
+    return created
+
+
+def _run():
+    while True:
+        try:
+            refill()
+        except Exception as e:
+            print(f"Anonymous pool refill failed: {type(e).__name__}")
+        _wake.wait(ANON_POOL_REFILL_SECONDS)
+        _wake.clear()
+
+
+def _ensure_filler():
+    global _filler
+    with _filler_lock:
+        if _filler is not None and _filler.is_alive():
+            return
+        _filler = threading.Thread(target=_run, name="anon-pool-filler", daemon=True)
+        _filler.start()
@@ -1,58 +1,100 @@
 import os
+from contextlib import closing
 from dotenv import load_dotenv
 from db.functions.connect import get_auth_db, get_db
 
 load_dotenv()
 ANON_MAX_AGE_SECONDS = int(os.getenv("ANON_MAX_AGE_SECONDS"))
+CLEANUP_CHUNK_SIZE = int(os.getenv("CLEANUP_CHUNK_SIZE", 200))
 
+"""
+Removes expired anonymous users and their tenants' data, in bounded chunks.
 
-def cleanup():
-    auth_conn = get_auth_db()
-    if auth_conn is None:
-        print("Cleanup failed: could not connect to auth DB")
-        return
+Phase 1 (auth DB): clean_anon_users deletes up to CLEANUP_CHUNK_SIZE expired
+tenants per call, oldest first, and records their ids in tenant_cleanup_queue.
+Each chunk is committed on its own.
 
-    deleted_tenant_ids = []
-    auth_cur = None
-    try:
-        auth_cur = auth_conn.cursor()
+Phase 2 (main DB): queued ids are taken in tenant_id order, CLEANUP_CHUNK_SIZE
+at a time. Their data is removed with delete_tenant_data and committed, and
+only then are they removed from the queue. The queue is the resume point: an
+interrupted run (or a main DB outage) leaves the remaining ids queued for the
+next run.
+"""
 
-        auth_cur.execute("SELECT COUNT(*) FROM users WHERE role = 'Anonymous'")
-        before = auth_cur.fetchone()[0]
 
-        auth_cur.callproc("clean_anon_users", [ANON_MAX_AGE_SECONDS])
-        for result in auth_cur.stored_results():
-            deleted_tenant_ids.extend(row[0] for row in result.fetchall())
-        auth_conn.commit()
+def _expire_auth_tenants(auth_conn):
+    removed = 0
+    with closing(auth_conn.cursor()) as cur:
+        while True:
+            cur.callproc("clean_anon_users", [ANON_MAX_AGE_SECONDS, CLEANUP_CHUNK_SIZE])
+            chunk = []
+            for result in cur.stored_results():
+                chunk.extend(row[0] for row in result.fetchall())
+            auth_conn.commit()
 
-        auth_cur.execute("SELECT COUNT(*) FROM users WHERE role = 'Anonymous'")
-        after = auth_cur.fetchone()[0]
+            removed += len(chunk)
+            if len(chunk) < CLEANUP_CHUNK_SIZE:
+                return removed
 
-        print(f"Auth cleanup: removed {before - after} anonymous users (was {before}, now {after}, max age {ANON_MAX_AGE_SECONDS}s)")
-    finally:
-        if auth_cur:
-            auth_cur.close()
-        auth_conn.close()
 
-    if not deleted_tenant_ids:
-        return
+def _next_queued(auth_cur, after):
+    auth_cur.execute(
+        "SELECT tenant_id FROM tenant_cleanup_queue WHERE tenant_id > %s ORDER BY tenant_id LIMIT %s",
+        (after, CLEANUP_CHUNK_SIZE)
+    )
+    return [row[0] for row in auth_cur.fetchall()]
+
+
+def _drain_queue(auth_conn, main_conn):
+    cleaned = 0
+    after = 0
+    with closing(auth_conn.cursor()) as auth_cur, closing(main_conn.cursor()) as main_cur:
+        while True:
+            tenant_ids = _next_queued(auth_cur, after)
+            auth_conn.commit()
+            if not tenant_ids:
+                return cleaned
+
+            main_cur.callproc("delete_tenant_data", [",".join(map(str, tenant_ids))])
+            main_conn.commit()
 
-    # Cascade cleanup into local_food_db
-    main_conn = get_db()
-    if main_conn is None:
-        print(f"Warning: auth cleanup ran but could not connect to main DB. orphaned tenant_ids: {deleted_tenant_ids}")
-        return
+            placeholders = ", ".join(["%s"] * len(tenant_ids))
+            auth_cur.execute(
+                f"DELETE FROM tenant_cleanup_queue WHERE tenant_id IN ({placeholders})",
+                tenant_ids
+            )
+            auth_conn.commit()
+
+            cleaned += len(tenant_ids)
+            after = tenant_ids[-1]
+
+
+def cleanup():
+    """
+    Returns the number of tenants whose data was removed from the main DB.
+    """
+    auth_conn = get_auth_db()
+    if auth_conn is None:
+        raise RuntimeError("Cleanup failed: could not connect to auth DB")
 
-    main_cur = None
     try:
-        main_cur = main_conn.cursor()
-        main_cur.callproc("delete_tenant_data", [",".join(map(str, deleted_tenant_ids))])
-        main_conn.commit()
-        print(f"Main cleanup: removed data for {len(deleted_tenant_ids)} tenants")
+        removed = _expire_auth_tenants(auth_conn)
+        print(f"Auth cleanup: removed {removed} anonymous users (max age {ANON_MAX_AGE_SECONDS}s)")
+
+        # Cascade cleanup into local_food_db, including anything left queued by earlier runs
+        main_conn = get_db()
+        if main_conn is None:
+            print("Warning: could not connect to main DB. Tenant data stays queued for the next run")
+            return 0
+
+        try:
+            cleaned = _drain_queue(auth_conn, main_conn)
+            print(f"Main cleanup: removed data for {cleaned} tenants")
+            return cleaned
+        finally:
+            main_conn.close()
     finally:
-        if main_cur:
-            main_cur.close()
-        main_conn.close()
+        auth_conn.close()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,8 @@
 from flask import request, redirect, url_for, g
 import jwt
 from .tokens import verify_access_token, verify_recovery_cookie, mint_access_token, sign_recovery_cookie
-from .user_management import get_user_totp, update_user_activity
+from .user_management import get_user_totp
+from .activity import record_activity
 
 
 """
@@ -32,7 +33,9 @@ def install_auth_middleware(app):
             g.username = payload.get('username') 
             g.is_anonymous = payload.get('anon', False)
 
-            if not g.is_anonymous and request.endpoint not in ['auth.totp_setup', 'auth.totp_confirm', 'static', 'logout']:
+            # Tokens minted after TOTP confirmation carry the "totp" claim;
+            # only tokens without it need the auth DB lookup
+            if not g.is_anonymous and not payload.get('totp') and request.endpoint not in ['auth.totp_setup', 'auth.totp_confirm', 'static', 'logout']:
                 totp_data = get_user_totp(g.user_id)
                 if not totp_data or not totp_data.get('totp_confirmed'):
                     return redirect(url_for('auth.totp_setup'))
@@ -78,6 +81,6 @@ def install_auth_middleware(app):
         response.set_cookie("token", token, httponly=True, samesite="Lax", max_age = app.config["JWT_ACCESS_TTL_SECONDS"])
         recovery = sign_recovery_cookie(g.user_id, g.tenant_id)
         response.set_cookie("anon_recovery", recovery, httponly=True, samesite="Lax", max_age = app.config["ANON_RECOVERY_TTL_SECONDS"])
-        update_user_activity(g.user_id)
+        record_activity(g.user_id)
         return response
 
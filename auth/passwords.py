@@ -1,9 +1,56 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from werkzeug.security import generate_password_hash, check_password_hash
 
-"""manages hashing and validating user password"""
+"""manages hashing and validating user password
+
+Hashing runs on a bounded thread pool (hashlib's scrypt/PBKDF2 release the GIL)
+so a login burst can only use PASSWORD_HASH_WORKERS cores. At most
+PASSWORD_HASH_QUEUE more requests may wait for a worker; past that,
+HashingBusy is raised right away instead of tying up request threads.
+
+PASSWORD_HASH_METHOD is any werkzeug method string, e.g. "scrypt:32768:8:1"
+or "pbkdf2:sha256:600000". Hashes made with other parameters still verify,
+and needs_rehash() tells login to upgrade them.
+"""
+
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", 32))
+
+
+class HashingBusy(RuntimeError):
+    """Raised when the hashing queue is full."""
+
+
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE)
+
+
+def _submit(func, *args):
+    if not _slots.acquire(blocking=False):
+        raise HashingBusy("Too many password operations in progress")
+    try:
+        future = _executor.submit(func, *args)
+    except Exception:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+
+def _run(func, *args):
+    return _submit(func, *args).result()
+
 
 # Pre-calculated hash for timing attack mitigation (username enumeration)
-DUMMY_HASH = generate_password_hash("timing_attack_mitigation_constant")
+DUMMY_HASH = generate_password_hash("timing_attack_mitigation_constant", method=PASSWORD_HASH_METHOD)
+
+# Fully expanded method (e.g. "scrypt" -> "scrypt:32768:8:1"), as stored in hashes
+_METHOD_PREFIX = DUMMY_HASH.split("$", 1)[0]
+
 
 def hash_password(password: str) -> str:
     if not password:
@@ -11,9 +58,35 @@ def hash_password(password: str) -> str:
     password = password.strip()
     if len(password) < 10:
         raise ValueError("Password must be at least 10 characters")
-    return generate_password_hash(password)
+    return _run(generate_password_hash, password, PASSWORD_HASH_METHOD)
 
 def verify_password(password_hash: str, password_attempt: str) -> bool:
     if not password_hash or not password_attempt:
         return False
-    return check_password_hash(password_hash, password_attempt.strip())
\ No newline at end of file
+    return _run(check_password_hash, password_hash, password_attempt.strip())
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """
+    True if the hash was made with different parameters than PASSWORD_HASH_METHOD.
+    """
+    return bool(password_hash) and password_hash.split("$", 1)[0] != _METHOD_PREFIX
+
+
+def rehash_in_background(password: str, on_hashed) -> bool:
+    """
+    Hashes a just-verified password with the current parameters and passes the
+    new hash to `on_hashed`, without blocking the caller. Skipped (returns
+    False) when the queue is full; the next login will try again.
+    """
+    def work():
+        try:
+            on_hashed(generate_password_hash(password.strip(), method=PASSWORD_HASH_METHOD))
+        except Exception as e:
+            print(f"Password rehash failed: {type(e).__name__}")
+
+    try:
+        _submit(work)
+        return True
+    except HashingBusy:
+        return False
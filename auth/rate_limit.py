@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+
+from db.functions.connect import get_auth_db
+
+"""
+Sliding-window rate limiting for the auth endpoints.
+
+Each (bucket, key) keeps two counters: hits in the current fixed window and
+hits in the previous one. The previous count is weighted by how much of it
+still overlaps the sliding window, so a check is O(1) no matter how many
+attempts were made.
+
+Backends (RATE_LIMIT_BACKEND):
+    memory  per-process, LRU-bounded to RATE_LIMIT_MAX_KEYS keys (default)
+    mysql   shared by every worker and node through the auth DB
+If the mysql backend can't reach the database, the check falls back to memory.
+"""
+
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 10000))
+
+# MySQL key column width; longer keys are cut (only ever collide with themselves)
+_MAX_KEY_LENGTH = 255
+
+_lock = threading.Lock()
+_counters = OrderedDict()  # (bucket, key) -> [window_start, current_hits, previous_hits]
+
+
+def _window_start(now, window_seconds):
+    return int(now) - int(now) % window_seconds
+
+
+def _estimate(current, previous, now, start, window_seconds):
+    overlap = (window_seconds - (now - start)) / window_seconds
+    return previous * overlap + current
+
+
+def _memory_hit(bucket, key, limit, window_seconds):
+    now = time.time()
+    start = _window_start(now, window_seconds)
+
+    with _lock:
+        entry = _counters.get((bucket, key))
+        if entry is None:
+            entry = [start, 0, 0]
+            _counters[(bucket, key)] = entry
+        else:
+            _counters.move_to_end((bucket, key))
+
+        if entry[0] != start:
+            # Roll forward; a gap of more than one window leaves nothing to carry
+            entry[2] = entry[1] if start - entry[0] == window_seconds else 0
+            entry[1] = 0
+            entry[0] = start
+
+        if _estimate(entry[1], entry[2], now, start, window_seconds) >= limit:
+            return False
+
+        entry[1] += 1
+
+        while len(_counters) > RATE_LIMIT_MAX_KEYS:
+            _counters.popitem(last=False)
+        return True
+
+
+def _mysql_hit(bucket, key, limit, window_seconds):
+    conn = get_auth_db()
+    if conn is None:
+        return _memory_hit(bucket, key, limit, window_seconds)
+
+    try:
+        with closing(conn.cursor(dictionary=True)) as cur:
+            cur.callproc("rate_limit_hit", [bucket, key[:_MAX_KEY_LENGTH], window_seconds, limit])
+            rows = []
+            for r in cur.stored_results():
+                rows.extend(r.fetchall())
+            conn.commit()
+        return bool(rows and rows[0]["allowed"])
+    except Exception as e:
+        print(f"Rate limit DB error: {type(e).__name__}")
+        return _memory_hit(bucket, key, limit, window_seconds)
+    finally:
+        conn.close()
+
+
+BACKENDS = {
+    "memory": _memory_hit,
+    "mysql": _mysql_hit,
+}
+
+_backend = BACKENDS[os.getenv("RATE_LIMIT_BACKEND", "memory")]
+
+
+def set_backend(name):
+    """
+    Switches the backend for this process ("memory" or "mysql").
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown rate limit backend: {name}")
+    _backend = BACKENDS[name]
+
+
+def allow(bucket, key, limit, window_seconds):
+    """
+    Records an attempt for `key` in `bucket` and returns True if it is within
+    `limit` attempts per `window_seconds`. Rejected attempts are not counted.
+    """
+    return _backend(bucket, str(key), int(limit), int(window_seconds))
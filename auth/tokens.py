@@ -1,4 +1,8 @@
+import hashlib
+import os
+import threading
 import time
+from collections import OrderedDict
 from typing import Any, Dict
 
 import jwt
@@ -9,7 +13,16 @@ from itsdangerous import URLSafeTimedSerializer
 Mints and validates JWT tokens for auth
 """
 
-def mint_access_token(*, user_id: int, tenant_id: int, username: str = None, is_anon: bool = False) -> str:
+# Verified-claims cache: token digest -> claims, kept until the token's exp.
+# The digest covers the secret, issuer and audience too, so rotating any of
+# them misses the cache and old entries just age out of the LRU.
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 1024))
+
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+def mint_access_token(*, user_id: int, tenant_id: int, username: str = None, is_anon: bool = False,
+                      totp_confirmed: bool = False) -> str:
     now = int(time.time())
     ttl = int(current_app.config["JWT_ACCESS_TTL_SECONDS"])
 
@@ -26,12 +39,54 @@ def mint_access_token(*, user_id: int, tenant_id: int, username: str = None, is_
         payload["username"] = username
     if is_anon:
         payload["anon"] = True
+    if totp_confirmed:
+        # Lets the middleware skip the per-request TOTP lookup
+        payload["totp"] = True
 
     secret = current_app.config["JWT_SECRET"]
     return jwt.encode(payload, secret, algorithm="HS256")
 
 
+def _token_digest(token: str) -> bytes:
+    config = current_app.config
+    h = hashlib.sha256()
+    for part in (config["JWT_SECRET"], config["JWT_ISSUER"], config["JWT_AUDIENCE"], token):
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.digest()
+
+
+def _cached_claims(digest: bytes):
+    with _token_cache_lock:
+        entry = _token_cache.get(digest)
+        if entry is None:
+            return None
+        if entry["exp"] <= time.time():
+            del _token_cache[digest]
+            return None
+        _token_cache.move_to_end(digest)
+        return dict(entry)
+
+
+def _cache_claims(digest: bytes, claims: Dict[str, Any]) -> None:
+    with _token_cache_lock:
+        _token_cache[digest] = dict(claims)
+        _token_cache.move_to_end(digest)
+        while len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
+
 def verify_access_token(token: str) -> Dict[str, Any]:
+    if not token:
+        raise jwt.InvalidTokenError("Missing token")
+
+    digest = None
+    if TOKEN_CACHE_SIZE > 0:
+        digest = _token_digest(token)
+        claims = _cached_claims(digest)
+        if claims is not None:
+            return claims
+
     secret = current_app.config["JWT_SECRET"]
 
     claims = jwt.decode(
@@ -46,6 +101,8 @@ def verify_access_token(token: str) -> Dict[str, Any]:
     if "tid" not in claims:
         raise jwt.InvalidTokenError("Missing tid claim")
 
+    if digest is not None:
+        _cache_claims(digest, claims)
     return claims
 
 
@@ -1,5 +1,4 @@
 import pyotp
-import qrcode
 import io
 import base64
 
@@ -22,6 +21,9 @@ def get_totp_uri(secret, username):
 
 def generate_qr_base64(uri):
     """Generate a QR code PNG as a base64 string for embedding in an <img> tag."""
+    # Deferred: qrcode/PIL are only needed during TOTP enrollment
+    import qrcode
+
     img = qrcode.make(uri)
     buf = io.BytesIO()
     img.save(buf, format="PNG")
@@ -2,8 +2,8 @@ import mysql.connector
 import secrets
 import string
 from contextlib import contextmanager, closing
-from typing import Optional, List, Dict, Any
-from db.functions.connect import get_auth_db
+from typing import Optional, List, Dict, Any, Tuple
+from db.functions.connect import get_auth_db, get_auth_read_db
 from auth.passwords import hash_password
 
 """
@@ -11,11 +11,11 @@ Manages creation and deletion (not implemented on front end) of users in auth da
 """
 
 @contextmanager
-def _get_db_context(conn=None):
+def _get_db_context(conn=None, connect=get_auth_db):
     if conn:
         yield conn
     else:
-        connection = get_auth_db()
+        connection = connect()
         if connection is None:
             raise RuntimeError("Failed to connect to user database")
         try:
@@ -26,7 +26,7 @@ def _get_db_context(conn=None):
 
 def _execute_proc(proc_name: str, args: List[Any], conn=None) -> List[Dict[str, Any]]:
     """
-    Executes a stored procedure that returns rows (e.g., SELECT or DELETE returning info).
+    Executes a stored procedure that writes (and may return rows, e.g. DELETE returning info), then commits.
     """
     with _get_db_context(conn) as connection:
         with closing(connection.cursor(dictionary=True)) as cur:
@@ -38,6 +38,29 @@ def _execute_proc(proc_name: str, args: List[Any], conn=None) -> List[Dict[str,
             return rows
 
 
+def _query_proc(proc_name: str, args: List[Any], conn=None) -> List[Dict[str, Any]]:
+    """
+    Read-only counterpart of _execute_proc.
+
+    Without a conn the lookup runs on the autocommit read pool, so it sees the
+    latest committed rows and needs no COMMIT. On a caller's conn that is not
+    already in a transaction it runs in a READ ONLY transaction that is
+    committed afterwards, so no stale snapshot is left open on that connection.
+    """
+    with _get_db_context(conn, connect=get_auth_read_db) as connection:
+        own_transaction = conn is not None and not connection.in_transaction
+        with closing(connection.cursor(dictionary=True)) as cur:
+            if own_transaction:
+                cur.execute("START TRANSACTION READ ONLY")
+            cur.callproc(proc_name, args)
+            rows = []
+            for r in cur.stored_results():
+                rows.extend(r.fetchall())
+        if own_transaction:
+            connection.commit()
+        return rows
+
+
 def _call_user_create_proc(proc_name: str, args: List[Any], conn=None) -> Optional[int]:
     """
     Executes a stored procedure on the USER database that inserts a record and returns its new ID.
@@ -87,12 +110,12 @@ def delete_user(tenant_id: int, user_id: int, conn=None) -> List[Dict[str, Any]]
 
 
 def get_user_by_username(username: str, conn=None) -> Optional[Dict[str, Any]]:
-    rows = _execute_proc("get_user_by_username", [username], conn)
+    rows = _query_proc("get_user_by_username", [username], conn)
     return rows[0] if rows else None
 
 
 def get_user_totp_secret(user_id):
-    rows = _execute_proc("get_user_totp", [user_id])
+    rows = _query_proc("get_user_totp", [user_id])
     return rows[0]["totp_secret"] if rows else None
 
 
@@ -105,7 +128,7 @@ def set_totp_confirmed(user_id, confirmed):
 
 
 def get_user_for_reset(username):
-    rows = _execute_proc("get_user_for_reset", [username])
+    rows = _query_proc("get_user_for_reset", [username])
     return rows[0] if rows else None
 
 
@@ -114,7 +137,7 @@ def update_user_password(user_id, password_hash):
 
 
 def get_user_totp(user_id):
-    rows = _execute_proc("get_user_totp", [user_id])
+    rows = _query_proc("get_user_totp", [user_id])
     return rows[0] if rows else None
 
 
@@ -133,26 +156,63 @@ def generate_email(username):
     return f"{username}@example.invalid"
 
 
-def create_anonymous_user(conn=None):
+def create_anonymous_user(conn=None, role="Anonymous"):
     try:
         password = generate_password()
         username = generate_username()
         email = generate_email(username)
-        user_id = create_user(username,  password, email, role="Anonymous", conn=conn)
+        user_id = create_user(username,  password, email, role=role, conn=conn)
         user = get_user_by_username(username, conn=conn)
     except ValueError:
         password = generate_password(18)
         username = generate_username(16)
         email = generate_email(username)
-        user_id = create_user(username,  password, email, role="Anonymous", conn=conn)
+        user_id = create_user(username,  password, email, role=role, conn=conn)
         user = get_user_by_username(username, conn=conn)
     return user_id, user["tenant_id"]
 
 
+def claim_anonymous_user(conn=None) -> Optional[Tuple[int, int]]:
+    """
+    Takes a pre-provisioned anonymous user from the pool.
+    Returns (user_id, tenant_id), or None if the pool is empty.
+    """
+    rows = _execute_proc("claim_anonymous_user", [], conn)
+    return (rows[0]["user_id"], rows[0]["tenant_id"]) if rows else None
+
+
+def count_anonymous_pool(conn=None) -> int:
+    rows = _query_proc("count_anonymous_pool", [], conn)
+    return rows[0]["pool_size"] if rows else 0
+
+
 def update_user_activity(user_id, conn = None):
     _execute_proc("update_user_activity", [user_id], conn)
 
 
+def update_users_activity(activity: Dict[int, float], conn=None, batch_size: int = 500) -> None:
+    """
+    Sets last_active for many users with one multi-row UPDATE per batch.
+
+    :param activity: user_id -> epoch seconds of their latest activity
+    """
+    items = list(activity.items())
+    with _get_db_context(conn) as connection:
+        with closing(connection.cursor()) as cur:
+            for i in range(0, len(items), batch_size):
+                chunk = items[i:i + batch_size]
+                cases = " ".join(["WHEN %s THEN FROM_UNIXTIME(%s)"] * len(chunk))
+                placeholders = ", ".join(["%s"] * len(chunk))
+                params = [v for user_id, ts in chunk for v in (user_id, int(ts))]
+                params += [user_id for user_id, _ in chunk]
+                cur.execute(
+                    f"UPDATE users SET last_active = CASE user_id {cases} END "
+                    f"WHERE user_id IN ({placeholders})",
+                    params
+                )
+            connection.commit()
+
+
 def upgrade_anonymous_user(user_id, username, email, password, conn=None):
     hashed_pw = hash_password(password)
     _execute_proc("upgrade_anonymous_user", [user_id, username, email, hashed_pw], conn)
@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+"""
+Auth DB cost of the login path: read lookups with and without the trailing COMMIT.
+
+Runs the lookups a login makes (get_user_by_username) and the TOTP check
+(get_user_totp) --iterations times against the auth DB configured in .env,
+through three paths:
+
+    commit         _execute_proc on the auth pool, then COMMIT
+    autocommit     _query_proc on the autocommit read pool (no conn passed)
+    read_only_txn  _query_proc on a caller's auth connection, in a
+                   START TRANSACTION READ ONLY / COMMIT pair
+
+Reports MySQL round trips and mean latency per login.
+
+    python benchmarks/auth_lookup_benchmark.py --username someuser --output auth.json
+"""
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from auth import user_management  # noqa: E402
+from db.functions.connect import get_auth_db  # noqa: E402
+from db_counters import count_round_trips  # noqa: E402
+
+
+def _read_only_txn(proc_name, args):
+    conn = get_auth_db()
+    try:
+        return user_management._query_proc(proc_name, args, conn)
+    finally:
+        conn.close()
+
+
+PATHS = (
+    ("commit", user_management._execute_proc),
+    ("autocommit", user_management._query_proc),
+    ("read_only_txn", _read_only_txn),
+)
+
+
+def run_path(proc_runner, username, iterations, counter):
+    user = proc_runner("get_user_by_username", [username])
+    if not user:
+        raise RuntimeError(f"User not found: {username}")
+    user_id = user[0]["user_id"]
+
+    counter["round_trips"] = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        proc_runner("get_user_by_username", [username])
+        proc_runner("get_user_totp", [user_id])
+    elapsed = time.perf_counter() - start
+
+    return {
+        "round_trips_per_login": round(counter["round_trips"] / iterations, 2),
+        "ms_per_login": round(elapsed / iterations * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login-path auth lookup benchmark")
+    parser.add_argument("--username", required=True, help="existing user to look up")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    counter = count_round_trips()
+
+    results = {"started_at": started_at, "iterations": args.iterations, "paths": {}}
+    for name, runner in PATHS:
+        result = run_path(runner, args.username, args.iterations, counter)
+        results["paths"][name] = result
+        print(f"{name:<14} {result['round_trips_per_login']:6.2f} round trips/login  {result['ms_per_login']:8.3f} ms/login")
+
+    saved = results["paths"]["commit"]["round_trips_per_login"] - results["paths"]["autocommit"]["round_trips_per_login"]
+    results["round_trips_saved_per_login"] = round(saved, 2)
+    print(f"{'saved':<14} {saved:6.2f} round trips/login (commit vs autocommit)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Counts MySQL round trips made through mysql-connector (pure Python).
+"""
+
+# Connection commands that each cost one round trip to the server (pooled
+# connections send cmd_reset_connection when they go back to the pool)
+ROUND_TRIP_COMMANDS = ["cmd_query", "cmd_query_iter", "cmd_stmt_prepare", "cmd_stmt_execute", "cmd_reset_connection"]
+
+
+def count_round_trips():
+    """
+    Wraps the connector's command methods so every command sent to the server
+    is counted. Returns the counter dict; reset it by setting "round_trips" to 0.
+    """
+    from mysql.connector.connection import MySQLConnection
+
+    counter = {"round_trips": 0}
+
+    def wrap(method):
+        def counted(self, *args, **kwargs):
+            counter["round_trips"] += 1
+            return method(self, *args, **kwargs)
+        return counted
+
+    for name in ROUND_TRIP_COMMANDS:
+        setattr(MySQLConnection, name, wrap(getattr(MySQLConnection, name)))
+    return counter
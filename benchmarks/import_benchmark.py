@@ -0,0 +1,202 @@
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+"""
+Import throughput benchmark.
+
+Generates synthetic CSVs for the import templates and posts them to the import
+blueprints through the Flask test client, against the database configured in
+.env. Run it against a scratch database: every run writes new rows into the
+given tenant.
+
+Each (size, mode, import type) case runs in a fresh process so its peak RSS is
+its own. Reported per case:
+    rows_per_second       rows in the file / wall time of the request
+    peak_rss_kb           peak resident set size of the case's process
+    round_trips_per_row   MySQL commands sent / rows in the file
+
+    python benchmarks/import_benchmark.py --sizes 1000,10000 --output bench.json
+    python benchmarks/import_benchmark.py --types products,demand --modes row,bulk
+"""
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Import types that support ?mode=bulk
+BULK_TYPES = {"products", "locations", "supply", "demand"}
+
+
+def _setup_paths():
+    for path in (ROOT, os.path.join(ROOT, "frontend_flask"), os.path.dirname(__file__)):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def _peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_case(import_type, rows, prefix, mode, tenant_id):
+    """
+    Runs one import in the current process and returns its metrics.
+    Meant to be called in a fresh child process.
+    """
+    _setup_paths()
+    if mode == "bulk":
+        os.environ["BULK_LOAD_IMPORTS"] = "true"
+
+    from app import app
+    from auth.tokens import mint_access_token
+    import synthetic_csv
+    from db_counters import count_round_trips
+
+    with app.app_context():
+        # Anonymous tokens skip the TOTP check, so no user row is needed
+        token = mint_access_token(user_id=0, tenant_id=tenant_id, is_anon=True)
+    client = app.test_client()
+    client.set_cookie("token", token)
+
+    payload = synthetic_csv.generate_csv(import_type, rows, prefix).encode("utf-8")
+    baseline_rss = _peak_rss_kb()
+    counter = count_round_trips()
+
+    url = f"/api/import/{import_type}/upload" + ("?mode=bulk" if mode == "bulk" else "")
+    start = time.perf_counter()
+    resp = client.post(
+        url,
+        data={"file": (io.BytesIO(payload), f"{import_type}.csv")},
+        content_type="multipart/form-data"
+    )
+    elapsed = time.perf_counter() - start
+
+    body = resp.get_json(silent=True) or {}
+    row_errors = sum(1 for r in body.get("results", []) if r.get("status") == "error")
+
+    return {
+        "import_type": import_type,
+        "mode": mode,
+        "rows": rows,
+        "status_code": resp.status_code,
+        "row_errors": row_errors,
+        "seconds": round(elapsed, 4),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed else None,
+        "round_trips": counter["round_trips"],
+        "round_trips_per_row": round(counter["round_trips"] / rows, 3) if rows else None,
+        "baseline_rss_kb": baseline_rss,
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+
+def create_entity(prefix, tenant_id):
+    """
+    Supply rows reference an entity, which has no CSV import.
+    """
+    _setup_paths()
+    from db.functions.simple_functions import create
+    import synthetic_csv
+
+    create.add_entity(tenant_id, synthetic_csv.entity_name(prefix), 0)
+
+
+def _in_child(ctx, func, *args):
+    with ctx.Pool(processes=1, maxtasksperchild=1) as pool:
+        return pool.apply(func, args)
+
+
+def _plan(types):
+    """
+    Adds the imports the requested types depend on, in dependency order.
+    """
+    import synthetic_csv
+
+    needed = set(types)
+    for t in types:
+        needed.update(synthetic_csv.DEPENDENCIES.get(t, []))
+    return [t for t in synthetic_csv.IMPORT_ORDER if t in needed]
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def main():
+    _setup_paths()
+    import synthetic_csv
+
+    parser = argparse.ArgumentParser(description="Import throughput benchmark")
+    parser.add_argument("--sizes", default="1000,10000",
+                        help="comma-separated row counts (e.g. 1000,100000,1000000)")
+    parser.add_argument("--types", default=",".join(synthetic_csv.IMPORT_ORDER),
+                        help="comma-separated import types")
+    parser.add_argument("--modes", default="row",
+                        help="comma-separated: row, bulk (bulk needs local_infile on the server)")
+    parser.add_argument("--tenant-id", type=int, default=1)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    types = [t.strip() for t in args.types.split(",") if t.strip()]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+
+    unknown = set(types) - set(synthetic_csv.GENERATORS)
+    if unknown:
+        parser.error(f"unknown import types: {', '.join(sorted(unknown))}")
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    ctx = multiprocessing.get_context("spawn")
+    cases = []
+
+    for rows in sizes:
+        for mode in modes:
+            prefix = f"bench-{uuid.uuid4().hex[:8]}-"
+            for import_type in _plan(types):
+                # Dependencies of a bulk run still load row-by-row if bulk isn't supported
+                case_mode = mode if mode != "bulk" or import_type in BULK_TYPES else "row"
+                if import_type == "supply":
+                    _in_child(ctx, create_entity, prefix, args.tenant_id)
+
+                result = _in_child(ctx, run_case, import_type, rows, prefix, case_mode, args.tenant_id)
+                result["run_mode"] = mode
+                result["requested"] = import_type in types
+                cases.append(result)
+
+                print(
+                    f"{rows:>8} {mode:>4} {import_type:<10} "
+                    f"{result['seconds']:9.2f}s {result['rows_per_second'] or 0:10.0f} rows/s "
+                    f"{result['round_trips_per_row'] or 0:7.3f} trips/row "
+                    f"{result['peak_rss_kb'] / 1024:8.1f} MiB"
+                    + ("" if result["status_code"] == 200 and not result["row_errors"]
+                       else f"  [status {result['status_code']}, {result['row_errors']} row errors]")
+                )
+
+    report = {
+        "started_at": started_at,
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "tenant_id": args.tenant_id,
+        "cases": cases,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+"""
+Password hash cost benchmark.
+
+For each hash setting, verifies a password (the CPU cost of one login) as fast
+as --workers threads allow and reports logins/s overall and per worker core.
+Use it to pick PASSWORD_HASH_METHOD and PASSWORD_HASH_WORKERS for a host.
+
+    python benchmarks/password_hash_benchmark.py --logins 200 --output hash.json
+    python benchmarks/password_hash_benchmark.py --methods scrypt:16384:8:1,pbkdf2:sha256:600000
+"""
+
+DEFAULT_METHODS = [
+    "scrypt:32768:8:1",
+    "scrypt:16384:8:1",
+    "pbkdf2:sha256:600000",
+    "pbkdf2:sha256:260000",
+]
+
+PASSWORD = "benchmark-password-123"
+
+
+def run_setting(method, logins, workers):
+    password_hash = generate_password_hash(PASSWORD, method=method)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda _: check_password_hash(password_hash, PASSWORD), range(logins)))
+    elapsed = time.perf_counter() - start
+
+    if not all(results):
+        raise RuntimeError(f"Verification failed for {method}")
+
+    per_second = logins / elapsed
+    return {
+        "method": method,
+        "logins": logins,
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "logins_per_second": round(per_second, 1),
+        "logins_per_second_per_core": round(per_second / workers, 1),
+        "ms_per_login": round(elapsed * 1000 * workers / logins, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Password hash cost benchmark")
+    parser.add_argument("--methods", default=",".join(DEFAULT_METHODS),
+                        help="comma-separated werkzeug hash methods")
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    results = []
+    for method in [m.strip() for m in args.methods.split(",") if m.strip()]:
+        result = run_setting(method, args.logins, args.workers)
+        results.append(result)
+        print(
+            f"{method:<24} {result['logins_per_second']:8.1f} logins/s "
+            f"{result['logins_per_second_per_core']:8.1f} /s/core "
+            f"{result['ms_per_login']:8.1f} ms/login"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "started_at": started_at,
+                "python": platform.python_version(),
+                "cpu_count": os.cpu_count(),
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+"""
+Worker cold-start benchmark.
+
+Measures, in fresh interpreter processes:
+    - time from process start to the first successful /health response
+      (import app + one request through the Flask test client)
+    - import time per module, from python -X importtime
+
+    python benchmarks/startup_benchmark.py --runs 5 --top 15 --output startup.json
+"""
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Modules worth watching: heavy optional dependencies and the app itself
+WATCHED = ["pandas", "numpy", "qrcode", "PIL", "requests", "mysql.connector", "jwt", "flask", "app"]
+
+_CHILD = """
+import sys
+sys.path.insert(0, {root!r})
+sys.path.insert(0, {frontend!r})
+from app import app
+resp = app.test_client().get("/health")
+assert resp.status_code == 200, resp.status_code
+"""
+
+
+def _child_code():
+    return _CHILD.format(root=ROOT, frontend=os.path.join(ROOT, "frontend_flask"))
+
+
+def time_to_health(runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", _child_code()], check=True, cwd=ROOT,
+                       stdout=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def import_times():
+    """
+    Returns {module: (self_us, cumulative_us)} from -X importtime.
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _child_code()],
+                          check=True, cwd=ROOT, capture_output=True, text=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if not parts[0].isdigit():
+            continue  # header line
+        times[parts[2]] = (int(parts[0]), int(parts[1]))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list by cumulative time")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    timings = time_to_health(args.runs)
+    times = import_times()
+
+    # Top-level entries only; their cumulative time already includes submodules
+    top = sorted(
+        ((name, cum) for name, (_, cum) in times.items() if "." not in name),
+        key=lambda item: item[1], reverse=True
+    )[:args.top]
+
+    print(f"time to first /health: median {statistics.median(timings):.0f} ms "
+          f"(min {min(timings):.0f}, max {max(timings):.0f}, {args.runs} runs)")
+    print("watched modules (cumulative import ms):")
+    for name in WATCHED:
+        loaded = name in times
+        print(f"  {name:<18} {times[name][1] / 1000 if loaded else 0:8.1f}" + ("" if loaded else "  (not imported)"))
+    print(f"slowest {args.top} top-level imports:")
+    for name, cum in top:
+        print(f"  {name:<18} {cum / 1000:8.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "started_at": started_at,
+                "python": sys.version.split()[0],
+                "time_to_health_ms": {
+                    "runs": [round(t, 1) for t in timings],
+                    "median": round(statistics.median(timings), 1),
+                },
+                "watched_import_ms": {
+                    name: round(times[name][1] / 1000, 1) if name in times else None for name in WATCHED
+                },
+                "top_import_ms": {name: round(cum / 1000, 1) for name, cum in top},
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
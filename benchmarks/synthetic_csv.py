@@ -0,0 +1,140 @@
+import argparse
+import csv
+import io
+import os
+import sys
+
+"""
+Synthetic CSV generators for every import template.
+
+Rows are deterministic for a given (rows, prefix). All names are prefixed so
+one run's data can be told apart from another's, and the dependent files
+(routes, supply, demand) reference the locations, products and entity
+generated with the same prefix.
+
+    python benchmarks/synthetic_csv.py supply 100000 --prefix demo- -o supply.csv
+"""
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "frontend_flask"))
+
+from csv_template_bp import CSV_TEMPLATES  # noqa: E402
+
+# Imports that must run first so the generated names resolve
+DEPENDENCIES = {
+    "routes": ["locations"],
+    "supply": ["locations", "products"],
+    "demand": ["locations", "products"],
+}
+
+# Dependency order for running every template
+IMPORT_ORDER = ["locations", "products", "drivers", "vehicles", "routes", "supply", "demand"]
+
+
+def entity_name(prefix):
+    """
+    Supply rows all belong to this entity; there is no entity import, so the
+    caller creates it before importing supply.
+    """
+    return f"{prefix}Entity"
+
+
+def _location(prefix, i):
+    return f"{prefix}Location {i}"
+
+
+def _product(prefix, i):
+    return f"{prefix}P{i}"
+
+
+def _locations(rows, prefix):
+    for i in range(rows):
+        yield [
+            _location(prefix, i), ("Hub", "Store", "Farm")[i % 3], f"{i} Main St",
+            "Portland", "OR", "97201", "555-0100",
+            f"{45.5 + (i % 1000) / 10000:.6f}", f"{-122.6 - (i % 1000) / 10000:.6f}",
+            30, 30
+        ]
+
+
+def _products(rows, prefix):
+    for i in range(rows):
+        yield [_product(prefix, i), f"Product {i}", ("Dry", "Ref", "Frz")[i % 3]]
+
+
+def _drivers(rows, prefix):
+    for i in range(rows):
+        yield [f"{prefix}Driver {i}", f"{20 + i % 15}.50", f"{18 + i % 10}.00"]
+
+
+def _vehicles(rows, prefix):
+    for i in range(rows):
+        yield [
+            f"{prefix}Truck {i}", f"{8 + i % 12}.5", 85000, 15000, 20000,
+            3200, 2500, 10000 + (i % 5) * 2000, 800,
+            ("Dry", "Ref", "Frz", "Multi")[i % 4]
+        ]
+
+
+def _routes(rows, prefix):
+    for i in range(rows):
+        yield [f"{prefix}Route {i}", _location(prefix, i), _location(prefix, (i + 1) % rows)]
+
+
+def _supply(rows, prefix):
+    entity = entity_name(prefix)
+    for i in range(rows):
+        yield [entity, _location(prefix, i), _product(prefix, i), 100 + i % 400, 1.5, 0.1, 12, 2.25]
+
+
+def _demand(rows, prefix):
+    for i in range(rows):
+        yield [_location(prefix, i), _product(prefix, i), 10 + i % 50, 3.0]
+
+
+GENERATORS = {
+    "locations": _locations,
+    "products": _products,
+    "drivers": _drivers,
+    "vehicles": _vehicles,
+    "routes": _routes,
+    "supply": _supply,
+    "demand": _demand,
+}
+
+
+def write_csv(import_type, rows, prefix, out):
+    """
+    Writes the template header and `rows` synthetic rows to a text stream.
+    """
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(CSV_TEMPLATES[import_type])
+    writer.writerows(GENERATORS[import_type](rows, prefix))
+
+
+def generate_csv(import_type, rows, prefix=""):
+    """
+    Returns the synthetic CSV as a string.
+    """
+    buf = io.StringIO()
+    write_csv(import_type, rows, prefix, buf)
+    return buf.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic import CSV")
+    parser.add_argument("import_type", choices=sorted(GENERATORS))
+    parser.add_argument("rows", type=int)
+    parser.add_argument("--prefix", default="")
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args()
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            write_csv(args.import_type, args.rows, args.prefix, f)
+    else:
+        write_csv(args.import_type, args.rows, args.prefix, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+"""
+Auth middleware overhead per request, with and without the verified-token cache.
+
+Sends --requests GETs with the same token to a no-op endpoint behind the auth
+middleware (an anonymous token, so no DB is involved) and reports the mean
+time per request. A /health run (public, no token check) gives the baseline,
+so the difference is the middleware's cost.
+
+    python benchmarks/token_verify_benchmark.py --requests 20000 --output token.json
+"""
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "frontend_flask"))
+
+from app import app  # noqa: E402
+from auth import tokens  # noqa: E402
+
+
+@app.get("/_bench/noop")
+def bench_noop():
+    return "ok"
+
+
+def time_requests(client, path, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def time_verify(token, requests):
+    with app.test_request_context():
+        start = time.perf_counter()
+        for _ in range(requests):
+            tokens.verify_access_token(token)
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Auth middleware overhead benchmark")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    with app.app_context():
+        token = tokens.mint_access_token(user_id=1, tenant_id=1, is_anon=True)
+    client = app.test_client()
+    client.set_cookie("token", token)
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    cache_size = tokens.TOKEN_CACHE_SIZE or 1024
+    baseline = time_requests(client, "/health", args.requests)
+    results = {"started_at": started_at, "requests": args.requests, "baseline_us": round(baseline, 2), "modes": {}}
+
+    for mode, size in (("uncached", 0), ("cached", cache_size)):
+        tokens.TOKEN_CACHE_SIZE = size
+        tokens._token_cache.clear()
+        per_request = time_requests(client, "/_bench/noop", args.requests)
+        verify = time_verify(token, args.requests)
+        results["modes"][mode] = {
+            "request_us": round(per_request, 2),
+            "middleware_overhead_us": round(per_request - baseline, 2),
+            "verify_access_token_us": round(verify, 2),
+        }
+        print(f"{mode:<9} {per_request:8.1f} us/request  {per_request - baseline:8.1f} us overhead  "
+              f"{verify:7.2f} us/verify")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
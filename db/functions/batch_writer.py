@@ -0,0 +1,102 @@
+from db.functions.connect import get_db
+import re
+
+"""
+Batched writes for bulk imports. Rows are sent with executemany in chunks
+(one multi-row INSERT per chunk) on a single connection, committing after
+each chunk, instead of one stored procedure call + commit per row.
+"""
+
+DEFAULT_BATCH_SIZE = 500
+
+_IDENTIFIER = re.compile(r"^[a-zA-Z0-9_]+$")
+
+
+def _identifier(name):
+    # Security: table/column names can't be parameterized, so whitelist them
+    if not isinstance(name, str) or not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid identifier: {name}")
+    return name
+
+
+def chunked(rows, size=DEFAULT_BATCH_SIZE):
+    """
+    Yields successive lists of at most `size` rows.
+    """
+    size = max(int(size), 1)
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_batches(statement, rows, conn=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Runs `statement` with executemany over rows in chunks, committing each chunk.
+
+    :param statement: parameterized SQL (%s placeholders)
+    :param rows: iterable of parameter tuples
+    :return: number of rows written
+    """
+    should_close = False
+    if conn is None:
+        conn = get_db()
+        should_close = True
+
+    if conn is None:
+        raise RuntimeError("Failed to connect to database")
+
+    written = 0
+    try:
+        cur = conn.cursor()
+        try:
+            for chunk in chunked(rows, batch_size):
+                cur.executemany(statement, chunk)
+                conn.commit()
+                written += len(chunk)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+        return written
+    finally:
+        if should_close and conn:
+            conn.close()
+
+
+def insert_rows(tenant_id, table, columns, rows, conn=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Inserts rows into a tenant table. tenant_id is prepended to every row.
+
+    :param columns: column names matching the order of values in each row
+    :param rows: iterable of tuples/lists of values
+    """
+    cols = ["tenant_id"] + [_identifier(c) for c in columns]
+    placeholders = ", ".join(["%s"] * len(cols))
+    statement = f"INSERT INTO {_identifier(table)} ({', '.join(cols)}) VALUES ({placeholders})"
+
+    params = ([tenant_id, *row] for row in rows)
+    return write_batches(statement, params, conn, batch_size)
+
+
+def update_rows(tenant_id, table, key_column, columns, rows, conn=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Updates rows of a tenant table by primary key.
+
+    :param key_column: primary key column (tenant_id is always matched too)
+    :param columns: columns to set, in the order of values in each row
+    :param rows: iterable of (key, value1, value2, ...) tuples
+    """
+    assignments = ", ".join(f"{_identifier(c)} = %s" for c in columns)
+    statement = (
+        f"UPDATE {_identifier(table)} SET {assignments} "
+        f"WHERE tenant_id = %s AND {_identifier(key_column)} = %s"
+    )
+
+    params = ([*row[1:], tenant_id, row[0]] for row in rows)
+    return write_batches(statement, params, conn, batch_size)
@@ -0,0 +1,309 @@
+from db.functions.connect import get_bulk_db
+from db.functions.batch_writer import _identifier
+import csv
+import os
+import tempfile
+
+"""
+Native bulk load for large imports (e.g. onboarding a new tenant).
+
+Rows are written to a local file, streamed into a TEMPORARY staging table with
+LOAD DATA LOCAL INFILE, and merged into the real table with a handful of
+set-based statements in one transaction. tenant_id never comes from the file:
+every statement stamps it server-side from the query parameter.
+
+Staging columns are all strings (already validated and stripped by the caller);
+blank optional numbers fall back to the same defaults the row-by-row importers use.
+"""
+
+STAGING_DIR = os.path.join(tempfile.gettempdir(), "local_food_bulk_load")
+
+STAGE_TABLE = "bulk_stage"
+
+# Per target:
+#   columns:  staging columns, in the order of values in each row
+#   resolved: INT columns filled in server-side (ids resolved from names)
+#   resolve:  statements that fill the resolved columns
+#   existing: query counting staged rows that match an existing record
+#   merge:    statements that apply the staged rows to the target table
+BULK_TARGETS = {
+    "products": {
+        "columns": ["product_code", "name", "storage_type"],
+        "resolved": [],
+        "resolve": [],
+        "existing": """
+            SELECT COUNT(*) FROM bulk_stage s
+            JOIN products_master p
+              ON p.tenant_id = %(tenant_id)s AND p.product_code = s.product_code
+        """,
+        "merge": [
+            """
+            INSERT INTO products_master (tenant_id, product_code, name, storage_type)
+            SELECT %(tenant_id)s, s.product_code, s.name, s.storage_type
+            FROM bulk_stage s
+            ON DUPLICATE KEY UPDATE
+                name = VALUES(name),
+                storage_type = VALUES(storage_type)
+            """,
+        ],
+    },
+    "locations": {
+        "columns": [
+            "name", "type", "address_street", "city", "state", "zip_code",
+            "phone", "latitude", "longitude", "avg_load_minutes", "avg_unload_minutes"
+        ],
+        "resolved": ["existing_id"],
+        "resolve": [
+            """
+            UPDATE bulk_stage s
+            JOIN (
+                SELECT name, MAX(location_id) AS location_id
+                FROM locations WHERE tenant_id = %(tenant_id)s
+                GROUP BY name
+            ) l ON l.name = s.name
+            SET s.existing_id = l.location_id
+            """,
+        ],
+        "existing": "SELECT COUNT(existing_id) FROM bulk_stage",
+        "merge": [
+            """
+            UPDATE locations l
+            JOIN bulk_stage s
+              ON l.tenant_id = %(tenant_id)s AND l.location_id = s.existing_id
+            SET l.type = s.type,
+                l.address_street = s.address_street,
+                l.city = s.city,
+                l.state = s.state,
+                l.zip_code = s.zip_code,
+                l.phone = s.phone,
+                l.latitude = s.latitude,
+                l.longitude = s.longitude,
+                l.avg_load_minutes = s.avg_load_minutes,
+                l.avg_unload_minutes = s.avg_unload_minutes
+            """,
+            """
+            INSERT INTO locations (
+                tenant_id, name, type, address_street, city, state, zip_code,
+                phone, latitude, longitude, avg_load_minutes, avg_unload_minutes
+            )
+            SELECT %(tenant_id)s, s.name, s.type, s.address_street, s.city, s.state, s.zip_code,
+                   s.phone, s.latitude, s.longitude, s.avg_load_minutes, s.avg_unload_minutes
+            FROM bulk_stage s
+            WHERE s.existing_id IS NULL
+            """,
+        ],
+    },
+    "supply": {
+        "columns": [
+            "entity_name", "location_name", "product_code", "quantity_available",
+            "unit_weight_lbs", "unit_volume_cu_ft", "items_per_handling_unit", "cost_per_item"
+        ],
+        "resolved": ["entity_id", "location_id", "existing_id"],
+        "resolve": [
+            """
+            UPDATE bulk_stage s
+            JOIN (
+                SELECT name, MAX(entity_id) AS entity_id
+                FROM entities WHERE tenant_id = %(tenant_id)s
+                GROUP BY name
+            ) e ON e.name = s.entity_name
+            SET s.entity_id = e.entity_id
+            """,
+            """
+            UPDATE bulk_stage s
+            JOIN (
+                SELECT name, MAX(location_id) AS location_id
+                FROM locations WHERE tenant_id = %(tenant_id)s
+                GROUP BY name
+            ) l ON l.name = s.location_name
+            SET s.location_id = l.location_id
+            """,
+            """
+            UPDATE bulk_stage s
+            JOIN (
+                SELECT entity_id, location_id, product_code, MAX(supply_id) AS supply_id
+                FROM supply WHERE tenant_id = %(tenant_id)s
+                GROUP BY entity_id, location_id, product_code
+            ) x ON x.entity_id = s.entity_id
+               AND x.location_id = s.location_id
+               AND x.product_code = s.product_code
+            SET s.existing_id = x.supply_id
+            """,
+        ],
+        "existing": "SELECT COUNT(existing_id) FROM bulk_stage",
+        "merge": [
+            """
+            UPDATE supply t
+            JOIN bulk_stage s
+              ON t.tenant_id = %(tenant_id)s AND t.supply_id = s.existing_id
+            SET t.quantity_available = s.quantity_available,
+                t.unit_weight_lbs = COALESCE(NULLIF(s.unit_weight_lbs, ''), 0),
+                t.unit_volume_cu_ft = COALESCE(NULLIF(s.unit_volume_cu_ft, ''), 0),
+                t.items_per_handling_unit = COALESCE(NULLIF(s.items_per_handling_unit, ''), 1),
+                t.cost_per_item = COALESCE(NULLIF(s.cost_per_item, ''), 0)
+            """,
+            """
+            INSERT INTO supply (
+                tenant_id, entity_id, location_id, product_code, quantity_available,
+                unit_weight_lbs, unit_volume_cu_ft, items_per_handling_unit, cost_per_item
+            )
+            SELECT %(tenant_id)s, s.entity_id, s.location_id, s.product_code, s.quantity_available,
+                   COALESCE(NULLIF(s.unit_weight_lbs, ''), 0),
+                   COALESCE(NULLIF(s.unit_volume_cu_ft, ''), 0),
+                   COALESCE(NULLIF(s.items_per_handling_unit, ''), 1),
+                   COALESCE(NULLIF(s.cost_per_item, ''), 0)
+            FROM bulk_stage s
+            WHERE s.existing_id IS NULL
+            """,
+        ],
+    },
+    "demand": {
+        "columns": ["location_name", "product_code", "quantity_needed", "max_price"],
+        "resolved": ["location_id", "existing_id"],
+        "resolve": [
+            """
+            UPDATE bulk_stage s
+            JOIN (
+                SELECT name, MAX(location_id) AS location_id
+                FROM locations WHERE tenant_id = %(tenant_id)s
+                GROUP BY name
+            ) l ON l.name = s.location_name
+            SET s.location_id = l.location_id
+            """,
+            """
+            UPDATE bulk_stage s
+            JOIN (
+                SELECT location_id, product_code, MAX(demand_id) AS demand_id
+                FROM demand WHERE tenant_id = %(tenant_id)s
+                GROUP BY location_id, product_code
+            ) x ON x.location_id = s.location_id
+               AND x.product_code = s.product_code
+            SET s.existing_id = x.demand_id
+            """,
+        ],
+        "existing": "SELECT COUNT(existing_id) FROM bulk_stage",
+        "merge": [
+            """
+            UPDATE demand t
+            JOIN bulk_stage s
+              ON t.tenant_id = %(tenant_id)s AND t.demand_id = s.existing_id
+            SET t.quantity_needed = s.quantity_needed,
+                t.max_price = COALESCE(NULLIF(s.max_price, ''), 0)
+            """,
+            """
+            INSERT INTO demand (tenant_id, location_id, product_code, quantity_needed, max_price)
+            SELECT %(tenant_id)s, s.location_id, s.product_code, s.quantity_needed,
+                   COALESCE(NULLIF(s.max_price, ''), 0)
+            FROM bulk_stage s
+            WHERE s.existing_id IS NULL
+            """,
+        ],
+    },
+}
+
+
+def _write_staging_file(rows):
+    """
+    Writes rows to a CSV file under STAGING_DIR and returns (path, row_count).
+    """
+    os.makedirs(STAGING_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=".csv", dir=STAGING_DIR)
+    count = 0
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+    except Exception:
+        _remove_staging_file(path)
+        raise
+    return path, count
+
+
+def _remove_staging_file(path):
+    try:
+        os.remove(path)
+    except OSError as e:
+        print(f"Bulk load staging file cleanup failed: {type(e).__name__}")
+
+
+def _create_stage(cur, spec):
+    columns = [f"{_identifier(c)} VARCHAR(255)" for c in spec["columns"]]
+    columns += [f"{_identifier(c)} INT NULL" for c in spec["resolved"]]
+    cur.execute(f"DROP TEMPORARY TABLE IF EXISTS {STAGE_TABLE}")
+    cur.execute(f"CREATE TEMPORARY TABLE {STAGE_TABLE} ({', '.join(columns)})")
+
+
+def _load_stage(cur, spec, path):
+    columns = ", ".join(_identifier(c) for c in spec["columns"])
+    cur.execute(
+        f"LOAD DATA LOCAL INFILE %s INTO TABLE {STAGE_TABLE} "
+        "CHARACTER SET utf8mb4 "
+        "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+        f"LINES TERMINATED BY '\\n' ({columns})",
+        (path,)
+    )
+
+
+def bulk_load(tenant_id, target, rows, conn=None):
+    """
+    Stages rows with LOAD DATA LOCAL INFILE and merges them into `target`
+    in a single transaction.
+
+    :param target: key of BULK_TARGETS (products, locations, supply, demand)
+    :param rows: iterable of value lists in BULK_TARGETS[target]["columns"] order
+    :return: dict with row_count, created, updated
+    """
+    spec = BULK_TARGETS.get(target)
+    if spec is None:
+        raise ValueError(f"Unknown bulk load target: {target}")
+
+    params = {"tenant_id": int(tenant_id)}
+    path, row_count = _write_staging_file(rows)
+
+    should_close = False
+    if conn is None:
+        conn = get_bulk_db(STAGING_DIR)
+        should_close = True
+
+    try:
+        if conn is None:
+            raise RuntimeError("Failed to connect to database")
+
+        cur = conn.cursor()
+        try:
+            _create_stage(cur, spec)
+            _load_stage(cur, spec, path)
+
+            for statement in spec["resolve"]:
+                cur.execute(statement, params)
+
+            cur.execute(spec["existing"], params)
+            updated = cur.fetchone()[0]
+
+            for statement in spec["merge"]:
+                cur.execute(statement, params)
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            # A failed drop must not hide the original error; the temporary
+            # table goes away with the session anyway.
+            try:
+                cur.execute(f"DROP TEMPORARY TABLE IF EXISTS {STAGE_TABLE}")
+            except Exception as e:
+                print(f"Bulk load staging table drop failed: {type(e).__name__}")
+            cur.close()
+
+        return {
+            "row_count": row_count,
+            "created": row_count - updated,
+            "updated": updated
+        }
+    finally:
+        _remove_staging_file(path)
+        if should_close and conn:
+            conn.close()
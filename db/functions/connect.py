@@ -28,6 +28,7 @@ auth_db_config = {
 # Global pools
 _db_pool = None
 _auth_db_pool = None
+_auth_read_pool = None
 
 
 def get_db():
@@ -60,3 +61,56 @@ def get_auth_db():
         # Security: Don't print full exception as it may contain credentials
         print(f"User DB Connection Error: {type(e).__name__}")
         return None
+
+
+def get_auth_read_db():
+    """
+    Autocommit connection for read-only auth lookups: every SELECT sees the
+    latest committed rows and leaves no transaction open, so no COMMIT is needed.
+    Lookups leave no session state behind, so the pool skips the session reset.
+    """
+    global _auth_read_pool
+    try:
+        if _auth_read_pool is None:
+            _auth_read_pool = pooling.MySQLConnectionPool(
+                pool_name="auth_read_pool",
+                pool_size=5,
+                pool_reset_session=False,
+                autocommit=True,
+                **auth_db_config
+            )
+        return _auth_read_pool.get_connection()
+    except Exception as e:
+        # Security: Don't print full exception as it may contain credentials
+        print(f"User DB Connection Error: {type(e).__name__}")
+        return None
+
+
+def get_bulk_db(staging_dir):
+    """
+    Dedicated (unpooled) connection for LOAD DATA LOCAL INFILE.
+    The client will only send files that live under staging_dir.
+    """
+    try:
+        return mysql.connector.connect(
+            allow_local_infile_in_path=staging_dir,
+            **db_config
+        )
+    except Exception as e:
+        # Security: Don't print full exception as it may contain credentials
+        print(f"DB Connection Error: {type(e).__name__}")
+        return None
+
+
+def get_lock_db():
+    """
+    Dedicated (unpooled) connection that holds a GET_LOCK advisory lock for as
+    long as a job runs, so the job does not keep a pooled connection away
+    from requests while it takes its own from the pool.
+    """
+    try:
+        return mysql.connector.connect(**db_config)
+    except Exception as e:
+        # Security: Don't print full exception as it may contain credentials
+        print(f"DB Connection Error: {type(e).__name__}")
+        return None
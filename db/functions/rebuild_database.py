@@ -18,14 +18,19 @@ SQL_FILES = [
     #"db/procedures/get_planning_assets.sql",
     "db/procedures/generate_test_data.sql",
     "db/procedures/refresh_trip_snapshots.sql",
-    "db/procedures/tenant_cleanup_procs.sql"
+    "db/procedures/tenant_cleanup_procs.sql",
+    "db/procedures/job_procs.sql",
+    "db/procedures/task_procs.sql",
+    "db/procedures/version_procs.sql",
+    "db/procedures/map_procs.sql"
 ]
 
 AUTH_SQL_FILES = [
     "db/schema/auth_SCHEMA.sql",
     "db/procedures/auth_procs.sql",
     "db/procedures/auth_totp_procs.sql",
-    "db/procedures/anon_procs.sql"
+    "db/procedures/anon_procs.sql",
+    "db/procedures/rate_limit_procs.sql"
 
 ]
 
@@ -0,0 +1,78 @@
+from flask import g
+
+from db.functions.connect import get_db
+
+"""
+Per-tenant version stamps for cacheable resources.
+
+Writes bump the stamps of the resources they touch; GET handlers combine the
+stamps of the resources they render into an ETag and Last-Modified, so a
+browser revalidating an unchanged page gets a 304 from one primary-key
+lookup instead of a full rebuild.
+
+Resources used by the app:
+    routes        anything shown on the routes list (any route write)
+    route:<id>    one route and its manifest
+    routes:bulk   writes that touch many routes at once (recalcs, imports)
+    assets        master data: vehicles, drivers, locations, products, supply/demand
+"""
+
+
+def _get_tenant_id():
+    # No default tenant: it would share ETags across tenants and send bumps to the wrong one
+    tenant_id = g.get('tenant_id')
+    if tenant_id is None:
+        raise RuntimeError("Missing tenant_id for resource versions")
+    return tenant_id
+
+
+def bump(*resources, conn=None):
+    """
+    Increments the version of each resource for the current tenant.
+    """
+    tenant_id = _get_tenant_id()
+    should_close = False
+    if conn is None:
+        conn = get_db()
+        should_close = True
+
+    if conn is None:
+        raise RuntimeError("Failed to connect to database")
+
+    try:
+        cur = conn.cursor()
+        for resource in dict.fromkeys(resources):
+            cur.callproc("bump_resource_version", [tenant_id, resource])
+        conn.commit()
+        cur.close()
+    finally:
+        if should_close and conn:
+            conn.close()
+
+
+def get_versions(resources, conn=None):
+    """
+    Returns {resource: (version, updated_at)} for the current tenant.
+    Resources never bumped are (0, None).
+    """
+    tenant_id = _get_tenant_id()
+    should_close = False
+    if conn is None:
+        conn = get_db()
+        should_close = True
+
+    if conn is None:
+        raise RuntimeError("Failed to connect to database")
+
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.callproc("get_resource_versions", [tenant_id, ",".join(resources)])
+        found = {}
+        for r in cur.stored_results():
+            for row in r.fetchall():
+                found[row["resource"]] = (row["version"], row["updated_at"])
+        cur.close()
+        return {name: found.get(name, (0, None)) for name in resources}
+    finally:
+        if should_close and conn:
+            conn.close()
@@ -201,6 +201,119 @@ def refresh_scenario(scenario_id, depreciation, daily_insurance, daily_maintenan
             conn.close()
 
 
+def _to_date(x):
+    if x in (None, ""):
+        return None
+    return x if isinstance(x, date) else date.fromisoformat(str(x))
+
+
+def _snapshot_filter_args(vehicle_id=None, driver_id=None, location_id=None, date_from=None, date_to=None):
+    return [
+        _get_tenant_id(), _to_int(vehicle_id), _to_int(driver_id), _to_int(location_id),
+        _to_date(date_from), _to_date(date_to),
+    ]
+
+
+def _call_rows(conn, proc_name, args, commit=False):
+    should_close = False
+    if conn is None:
+        conn = get_db()
+        should_close = True
+
+    if conn is None:
+        raise RuntimeError("Failed to connect to database")
+
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.callproc(proc_name, args)
+        rows = []
+        for r in cur.stored_results():
+            rows.extend(r.fetchall())
+        if commit:
+            conn.commit()
+        cur.close()
+        return rows
+    finally:
+        if should_close and conn:
+            conn.close()
+
+
+def get_routes_missing_trip_miles(vehicle_id=None, driver_id=None, location_id=None,
+                                  date_from=None, date_to=None, conn=None):
+    """
+    Routes used by the matching scenarios that have no cached trip_miles yet,
+    with origin/dest address fields for get_trip_length. No filters means
+    every scenario of the tenant.
+    """
+    args = _snapshot_filter_args(vehicle_id, driver_id, location_id, date_from, date_to)
+    return _call_rows(conn, "get_routes_missing_trip_miles", args)
+
+
+def set_route_trip_miles(route_id, trip_miles, trip_minutes=None, conn=None):
+    """
+    Caches a route's round-trip distance and drive time, read back by
+    refresh_scenarios_bulk and by logic.get_trip_length via the route header.
+    """
+    _call_rows(conn, "set_route_trip_miles", [
+        _get_tenant_id(), int(route_id), _to_dec(trip_miles), _to_dec(trip_minutes)
+    ], commit=True)
+    return True
+
+
+def refresh_scenarios_bulk(vehicle_id=None, driver_id=None, location_id=None, conn=None):
+    """
+    Re-snapshots every scenario that uses the vehicle, driver or location in
+    one set-based statement. Vehicle costs are computed in SQL from per-mile
+    rates and the route's cached trip_miles.
+
+    Returns the number of scenarios refreshed.
+    """
+    if vehicle_id in (None, "") and driver_id in (None, "") and location_id in (None, ""):
+        raise ValueError("vehicle_id, driver_id or location_id is required")
+    return recalculate_scenarios(vehicle_id=vehicle_id, driver_id=driver_id, location_id=location_id, conn=conn)
+
+
+def recalculate_scenarios(vehicle_id=None, driver_id=None, location_id=None,
+                          date_from=None, date_to=None, gas_price=None, conn=None):
+    """
+    Re-snapshots every scenario matching the filters (all of the tenant's
+    scenarios if none are given) in one set-based statement, optionally
+    setting a new gas price on all of them.
+
+    Returns the number of scenarios refreshed.
+    """
+    args = _snapshot_filter_args(vehicle_id, driver_id, location_id, date_from, date_to)
+    args.append(_to_dec(gas_price))
+    rows = _call_rows(conn, "refresh_trip_snapshots_bulk", args, commit=True)
+    return rows[0]["scenarios_refreshed"] if rows else 0
+
+
+def get_route_map_endpoints(scenario_id, conn=None):
+    """
+    Origin and destination names, addresses and coordinates of a scenario's
+    route, or None if it does not exist. No manifest or cost work.
+    """
+    if scenario_id in (None, ""):
+        raise ValueError("scenario_id is required")
+    rows = _call_rows(conn, "get_route_map_endpoints", [_get_tenant_id(), int(scenario_id)])
+    return rows[0] if rows else None
+
+
+def get_route_geometry(pair_key, conn=None):
+    """
+    Cached route geometry row for an origin/dest pair key, or None.
+    """
+    rows = _call_rows(conn, "get_route_geometry", [_get_tenant_id(), pair_key])
+    return rows[0] if rows else None
+
+
+def save_route_geometry(pair_key, geojson, distance_miles, duration_minutes, conn=None):
+    _call_rows(conn, "save_route_geometry", [
+        _get_tenant_id(), pair_key, geojson, _to_dec(distance_miles), _to_dec(duration_minutes)
+    ], commit=True)
+    return True
+
+
 def add_manifest_items(
         scenario_id,
         item_name,
@@ -269,6 +382,14 @@ def update_manifest_item(
         conn=conn
     )
 
+def get_manifest_line(manifest_item_id, conn=None):
+    """
+    One stored manifest line in the get_complete_route_details item shape,
+    or None if it does not exist.
+    """
+    rows = _call_rows(conn, "get_manifest_line", [_get_tenant_id(), int(manifest_item_id)])
+    return rows[0] if rows else None
+
 def remove_manifest_item(manifest_item_id, conn=None):
     """
     Removes an item from the manifest.
@@ -312,4 +433,33 @@ def get_complete_route_details(scenario_id, conn=None):
         return result_sets
     finally:
         if should_close and conn:
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+def get_route_summaries(conn=None):
+    """
+    One fetch for the routes dashboard: every scenario header with its
+    manifest totals, plus the first two manifest lines of each scenario.
+
+    Returns (headers, previews).
+    """
+    should_close = False
+    if conn is None:
+        conn = get_db()
+        should_close = True
+
+    if conn is None:
+        raise RuntimeError("Failed to connect to database")
+
+    tenant_id = _get_tenant_id()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.callproc("get_route_summaries", [tenant_id])
+        result_sets = [r.fetchall() for r in cur.stored_results()]
+        cur.close()
+
+        headers = result_sets[0] if result_sets else []
+        previews = result_sets[1] if len(result_sets) > 1 else []
+        return headers, previews
+    finally:
+        if should_close and conn:
+            conn.close()
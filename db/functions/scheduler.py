@@ -0,0 +1,126 @@
+import socket
+import threading
+import time
+from contextlib import closing
+
+from db.functions.connect import get_lock_db
+
+"""
+In-app scheduler for periodic maintenance jobs.
+
+Jobs are registered with a name, an interval and a function that returns the
+number of rows it affected (or None). Every node runs the same scheduler
+thread; before running a job a node takes the MySQL advisory lock
+GET_LOCK('job:<name>') and checks job_runs, so a job runs on one node at a time
+and at most once per interval across the whole cluster. Each run's duration,
+rows affected and outcome are recorded in job_runs. The lock is held on a
+dedicated connection outside the main pool, which the job itself draws from.
+"""
+
+TICK_SECONDS = 5
+
+_LOCK_PREFIX = "job:"
+
+_jobs = {}  # name -> {"func", "interval", "next_check"}
+_jobs_lock = threading.Lock()
+_thread = None
+_stop = threading.Event()
+
+
+def register_job(name, interval_seconds, func):
+    """
+    Adds (or replaces) a periodic job.
+
+    :param func: callable with no arguments, returns rows affected or None
+    """
+    if len(name) > 64 - len(_LOCK_PREFIX):
+        raise ValueError(f"Job name too long: {name}")
+    with _jobs_lock:
+        _jobs[name] = {"func": func, "interval": int(interval_seconds), "next_check": 0}
+
+
+def _fetch_proc(cur, proc_name, args):
+    cur.callproc(proc_name, args)
+    rows = []
+    for r in cur.stored_results():
+        rows.extend(r.fetchall())
+    return rows
+
+
+def run_job(name, force=False):
+    """
+    Runs a registered job if this node gets its lock and the job is due
+    (or `force` is set). Returns True if the job ran.
+    """
+    job = _jobs.get(name)
+    if job is None:
+        raise ValueError(f"Unknown job: {name}")
+
+    conn = get_lock_db()
+    if conn is None:
+        return False
+
+    try:
+        with closing(conn.cursor(dictionary=True)) as cur:
+            cur.execute("SELECT GET_LOCK(%s, 0) AS acquired", (_LOCK_PREFIX + name,))
+            if cur.fetchone()["acquired"] != 1:
+                return False
+
+            try:
+                last = _fetch_proc(cur, "get_job_run", [name])
+                conn.commit()
+                if not force and last and last[0]["seconds_since_start"] is not None \
+                        and last[0]["seconds_since_start"] < job["interval"]:
+                    return False
+
+                status, error, rows_affected = "ok", None, None
+                start = time.perf_counter()
+                try:
+                    rows_affected = job["func"]()
+                except Exception as e:
+                    status, error = "error", f"{type(e).__name__}: {e}"[:255]
+                duration_ms = int((time.perf_counter() - start) * 1000)
+
+                _fetch_proc(cur, "record_job_run", [
+                    name, duration_ms, rows_affected, status, error, socket.gethostname()
+                ])
+                conn.commit()
+                return True
+            finally:
+                cur.execute("SELECT RELEASE_LOCK(%s) AS released", (_LOCK_PREFIX + name,))
+                cur.fetchone()
+    finally:
+        conn.close()
+
+
+def _run():
+    while not _stop.is_set():
+        now = time.time()
+        with _jobs_lock:
+            due = [name for name, job in _jobs.items() if job["next_check"] <= now]
+        for name in due:
+            try:
+                run_job(name)
+            except Exception as e:
+                print(f"Scheduler error in {name}: {type(e).__name__}")
+            # Re-check within a minute; job_runs decides whether it is actually due
+            with _jobs_lock:
+                if name in _jobs:
+                    _jobs[name]["next_check"] = time.time() + min(_jobs[name]["interval"], 60)
+        _stop.wait(TICK_SECONDS)
+
+
+def start():
+    """
+    Starts the scheduler thread (once per process).
+    """
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="job-scheduler", daemon=True)
+    _thread.start()
+
+
+def stop():
+    _stop.set()
@@ -145,4 +145,107 @@ def view_scenarios(tenant_id, conn=None, columns=None, limit=None, ids=None):
 
 
 def view_manifest_items(tenant_id, conn=None, columns=None, limit=None, ids=None):
-    return _call_view_proc("view_manifest_items", tenant_id, conn, columns, limit, ids)
\ No newline at end of file
+    return _call_view_proc("view_manifest_items", tenant_id, conn, columns, limit, ids)
+
+def _call_find_proc(proc_name, tenant_id, filters, conn=None, columns=None, limit=None):
+    """
+    Helper for the filtered lookup procs (find_supply, find_demand).
+
+    :param filters: ordered list of filter values, None means "don't filter"
+    """
+    should_close = False
+    if conn is None:
+        conn = get_db()
+        should_close = True
+
+    if conn is None:
+        raise RuntimeError("Failed to connect to database")
+
+    try:
+        cur = conn.cursor(dictionary=True)
+
+        cur.callproc(proc_name, [
+            tenant_id,
+            _cols_arg(columns),
+            _limit_arg(limit),
+            *filters,
+        ])
+
+        rows = []
+        for r in cur.stored_results():
+            rows.extend(r.fetchall())
+
+        cur.close()
+        return rows
+    finally:
+        if should_close and conn:
+            conn.close()
+
+
+def _filter_int(x):
+    return int(x) if x not in (None, "") else None
+
+
+def _filter_str(x):
+    return str(x).strip() if x not in (None, "") else None
+
+
+def find_supply(tenant_id, conn=None, columns=None, limit=None,
+                product_code=None, location_id=None, entity_id=None):
+    filters = [_filter_str(product_code), _filter_int(location_id), _filter_int(entity_id)]
+    return _call_find_proc("find_supply", tenant_id, filters, conn, columns, limit)
+
+
+def find_demand(tenant_id, conn=None, columns=None, limit=None,
+                product_code=None, location_id=None):
+    filters = [_filter_str(product_code), _filter_int(location_id)]
+    return _call_find_proc("find_demand", tenant_id, filters, conn, columns, limit)
+
+
+def _call_by_name_proc(proc_name, tenant_id, names, conn=None):
+    """
+    Helper for the projected name -> id lookup procs.
+
+    :param names: iterable of names to resolve
+    """
+    names = [str(n) for n in (names or [])]
+    if not names:
+        return []
+
+    should_close = False
+    if conn is None:
+        conn = get_db()
+        should_close = True
+
+    if conn is None:
+        raise RuntimeError("Failed to connect to database")
+
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.callproc(proc_name, [tenant_id, _ids_arg(names)])
+
+        rows = []
+        for r in cur.stored_results():
+            rows.extend(r.fetchall())
+
+        cur.close()
+        return rows
+    finally:
+        if should_close and conn:
+            conn.close()
+
+
+def view_locations_by_name(tenant_id, names, conn=None):
+    return _call_by_name_proc("view_locations_by_name", tenant_id, names, conn)
+
+
+def view_routes_by_name(tenant_id, names, conn=None):
+    return _call_by_name_proc("view_routes_by_name", tenant_id, names, conn)
+
+
+def view_supply_by_product(tenant_id, product_codes, conn=None):
+    return _call_by_name_proc("view_supply_by_product", tenant_id, product_codes, conn)
+
+
+def view_demand_by_product(tenant_id, product_codes, conn=None):
+    return _call_by_name_proc("view_demand_by_product", tenant_id, product_codes, conn)
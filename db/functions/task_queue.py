@@ -0,0 +1,250 @@
+import json
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import g
+
+from db.functions.connect import get_db
+
+"""
+Durable background task queue for slow post-write work.
+
+Tasks are rows in task_queue, one per (tenant, task key). Enqueueing a key
+that is already queued is a no-op, and enqueueing one that is running makes
+it run once more when it finishes, so a burst of edits to one vehicle costs a
+single recompute. A dispatcher thread claims queued rows (oldest first, safe
+across nodes) and runs them on a bounded thread pool inside an app context
+with g.tenant_id set.
+
+A failed task is retried with exponential backoff: TASK_RETRY_BASE_SECONDS
+after the first failure, doubling per attempt up to TASK_RETRY_MAX_SECONDS.
+After TASK_MAX_ATTEMPTS failed runs it moves to the dead-letter status
+'dead', where it stays (and is reported by metrics()) until it is enqueued
+again. Rows left running by a crashed process are handed out again after
+TASK_STALE_SECONDS; the lost run counts as an attempt.
+
+Handlers are registered per kind with register_handler() and are called with
+the task payload as keyword arguments.
+"""
+
+TASK_QUEUE_WORKERS = int(os.getenv("TASK_QUEUE_WORKERS", 2))
+TASK_QUEUE_POLL_SECONDS = float(os.getenv("TASK_QUEUE_POLL_SECONDS", 2))
+TASK_MAX_ATTEMPTS = int(os.getenv("TASK_MAX_ATTEMPTS", 3))
+TASK_STALE_SECONDS = int(os.getenv("TASK_STALE_SECONDS", 600))
+TASK_RETRY_BASE_SECONDS = int(os.getenv("TASK_RETRY_BASE_SECONDS", 30))
+TASK_RETRY_MAX_SECONDS = int(os.getenv("TASK_RETRY_MAX_SECONDS", 3600))
+
+_handlers = {}  # kind -> callable(**payload)
+_app = None
+_executor = None
+_thread = None
+_stop = threading.Event()
+_wake = threading.Event()
+
+_lock = threading.Lock()
+_busy = 0
+_counters = {"enqueued": 0, "completed": 0, "errors": 0, "last_wait_seconds": None}
+
+
+def register_handler(kind, func):
+    _handlers[kind] = func
+
+
+def task_key(kind, key):
+    key = f"{kind}:{key}"
+    if len(key) > 128:
+        raise ValueError(f"Task key too long: {key}")
+    return key
+
+
+def _call_proc(proc_name, args, conn=None, commit=False):
+    should_close = False
+    if conn is None:
+        conn = get_db()
+        should_close = True
+
+    if conn is None:
+        raise RuntimeError("Failed to connect to database")
+
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.callproc(proc_name, args)
+        rows = []
+        for r in cur.stored_results():
+            rows.extend(r.fetchall())
+        if commit:
+            conn.commit()
+        cur.close()
+        return rows
+    finally:
+        if should_close and conn:
+            conn.close()
+
+
+def enqueue(kind, key, payload=None, tenant_id=None, conn=None):
+    """
+    Records a task durably and wakes the dispatcher. Returns immediately.
+
+    :param key: identifies the work within the kind, e.g. a vehicle id;
+                tasks with the same kind and key are deduplicated
+    :param payload: dict of keyword arguments for the handler
+    """
+    if kind not in _handlers:
+        raise ValueError(f"Unknown task kind: {kind}")
+    if tenant_id is None:
+        tenant_id = g.get("tenant_id")
+    if tenant_id is None:
+        raise RuntimeError("Missing tenant_id for task")
+
+    _call_proc("enqueue_task", [
+        tenant_id, task_key(kind, key), kind, json.dumps(payload or {})
+    ], conn=conn, commit=True)
+
+    with _lock:
+        _counters["enqueued"] += 1
+    _wake.set()
+    return True
+
+
+def get_status(kind, key, tenant_id=None, conn=None):
+    """
+    Returns the task row (status, rerun, attempts, last_error, timestamps
+    including run_after) or None.
+    """
+    if tenant_id is None:
+        tenant_id = g.get("tenant_id")
+    rows = _call_proc("get_task_status", [tenant_id, task_key(kind, key)], conn=conn)
+    return rows[0] if rows else None
+
+
+def _run_task(task):
+    global _busy
+    error = None
+    try:
+        handler = _handlers.get(task["kind"])
+        if handler is None:
+            raise LookupError(f"No handler for task kind {task['kind']}")
+        payload = json.loads(task["payload"]) if task["payload"] else {}
+        with _app.app_context():
+            g.tenant_id = task["tenant_id"]
+            handler(**payload)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"[:255]
+        print(f"Task {task['task_key']} failed: {type(e).__name__}")
+
+    try:
+        _finish(task, error)
+    except Exception as e:
+        # The row stays running and is reclaimed after TASK_STALE_SECONDS
+        print(f"Task queue finish failed: {type(e).__name__}")
+    finally:
+        with _lock:
+            _busy -= 1
+            _counters["errors" if error else "completed"] += 1
+        _wake.set()
+
+
+def _finish(task, error, conn=None):
+    """
+    Marks a claimed task done, schedules its retry, or moves it to 'dead'.
+    """
+    _call_proc("finish_task", [
+        task["tenant_id"], task["task_key"], task["claim_token"], error,
+        TASK_MAX_ATTEMPTS, TASK_RETRY_BASE_SECONDS, TASK_RETRY_MAX_SECONDS
+    ], conn=conn, commit=True)
+
+
+def _claim(limit, conn=None):
+    rows = _call_proc("claim_tasks", [
+        socket.gethostname(), limit, TASK_STALE_SECONDS, TASK_MAX_ATTEMPTS
+    ], conn=conn, commit=True)
+    if rows:
+        with _lock:
+            _counters["last_wait_seconds"] = float(max(r["wait_seconds"] or 0 for r in rows))
+    return rows
+
+
+def _dispatch():
+    global _busy
+    while not _stop.is_set():
+        with _lock:
+            free = TASK_QUEUE_WORKERS - _busy
+
+        claimed = []
+        if free > 0:
+            try:
+                claimed = _claim(free)
+            except Exception as e:
+                print(f"Task queue claim failed: {type(e).__name__}")
+
+        for task in claimed:
+            with _lock:
+                _busy += 1
+            _executor.submit(_run_task, task)
+
+        # Claim again right away if the pool filled up; otherwise wait for
+        # an enqueue, a finished task or the poll interval
+        if not claimed or len(claimed) < free:
+            _wake.wait(TASK_QUEUE_POLL_SECONDS)
+            _wake.clear()
+
+
+def start(app):
+    """
+    Starts the dispatcher thread and worker pool (once per process).
+    """
+    global _app, _executor, _thread
+    if TASK_QUEUE_WORKERS <= 0:
+        return
+    if _thread is not None and _thread.is_alive():
+        return
+    _app = app
+    _executor = ThreadPoolExecutor(max_workers=TASK_QUEUE_WORKERS, thread_name_prefix="task-worker")
+    _stop.clear()
+    _thread = threading.Thread(target=_dispatch, name="task-dispatcher", daemon=True)
+    _thread.start()
+
+
+def stop():
+    _stop.set()
+    _wake.set()
+
+
+def is_running():
+    """
+    True if this process runs the dispatcher. Callers do the work inline
+    otherwise, since nothing would pick up an enqueued task.
+    """
+    return _thread is not None and _thread.is_alive() and not _stop.is_set()
+
+
+def purge(max_age_seconds):
+    """
+    Deletes finished tasks older than max_age_seconds. Returns rows deleted.
+    """
+    rows = _call_proc("purge_finished_tasks", [int(max_age_seconds)], commit=True)
+    return rows[0]["purged"] if rows else 0
+
+
+def metrics():
+    """
+    depth, retrying (queued after a failure), running, dead and lag_seconds
+    (how long the oldest due task has waited) come from the task table and
+    cover every node. The rest describe this process: busy workers, and
+    tasks enqueued, completed and errored since start.
+    """
+    with _lock:
+        out = {"workers": TASK_QUEUE_WORKERS, "busy": _busy, **_counters}
+
+    stats = _call_proc("get_task_queue_stats", [])
+    row = stats[0] if stats else {}
+    out.update({
+        "depth": int(row.get("depth") or 0),
+        "retrying": int(row.get("retrying") or 0),
+        "running": int(row.get("running") or 0),
+        "dead": int(row.get("dead") or 0),
+        "lag_seconds": float(row.get("lag_seconds") or 0),
+    })
+    return out
@@ -0,0 +1,30 @@
+from flask import g
+from ..batch_writer import (
+    DEFAULT_BATCH_SIZE,
+    insert_rows,
+    update_rows,
+)
+from ..bulk_loader import bulk_load
+
+
+def _tenant_id():
+    """
+    Fetch tenant_id from request context.
+    Fail loudly if missing.
+    """
+    tid = getattr(g, "tenant_id", None)
+    if tid is None:
+        raise RuntimeError("Missing g.tenant_id (auth middleware not run?)")
+    return int(tid)
+
+
+def insert_rows_scoped(*, table, columns, rows, conn=None, batch_size=DEFAULT_BATCH_SIZE):
+    return insert_rows(_tenant_id(), table, columns, rows, conn=conn, batch_size=batch_size)
+
+
+def update_rows_scoped(*, table, key_column, columns, rows, conn=None, batch_size=DEFAULT_BATCH_SIZE):
+    return update_rows(_tenant_id(), table, key_column, columns, rows, conn=conn, batch_size=batch_size)
+
+
+def bulk_load_scoped(*, target, rows, conn=None):
+    return bulk_load(_tenant_id(), target, rows, conn=conn)
@@ -11,6 +11,12 @@ from ..simple_functions.read import (
     view_routes,
     view_scenarios,
     view_manifest_items,
+    find_supply,
+    find_demand,
+    view_locations_by_name,
+    view_routes_by_name,
+    view_supply_by_product,
+    view_demand_by_product,
 )
 
 
@@ -122,4 +128,45 @@ def view_manifest_items_scoped(*, conn=None, columns=None, limit=None, ids=None)
         columns=columns,
         limit=limit,
         ids=ids,
-    )
\ No newline at end of file
+    )
+
+
+def find_supply_scoped(*, conn=None, columns=None, limit=None,
+                       product_code=None, location_id=None, entity_id=None):
+    return find_supply(
+        _tenant_id(),
+        conn=conn,
+        columns=columns,
+        limit=limit,
+        product_code=product_code,
+        location_id=location_id,
+        entity_id=entity_id,
+    )
+
+
+def find_demand_scoped(*, conn=None, columns=None, limit=None,
+                       product_code=None, location_id=None):
+    return find_demand(
+        _tenant_id(),
+        conn=conn,
+        columns=columns,
+        limit=limit,
+        product_code=product_code,
+        location_id=location_id,
+    )
+
+
+def view_locations_by_name_scoped(*, names, conn=None):
+    return view_locations_by_name(_tenant_id(), names, conn=conn)
+
+
+def view_routes_by_name_scoped(*, names, conn=None):
+    return view_routes_by_name(_tenant_id(), names, conn=conn)
+
+
+def view_supply_by_product_scoped(*, product_codes, conn=None):
+    return view_supply_by_product(_tenant_id(), product_codes, conn=conn)
+
+
+def view_demand_by_product_scoped(*, product_codes, conn=None):
+    return view_demand_by_product(_tenant_id(), product_codes, conn=conn)
@@ -1,20 +1,30 @@
 DELIMITER $$
 
 DROP PROCEDURE IF EXISTS clean_anon_users $$
-CREATE PROCEDURE clean_anon_users(IN p_max_age_seconds INT)
+CREATE PROCEDURE clean_anon_users(IN p_max_age_seconds INT, IN p_limit INT)
 BEGIN
+    -- Removes at most p_limit expired anonymous tenants (oldest first, via
+    -- idx_users_role_active) and queues their ids so the main DB cleanup can
+    -- catch up even if it is interrupted
     DROP TEMPORARY TABLE IF EXISTS _deleted_tenants;
-    CREATE TEMPORARY TABLE _deleted_tenants (tenant_id BIGINT);
+    CREATE TEMPORARY TABLE _deleted_tenants (tenant_id BIGINT PRIMARY KEY);
 
-    INSERT INTO _deleted_tenants (tenant_id)
+    INSERT IGNORE INTO _deleted_tenants (tenant_id)
     SELECT tenant_id FROM users
     WHERE role = 'Anonymous'
-    AND last_active < NOW() - INTERVAL p_max_age_seconds SECOND;
+    AND last_active < NOW() - INTERVAL p_max_age_seconds SECOND
+    ORDER BY last_active
+    LIMIT p_limit;
 
-    DELETE FROM tenants
-    WHERE tenant_id IN (SELECT tenant_id FROM _deleted_tenants);
+    INSERT IGNORE INTO tenant_cleanup_queue (tenant_id)
+    SELECT tenant_id FROM _deleted_tenants;
+
+    DELETE t FROM tenants t
+    JOIN _deleted_tenants d ON d.tenant_id = t.tenant_id;
 
     SELECT tenant_id FROM _deleted_tenants;
+
+    DROP TEMPORARY TABLE _deleted_tenants;
 END $$
 
 DROP PROCEDURE IF EXISTS update_user_activity $$
@@ -46,4 +56,28 @@ BEGIN
     WHERE tenant_id = v_tenant_id;
 END $$
 
-DELIMITER ;
\ No newline at end of file
+DROP PROCEDURE IF EXISTS claim_anonymous_user $$
+CREATE PROCEDURE claim_anonymous_user()
+BEGIN
+    -- One atomic UPDATE takes a pre-provisioned user out of the pool;
+    -- LAST_INSERT_ID(expr) carries the claimed id out of the statement
+    UPDATE users
+    SET role = 'Anonymous',
+        last_active = NOW(),
+        user_id = LAST_INSERT_ID(user_id)
+    WHERE role = 'AnonymousPool'
+    ORDER BY user_id
+    LIMIT 1;
+
+    IF ROW_COUNT() > 0 THEN
+        SELECT user_id, tenant_id FROM users WHERE user_id = LAST_INSERT_ID();
+    END IF;
+END $$
+
+DROP PROCEDURE IF EXISTS count_anonymous_pool $$
+CREATE PROCEDURE count_anonymous_pool()
+BEGIN
+    SELECT COUNT(*) AS pool_size FROM users WHERE role = 'AnonymousPool';
+END $$
+
+DELIMITER ;
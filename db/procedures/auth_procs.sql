@@ -38,7 +38,7 @@ CREATE PROCEDURE get_user_by_username(
     IN p_username VARCHAR(50)
 )
 BEGIN
-    SELECT user_id, tenant_id, password_hash, role
+    SELECT user_id, tenant_id, password_hash, role, totp_confirmed
     FROM users
     WHERE username = p_username;
 END $$
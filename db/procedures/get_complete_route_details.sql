@@ -32,6 +32,8 @@ BEGIN
         r.name as route_name,
         r.origin_location_id,
         r.dest_location_id,
+        r.trip_miles,
+        r.trip_minutes,
         
         l_orig.name as origin_name,
         l_orig.address_street as origin_address_street,
@@ -71,4 +73,109 @@ BEGIN
 
 END $$
 
+DROP PROCEDURE IF EXISTS get_route_summaries $$
+
+-- Dashboard rows: the same header as get_complete_route_details for every
+-- scenario, with manifest totals aggregated in SQL instead of the lines.
+CREATE PROCEDURE get_route_summaries(
+    IN p_tenant_id INT
+)
+BEGIN
+    -- 1. Headers + Manifest Totals
+    SELECT 
+        s.scenario_id,
+        s.run_date,
+        s.snapshot_total_revenue as entered_revenue,
+        s.snapshot_driver_wage as driver_drive_rate,
+        s.snapshot_driver_load_wage as driver_load_rate,
+        s.snapshot_vehicle_mpg as vehicle_mpg,
+        s.snapshot_gas_price as gas_price,
+        s.snapshot_depreciation_per_mile as depreciation_per_mile,
+        s.snapshot_daily_insurance as daily_insurance,
+        s.snapshot_daily_maintenance_cost as daily_maintenance_cost,
+        s.snapshot_planned_load_minutes as plan_load_min,
+        s.snapshot_planned_unload_minutes as plan_unload_min,
+        s.vehicle_id,
+        v.name as vehicle_name,
+        s.driver_id,
+        d.name as driver_name,
+        s.route_id,
+        r.name as route_name,
+        r.trip_miles,
+        r.trip_minutes,
+        l_orig.name as origin_name,
+        l_orig.address_street as origin_address_street,
+        l_orig.city as origin_city,
+        l_orig.state as origin_state,
+        l_dest.name as dest_name,
+        l_dest.address_street as dest_address_street,
+        l_dest.city as dest_city,
+        l_dest.state as dest_state,
+
+        COALESCE(m.line_item_count, 0) as line_item_count,
+        COALESCE(m.calculated_revenue, 0) as calculated_revenue,
+        COALESCE(m.total_cogs, 0) as total_cogs,
+        COALESCE(m.total_weight_lbs, 0) as total_weight_lbs,
+        COALESCE(m.total_volume, 0) as total_volume
+
+    FROM scenarios s
+    JOIN routes r ON s.route_id = r.route_id AND s.tenant_id = r.tenant_id
+    JOIN locations l_orig ON r.origin_location_id = l_orig.location_id AND l_orig.tenant_id = p_tenant_id
+    JOIN locations l_dest ON r.dest_location_id = l_dest.location_id AND l_dest.tenant_id = p_tenant_id
+    LEFT JOIN vehicles v ON s.vehicle_id = v.vehicle_id AND s.tenant_id = v.tenant_id
+    LEFT JOIN drivers d ON s.driver_id = d.driver_id AND s.tenant_id = d.tenant_id
+    LEFT JOIN (
+        -- Same line math as calculate_manifest_item_metrics
+        SELECT
+            mi.scenario_id,
+            COUNT(*) as line_item_count,
+            SUM(ROUND(COALESCE(mi.snapshot_price_per_item, 0) * COALESCE(mi.quantity_loaded, 0) * COALESCE(mi.snapshot_items_per_unit, 1), 2)) as calculated_revenue,
+            SUM(ROUND(COALESCE(mi.snapshot_cost_per_item, 0) * COALESCE(mi.quantity_loaded, 0) * COALESCE(mi.snapshot_items_per_unit, 1), 2)) as total_cogs,
+            SUM(ROUND(COALESCE(mi.snapshot_unit_weight, 0) * COALESCE(mi.quantity_loaded, 0), 2)) as total_weight_lbs,
+            SUM(ROUND(COALESCE(mi.snapshot_unit_volume, 0) * COALESCE(mi.quantity_loaded, 0), 2)) as total_volume
+        FROM manifest_items mi
+        WHERE mi.tenant_id = p_tenant_id
+        GROUP BY mi.scenario_id
+    ) m ON m.scenario_id = s.scenario_id
+    WHERE s.tenant_id = p_tenant_id;
+
+    -- 2. First two manifest lines per scenario (by product name) for the list preview
+    SELECT scenario_id, product_name, quantity
+    FROM (
+        SELECT
+            mi.scenario_id,
+            mi.item_name as product_name,
+            mi.quantity_loaded as quantity,
+            ROW_NUMBER() OVER (PARTITION BY mi.scenario_id ORDER BY mi.item_name, mi.manifest_item_id) as rn
+        FROM manifest_items mi
+        WHERE mi.tenant_id = p_tenant_id
+    ) ranked
+    WHERE rn <= 2;
+
+END $$
+
+DROP PROCEDURE IF EXISTS get_manifest_line $$
+
+-- One stored manifest line, same columns as the manifest result set of
+-- get_complete_route_details. Read back after a manifest edit.
+CREATE PROCEDURE get_manifest_line(
+    IN p_tenant_id INT,
+    IN p_manifest_item_id INT
+)
+BEGIN
+    SELECT 
+        mi.manifest_item_id,
+        mi.item_name as product_name,
+        mi.quantity_loaded,
+        mi.snapshot_items_per_unit as items_per_unit,
+        mi.snapshot_unit_weight as unit_weight_lbs,
+        mi.snapshot_unit_volume as unit_volume,
+        mi.snapshot_cost_per_item as cost_per_item,
+        mi.snapshot_price_per_item as price_per_item,
+        pm.product_code as product_id
+    FROM manifest_items mi
+    LEFT JOIN products_master pm ON mi.item_name = pm.name AND mi.tenant_id = pm.tenant_id
+    WHERE mi.manifest_item_id = p_manifest_item_id AND mi.tenant_id = p_tenant_id;
+END $$
+
 DELIMITER ;
\ No newline at end of file
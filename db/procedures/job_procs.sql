@@ -0,0 +1,44 @@
+DELIMITER $$
+
+DROP PROCEDURE IF EXISTS get_job_run $$
+CREATE PROCEDURE get_job_run(IN p_job_name VARCHAR(64))
+BEGIN
+    SELECT job_name, last_started_at, last_duration_ms, last_rows_affected,
+           last_status, last_error, last_node, run_count,
+           TIMESTAMPDIFF(SECOND, last_started_at, NOW()) AS seconds_since_start
+    FROM job_runs
+    WHERE job_name = p_job_name;
+END $$
+
+DROP PROCEDURE IF EXISTS record_job_run $$
+CREATE PROCEDURE record_job_run(
+    IN p_job_name VARCHAR(64),
+    IN p_duration_ms INT,
+    IN p_rows_affected INT,
+    IN p_status VARCHAR(10),
+    IN p_error VARCHAR(255),
+    IN p_node VARCHAR(255)
+)
+BEGIN
+    -- Start time is derived server-side so it compares cleanly with NOW()
+    DECLARE v_started_at DATETIME DEFAULT NOW() - INTERVAL p_duration_ms * 1000 MICROSECOND;
+
+    INSERT INTO job_runs (
+        job_name, last_started_at, last_duration_ms, last_rows_affected,
+        last_status, last_error, last_node, run_count
+    )
+    VALUES (
+        p_job_name, v_started_at, p_duration_ms, p_rows_affected,
+        p_status, p_error, p_node, 1
+    )
+    ON DUPLICATE KEY UPDATE
+        last_started_at = VALUES(last_started_at),
+        last_duration_ms = VALUES(last_duration_ms),
+        last_rows_affected = VALUES(last_rows_affected),
+        last_status = VALUES(last_status),
+        last_error = VALUES(last_error),
+        last_node = VALUES(last_node),
+        run_count = run_count + 1;
+END $$
+
+DELIMITER ;
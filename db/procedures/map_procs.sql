@@ -0,0 +1,64 @@
+DELIMITER $$
+
+DROP PROCEDURE IF EXISTS get_route_map_endpoints $$
+
+-- Just the two locations of a scenario route; no manifest or cost data.
+CREATE PROCEDURE get_route_map_endpoints(
+    IN p_tenant_id INT,
+    IN p_scenario_id INT
+)
+BEGIN
+    SELECT
+        s.scenario_id,
+        r.route_id,
+        l_orig.name as origin_name,
+        l_orig.address_street as origin_address_street,
+        l_orig.city as origin_city,
+        l_orig.state as origin_state,
+        l_orig.latitude as origin_latitude,
+        l_orig.longitude as origin_longitude,
+        l_dest.name as dest_name,
+        l_dest.address_street as dest_address_street,
+        l_dest.city as dest_city,
+        l_dest.state as dest_state,
+        l_dest.latitude as dest_latitude,
+        l_dest.longitude as dest_longitude
+    FROM scenarios s
+    JOIN routes r ON s.route_id = r.route_id AND s.tenant_id = r.tenant_id
+    JOIN locations l_orig ON r.origin_location_id = l_orig.location_id AND l_orig.tenant_id = p_tenant_id
+    JOIN locations l_dest ON r.dest_location_id = l_dest.location_id AND l_dest.tenant_id = p_tenant_id
+    WHERE s.scenario_id = p_scenario_id AND s.tenant_id = p_tenant_id;
+END $$
+
+DROP PROCEDURE IF EXISTS get_route_geometry $$
+
+CREATE PROCEDURE get_route_geometry(
+    IN p_tenant_id INT,
+    IN p_pair_key CHAR(64)
+)
+BEGIN
+    SELECT geojson, distance_miles, duration_minutes, created_at
+    FROM route_geometries
+    WHERE tenant_id = p_tenant_id AND pair_key = p_pair_key;
+END $$
+
+DROP PROCEDURE IF EXISTS save_route_geometry $$
+
+CREATE PROCEDURE save_route_geometry(
+    IN p_tenant_id INT,
+    IN p_pair_key CHAR(64),
+    IN p_geojson MEDIUMTEXT,
+    IN p_distance_miles DECIMAL(10,2),
+    IN p_duration_minutes DECIMAL(10,2)
+)
+BEGIN
+    INSERT INTO route_geometries (tenant_id, pair_key, geojson, distance_miles, duration_minutes, created_at)
+    VALUES (p_tenant_id, p_pair_key, p_geojson, p_distance_miles, p_duration_minutes, NOW())
+    ON DUPLICATE KEY UPDATE
+        geojson = VALUES(geojson),
+        distance_miles = VALUES(distance_miles),
+        duration_minutes = VALUES(duration_minutes),
+        created_at = VALUES(created_at);
+END $$
+
+DELIMITER ;
@@ -0,0 +1,47 @@
+DELIMITER $$
+
+DROP PROCEDURE IF EXISTS rate_limit_hit $$
+CREATE PROCEDURE rate_limit_hit(
+    IN p_bucket VARCHAR(32),
+    IN p_key VARCHAR(255),
+    IN p_window_seconds INT,
+    IN p_limit INT
+)
+BEGIN
+    DECLARE v_now BIGINT DEFAULT UNIX_TIMESTAMP();
+    DECLARE v_start BIGINT DEFAULT v_now - MOD(v_now, p_window_seconds);
+    DECLARE v_current INT DEFAULT 0;
+    DECLARE v_previous INT DEFAULT 0;
+
+    -- Make sure the current window's row exists, then lock it so
+    -- concurrent workers checking the same key are serialized
+    INSERT INTO rate_limits (bucket, rate_key, window_start, hits)
+    VALUES (p_bucket, p_key, v_start, 0)
+    ON DUPLICATE KEY UPDATE hits = hits;
+
+    SELECT hits INTO v_current
+    FROM rate_limits
+    WHERE bucket = p_bucket AND rate_key = p_key AND window_start = v_start
+    FOR UPDATE;
+
+    SELECT COALESCE(MAX(hits), 0) INTO v_previous
+    FROM rate_limits
+    WHERE bucket = p_bucket AND rate_key = p_key AND window_start = v_start - p_window_seconds;
+
+    IF v_previous * (p_window_seconds - (v_now - v_start)) / p_window_seconds + v_current < p_limit THEN
+        UPDATE rate_limits
+        SET hits = hits + 1
+        WHERE bucket = p_bucket AND rate_key = p_key AND window_start = v_start;
+
+        SELECT TRUE AS allowed;
+    ELSE
+        SELECT FALSE AS allowed;
+    END IF;
+
+    -- Windows older than the previous one can't affect any check
+    DELETE FROM rate_limits
+    WHERE bucket = p_bucket AND window_start < v_start - p_window_seconds
+    LIMIT 100;
+END $$
+
+DELIMITER ;
@@ -93,4 +93,63 @@ BEGIN
     PREPARE stmt FROM @sql; EXECUTE stmt; DEALLOCATE PREPARE stmt;
 END $$
 
+DROP PROCEDURE IF EXISTS find_supply $$
+CREATE PROCEDURE find_supply(IN p_tenant_id INT, IN p_cols TEXT, IN p_limit INT,
+                             IN p_product_code VARCHAR(50), IN p_location_id INT, IN p_entity_id INT)
+BEGIN
+    -- NULL filters are left out of the WHERE clause so each query can use the matching composite index
+    SET @sql = CONCAT('SELECT ', COALESCE(p_cols, '*'), ' FROM supply WHERE tenant_id = ', p_tenant_id);
+    IF p_product_code IS NOT NULL THEN SET @sql = CONCAT(@sql, ' AND product_code = ', QUOTE(p_product_code)); END IF;
+    IF p_location_id IS NOT NULL THEN SET @sql = CONCAT(@sql, ' AND location_id = ', p_location_id); END IF;
+    IF p_entity_id IS NOT NULL THEN SET @sql = CONCAT(@sql, ' AND entity_id = ', p_entity_id); END IF;
+    IF p_limit IS NOT NULL THEN SET @sql = CONCAT(@sql, ' LIMIT ', p_limit); END IF;
+    PREPARE stmt FROM @sql; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+END $$
+
+DROP PROCEDURE IF EXISTS find_demand $$
+CREATE PROCEDURE find_demand(IN p_tenant_id INT, IN p_cols TEXT, IN p_limit INT,
+                             IN p_product_code VARCHAR(50), IN p_location_id INT)
+BEGIN
+    SET @sql = CONCAT('SELECT ', COALESCE(p_cols, '*'), ' FROM demand WHERE tenant_id = ', p_tenant_id);
+    IF p_product_code IS NOT NULL THEN SET @sql = CONCAT(@sql, ' AND product_code = ', QUOTE(p_product_code)); END IF;
+    IF p_location_id IS NOT NULL THEN SET @sql = CONCAT(@sql, ' AND location_id = ', p_location_id); END IF;
+    IF p_limit IS NOT NULL THEN SET @sql = CONCAT(@sql, ' LIMIT ', p_limit); END IF;
+    PREPARE stmt FROM @sql; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+END $$
+
+DROP PROCEDURE IF EXISTS view_locations_by_name $$
+CREATE PROCEDURE view_locations_by_name(IN p_tenant_id INT, IN p_names TEXT)
+BEGIN
+    -- Projected name -> id lookup for imports; p_names is a quoted, comma separated list
+    SET @sql = CONCAT('SELECT location_id, name FROM locations WHERE tenant_id = ', p_tenant_id,
+                      ' AND name IN (', p_names, ')');
+    PREPARE stmt FROM @sql; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+END $$
+
+DROP PROCEDURE IF EXISTS view_supply_by_product $$
+CREATE PROCEDURE view_supply_by_product(IN p_tenant_id INT, IN p_product_codes TEXT)
+BEGIN
+    -- Projected supply key -> id lookup for imports; served by idx_supply_product_location
+    SET @sql = CONCAT('SELECT supply_id, entity_id, location_id, product_code FROM supply WHERE tenant_id = ', p_tenant_id,
+                      ' AND product_code IN (', p_product_codes, ')');
+    PREPARE stmt FROM @sql; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+END $$
+
+DROP PROCEDURE IF EXISTS view_demand_by_product $$
+CREATE PROCEDURE view_demand_by_product(IN p_tenant_id INT, IN p_product_codes TEXT)
+BEGIN
+    -- Projected demand key -> id lookup for imports; served by idx_demand_product_location
+    SET @sql = CONCAT('SELECT demand_id, location_id, product_code FROM demand WHERE tenant_id = ', p_tenant_id,
+                      ' AND product_code IN (', p_product_codes, ')');
+    PREPARE stmt FROM @sql; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+END $$
+
+DROP PROCEDURE IF EXISTS view_routes_by_name $$
+CREATE PROCEDURE view_routes_by_name(IN p_tenant_id INT, IN p_names TEXT)
+BEGIN
+    SET @sql = CONCAT('SELECT route_id, name FROM routes WHERE tenant_id = ', p_tenant_id,
+                      ' AND name IN (', p_names, ')');
+    PREPARE stmt FROM @sql; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+END $$
+
 DELIMITER ;
\ No newline at end of file
@@ -39,4 +39,108 @@ BEGIN
     WHERE s.scenario_id = p_scenario_id AND s.tenant_id = p_tenant_id;
 END $$
 
+DROP PROCEDURE IF EXISTS get_routes_missing_trip_miles $$
+
+-- Routes used by the matching scenarios whose round-trip distance is not
+-- cached yet, with the addresses needed to look it up.
+CREATE PROCEDURE get_routes_missing_trip_miles(
+    IN p_tenant_id INT,
+    IN p_vehicle_id INT,
+    IN p_driver_id INT,
+    IN p_location_id INT,
+    IN p_date_from DATE,
+    IN p_date_to DATE
+)
+BEGIN
+    SELECT DISTINCT
+        r.route_id,
+        l_orig.address_street as origin_address_street,
+        l_orig.city as origin_city,
+        l_orig.state as origin_state,
+        l_dest.address_street as dest_address_street,
+        l_dest.city as dest_city,
+        l_dest.state as dest_state
+    FROM scenarios s
+    JOIN routes r ON s.route_id = r.route_id AND s.tenant_id = r.tenant_id
+    JOIN locations l_orig ON r.origin_location_id = l_orig.location_id AND l_orig.tenant_id = r.tenant_id
+    JOIN locations l_dest ON r.dest_location_id = l_dest.location_id AND l_dest.tenant_id = r.tenant_id
+    WHERE s.tenant_id = p_tenant_id
+      AND (r.trip_miles IS NULL OR r.trip_minutes IS NULL)
+      AND (p_vehicle_id IS NULL OR s.vehicle_id = p_vehicle_id)
+      AND (p_driver_id IS NULL OR s.driver_id = p_driver_id)
+      AND (p_location_id IS NULL OR r.origin_location_id = p_location_id OR r.dest_location_id = p_location_id)
+      AND (p_date_from IS NULL OR s.run_date >= p_date_from)
+      AND (p_date_to IS NULL OR s.run_date <= p_date_to);
+END $$
+
+DROP PROCEDURE IF EXISTS set_route_trip_miles $$
+
+CREATE PROCEDURE set_route_trip_miles(
+    IN p_tenant_id INT,
+    IN p_route_id INT,
+    IN p_trip_miles DECIMAL(10,2),
+    IN p_trip_minutes DECIMAL(10,2)
+)
+BEGIN
+    UPDATE routes
+    SET trip_miles = p_trip_miles, trip_minutes = p_trip_minutes
+    WHERE route_id = p_route_id AND tenant_id = p_tenant_id;
+END $$
+
+DROP PROCEDURE IF EXISTS refresh_trip_snapshots_bulk $$
+
+-- Set-based refresh_trip_snapshots for every scenario matching the filters:
+-- vehicle, driver, location (as route origin or destination) and run_date
+-- range. NULL filters match everything. Vehicle costs are trip totals: the
+-- per-mile rates stored on vehicles times the cached round-trip miles of
+-- the route. Scenarios on routes without cached miles keep their current
+-- vehicle cost snapshots. p_gas_price, when set, replaces the gas price.
+CREATE PROCEDURE refresh_trip_snapshots_bulk(
+    IN p_tenant_id INT,
+    IN p_vehicle_id INT,
+    IN p_driver_id INT,
+    IN p_location_id INT,
+    IN p_date_from DATE,
+    IN p_date_to DATE,
+    IN p_gas_price DECIMAL(6,3)
+)
+BEGIN
+    UPDATE scenarios s
+    JOIN routes r ON s.route_id = r.route_id AND s.tenant_id = r.tenant_id
+    JOIN locations l_orig ON r.origin_location_id = l_orig.location_id AND l_orig.tenant_id = r.tenant_id
+    JOIN locations l_dest ON r.dest_location_id = l_dest.location_id AND l_dest.tenant_id = r.tenant_id
+    LEFT JOIN drivers d ON s.driver_id = d.driver_id AND s.tenant_id = d.tenant_id
+    LEFT JOIN vehicles v ON s.vehicle_id = v.vehicle_id AND s.tenant_id = v.tenant_id
+    SET
+        s.snapshot_driver_wage = COALESCE(d.hourly_drive_wage, s.snapshot_driver_wage),
+        s.snapshot_driver_load_wage = COALESCE(d.hourly_load_wage, s.snapshot_driver_load_wage),
+
+        s.snapshot_vehicle_mpg = COALESCE(v.mpg, s.snapshot_vehicle_mpg),
+        s.snapshot_gas_price = COALESCE(p_gas_price, s.snapshot_gas_price),
+        s.snapshot_depreciation_per_mile = COALESCE(v.depreciation_per_mile * r.trip_miles, s.snapshot_depreciation_per_mile),
+        s.snapshot_daily_insurance = COALESCE(v.insurance_per_mile * r.trip_miles, s.snapshot_daily_insurance),
+        s.snapshot_daily_maintenance_cost = COALESCE(v.maintenance_per_mile * r.trip_miles, s.snapshot_daily_maintenance_cost),
+
+        s.snapshot_planned_load_minutes = l_orig.avg_load_minutes,
+        s.snapshot_planned_unload_minutes = l_dest.avg_unload_minutes
+    WHERE s.tenant_id = p_tenant_id
+      AND (p_vehicle_id IS NULL OR s.vehicle_id = p_vehicle_id)
+      AND (p_driver_id IS NULL OR s.driver_id = p_driver_id)
+      AND (p_location_id IS NULL OR r.origin_location_id = p_location_id OR r.dest_location_id = p_location_id)
+      AND (p_date_from IS NULL OR s.run_date >= p_date_from)
+      AND (p_date_to IS NULL OR s.run_date <= p_date_to);
+
+    -- ROW_COUNT() only counts rows whose values changed (no FOUND_ROWS
+    -- client flag), so count the scenarios the filter matched instead
+    SELECT COUNT(*) AS scenarios_refreshed
+    FROM scenarios s
+    JOIN routes r ON s.route_id = r.route_id AND s.tenant_id = r.tenant_id
+    WHERE s.tenant_id = p_tenant_id
+      AND (p_vehicle_id IS NULL OR s.vehicle_id = p_vehicle_id)
+      AND (p_driver_id IS NULL OR s.driver_id = p_driver_id)
+      AND (p_location_id IS NULL OR r.origin_location_id = p_location_id OR r.dest_location_id = p_location_id)
+      AND (p_date_from IS NULL OR s.run_date >= p_date_from)
+      AND (p_date_to IS NULL OR s.run_date <= p_date_to);
+END $$
+
 DELIMITER ;
\ No newline at end of file
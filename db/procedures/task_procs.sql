@@ -0,0 +1,129 @@
+DELIMITER $$
+
+DROP PROCEDURE IF EXISTS enqueue_task $$
+CREATE PROCEDURE enqueue_task(
+    IN p_tenant_id INT,
+    IN p_task_key VARCHAR(128),
+    IN p_kind VARCHAR(64),
+    IN p_payload TEXT
+)
+BEGIN
+    -- A queued task absorbs the new request (keeping any retry backoff); a
+    -- running one is flagged to run once more when it finishes; a done or
+    -- dead one is queued again with fresh attempts.
+    -- status is assigned last so the other columns see its old value.
+    INSERT INTO task_queue (tenant_id, task_key, kind, payload, status, enqueued_at, run_after)
+    VALUES (p_tenant_id, p_task_key, p_kind, p_payload, 'queued', NOW(3), NOW(3))
+    ON DUPLICATE KEY UPDATE
+        kind = VALUES(kind),
+        payload = VALUES(payload),
+        rerun = IF(status = 'running', 1, rerun),
+        attempts = IF(status IN ('done', 'dead'), 0, attempts),
+        enqueued_at = IF(status = 'queued', enqueued_at, NOW(3)),
+        run_after = IF(status IN ('done', 'dead'), NOW(3), run_after),
+        status = IF(status = 'running', 'running', 'queued');
+END $$
+
+DROP PROCEDURE IF EXISTS claim_tasks $$
+CREATE PROCEDURE claim_tasks(
+    IN p_node VARCHAR(255),
+    IN p_limit INT,
+    IN p_stale_seconds INT,
+    IN p_max_attempts INT
+)
+BEGIN
+    DECLARE v_token CHAR(36) DEFAULT UUID();
+
+    -- Tasks left running by a node that died are handed out again; the lost
+    -- run counts as an attempt, so a task that keeps crashing its worker ends dead
+    UPDATE task_queue
+    SET status = IF(attempts >= p_max_attempts, 'dead', 'queued'),
+        last_error = 'Worker did not finish the task',
+        claim_token = NULL,
+        run_after = NOW(3)
+    WHERE status = 'running' AND started_at < NOW(3) - INTERVAL p_stale_seconds SECOND;
+
+    UPDATE task_queue
+    SET status = 'running',
+        claim_token = v_token,
+        node = p_node,
+        started_at = NOW(3),
+        attempts = attempts + 1
+    WHERE status = 'queued' AND run_after <= NOW(3)
+    ORDER BY run_after
+    LIMIT p_limit;
+
+    SELECT tenant_id, task_key, kind, payload, attempts, claim_token,
+           TIMESTAMPDIFF(MICROSECOND, run_after, started_at) / 1000000 AS wait_seconds
+    FROM task_queue
+    WHERE claim_token = v_token AND status = 'running';
+END $$
+
+DROP PROCEDURE IF EXISTS finish_task $$
+CREATE PROCEDURE finish_task(
+    IN p_tenant_id INT,
+    IN p_task_key VARCHAR(128),
+    IN p_claim_token CHAR(36),
+    IN p_error VARCHAR(255),
+    IN p_max_attempts INT,
+    IN p_retry_base_seconds INT,
+    IN p_retry_max_seconds INT
+)
+BEGIN
+    -- A failed task is retried after p_retry_base_seconds, doubling per
+    -- attempt up to p_retry_max_seconds, and is dead once it is out of
+    -- attempts. A rerun requested while it ran only resets the attempts when
+    -- this run succeeded, so re-enqueues cannot keep a failing task spinning.
+    -- Assigned in order: status and run_after read attempts and rerun before they change.
+    UPDATE task_queue
+    SET status = CASE
+            WHEN p_error IS NOT NULL AND attempts >= p_max_attempts THEN 'dead'
+            WHEN p_error IS NOT NULL OR rerun = 1 THEN 'queued'
+            ELSE 'done' END,
+        run_after = IF(p_error IS NULL, NOW(3),
+                       NOW(3) + INTERVAL LEAST(p_retry_base_seconds * POW(2, attempts - 1), p_retry_max_seconds) SECOND),
+        attempts = IF(rerun = 1 AND p_error IS NULL, 0, attempts),
+        rerun = 0,
+        last_error = p_error,
+        claim_token = NULL,
+        finished_at = NOW(3)
+    WHERE tenant_id = p_tenant_id AND task_key = p_task_key AND claim_token = p_claim_token;
+END $$
+
+DROP PROCEDURE IF EXISTS get_task_status $$
+CREATE PROCEDURE get_task_status(
+    IN p_tenant_id INT,
+    IN p_task_key VARCHAR(128)
+)
+BEGIN
+    SELECT status, rerun, attempts, last_error, enqueued_at, run_after, started_at, finished_at
+    FROM task_queue
+    WHERE tenant_id = p_tenant_id AND task_key = p_task_key;
+END $$
+
+DROP PROCEDURE IF EXISTS get_task_queue_stats $$
+CREATE PROCEDURE get_task_queue_stats()
+BEGIN
+    -- lag_seconds: how long the oldest due task has been waiting for a worker
+    SELECT
+        COALESCE(SUM(status = 'queued'), 0) AS depth,
+        COALESCE(SUM(status = 'queued' AND attempts > 0), 0) AS retrying,
+        COALESCE(SUM(status = 'running'), 0) AS running,
+        COALESCE(SUM(status = 'dead'), 0) AS dead,
+        COALESCE(TIMESTAMPDIFF(MICROSECOND, MIN(IF(status = 'queued' AND run_after <= NOW(3), run_after, NULL)), NOW(3)) / 1000000, 0)
+            AS lag_seconds
+    FROM task_queue
+    WHERE status IN ('queued', 'running', 'dead');
+END $$
+
+DROP PROCEDURE IF EXISTS purge_finished_tasks $$
+CREATE PROCEDURE purge_finished_tasks(IN p_max_age_seconds INT)
+BEGIN
+    -- Dead tasks are kept for inspection until they are enqueued again
+    DELETE FROM task_queue
+    WHERE status = 'done' AND finished_at < NOW(3) - INTERVAL p_max_age_seconds SECOND;
+
+    SELECT ROW_COUNT() AS purged;
+END $$
+
+DELIMITER ;
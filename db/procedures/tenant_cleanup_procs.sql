@@ -1,18 +1,39 @@
 DELIMITER $$
 
 DROP PROCEDURE IF EXISTS delete_tenant_data $$
-CREATE PROCEDURE delete_tenant_data(IN p_tenant_ids VARCHAR(4000))
+CREATE PROCEDURE delete_tenant_data(IN p_tenant_ids TEXT)
 BEGIN
-    DELETE FROM manifest_items   WHERE FIND_IN_SET(tenant_id, p_tenant_ids);
-    DELETE FROM scenarios        WHERE FIND_IN_SET(tenant_id, p_tenant_ids);
-    DELETE FROM routes           WHERE FIND_IN_SET(tenant_id, p_tenant_ids);
-    DELETE FROM supply           WHERE FIND_IN_SET(tenant_id, p_tenant_ids);
-    DELETE FROM demand           WHERE FIND_IN_SET(tenant_id, p_tenant_ids);
-    DELETE FROM entities         WHERE FIND_IN_SET(tenant_id, p_tenant_ids);
-    DELETE FROM drivers          WHERE FIND_IN_SET(tenant_id, p_tenant_ids);
-    DELETE FROM vehicles         WHERE FIND_IN_SET(tenant_id, p_tenant_ids);
-    DELETE FROM products_master  WHERE FIND_IN_SET(tenant_id, p_tenant_ids);
-    DELETE FROM locations        WHERE FIND_IN_SET(tenant_id, p_tenant_ids);
+    -- Ids go into an indexed temp table so every DELETE joins on the
+    -- tenant_id primary-key prefix instead of scanning with FIND_IN_SET.
+    -- Callers pass bounded chunks and commit between them.
+    IF p_tenant_ids NOT REGEXP '^[0-9]+(,[0-9]+)*$' THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Invalid tenant id list';
+    END IF;
+
+    DROP TEMPORARY TABLE IF EXISTS _cleanup_tenants;
+    CREATE TEMPORARY TABLE _cleanup_tenants (tenant_id INT PRIMARY KEY);
+
+    SET @sql = CONCAT('INSERT IGNORE INTO _cleanup_tenants (tenant_id) VALUES (',
+                      REPLACE(p_tenant_ids, ',', '),('), ')');
+    PREPARE stmt FROM @sql;
+    EXECUTE stmt;
+    DEALLOCATE PREPARE stmt;
+
+    DELETE t FROM task_queue t       JOIN _cleanup_tenants c ON c.tenant_id = t.tenant_id;
+    DELETE t FROM resource_versions t JOIN _cleanup_tenants c ON c.tenant_id = t.tenant_id;
+    DELETE t FROM route_geometries t JOIN _cleanup_tenants c ON c.tenant_id = t.tenant_id;
+    DELETE t FROM manifest_items t   JOIN _cleanup_tenants c ON c.tenant_id = t.tenant_id;
+    DELETE t FROM scenarios t        JOIN _cleanup_tenants c ON c.tenant_id = t.tenant_id;
+    DELETE t FROM routes t           JOIN _cleanup_tenants c ON c.tenant_id = t.tenant_id;
+    DELETE t FROM supply t           JOIN _cleanup_tenants c ON c.tenant_id = t.tenant_id;
+    DELETE t FROM demand t           JOIN _cleanup_tenants c ON c.tenant_id = t.tenant_id;
+    DELETE t FROM entities t         JOIN _cleanup_tenants c ON c.tenant_id = t.tenant_id;
+    DELETE t FROM drivers t          JOIN _cleanup_tenants c ON c.tenant_id = t.tenant_id;
+    DELETE t FROM vehicles t         JOIN _cleanup_tenants c ON c.tenant_id = t.tenant_id;
+    DELETE t FROM products_master t  JOIN _cleanup_tenants c ON c.tenant_id = t.tenant_id;
+    DELETE t FROM locations t        JOIN _cleanup_tenants c ON c.tenant_id = t.tenant_id;
+
+    DROP TEMPORARY TABLE _cleanup_tenants;
 END $$
 
 DELIMITER ;
\ No newline at end of file
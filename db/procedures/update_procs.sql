@@ -17,6 +17,14 @@ CREATE PROCEDURE update_location(
     IN p_avg_unload_minutes INT
 )
 BEGIN
+    -- Cached route distances are stale once the address moves
+    UPDATE routes r
+    JOIN locations l ON l.location_id = p_location_id AND l.tenant_id = r.tenant_id
+    SET r.trip_miles = NULL, r.trip_minutes = NULL
+    WHERE r.tenant_id = p_tenant_id
+      AND (r.origin_location_id = p_location_id OR r.dest_location_id = p_location_id)
+      AND NOT (l.address_street <=> p_address_street AND l.city <=> p_city AND l.state <=> p_state);
+
     UPDATE locations
     SET
         name = p_name,
@@ -168,6 +176,11 @@ CREATE PROCEDURE update_route(
 BEGIN
     UPDATE routes
     SET
+        -- Assigned first so the comparison sees the old endpoints
+        trip_miles = IF(origin_location_id = p_origin_location_id AND dest_location_id = p_dest_location_id,
+                        trip_miles, NULL),
+        trip_minutes = IF(origin_location_id = p_origin_location_id AND dest_location_id = p_dest_location_id,
+                          trip_minutes, NULL),
         name = p_name,
         origin_location_id = p_origin_location_id,
         dest_location_id = p_dest_location_id
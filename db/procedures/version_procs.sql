@@ -0,0 +1,28 @@
+DELIMITER $$
+
+DROP PROCEDURE IF EXISTS bump_resource_version $$
+CREATE PROCEDURE bump_resource_version(
+    IN p_tenant_id INT,
+    IN p_resource VARCHAR(64)
+)
+BEGIN
+    INSERT INTO resource_versions (tenant_id, resource, version, updated_at)
+    VALUES (p_tenant_id, p_resource, 1, NOW(3))
+    ON DUPLICATE KEY UPDATE
+        version = version + 1,
+        updated_at = NOW(3);
+END $$
+
+DROP PROCEDURE IF EXISTS get_resource_versions $$
+CREATE PROCEDURE get_resource_versions(
+    IN p_tenant_id INT,
+    IN p_resources TEXT
+)
+BEGIN
+    -- p_resources is a comma-separated list; missing resources are version 0
+    SELECT resource, version, updated_at
+    FROM resource_versions
+    WHERE tenant_id = p_tenant_id AND FIND_IN_SET(resource, p_resources);
+END $$
+
+DELIMITER ;
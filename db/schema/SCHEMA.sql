@@ -19,7 +19,8 @@ CREATE TABLE locations (
     avg_unload_minutes INT DEFAULT 30,
     
     PRIMARY KEY (tenant_id, location_id),
-    KEY (location_id) -- Required for AUTO_INCREMENT
+    KEY (location_id), -- Required for AUTO_INCREMENT
+    KEY idx_locations_name (tenant_id, name) -- Name lookups during imports
 );
 
 -- 2. Products Master
@@ -59,6 +60,12 @@ CREATE TABLE vehicles (
     max_volume_cubic_ft DECIMAL(10, 2) NOT NULL,
     storage_type ENUM('Dry', 'Ref', 'Frz', 'Multi') NOT NULL,
 
+    -- Per-mile cost rates, recomputed on every insert/update (useful life: 8 years,
+    -- see depreciation_insurance.USEFUL_LIFE_YEARS). Trip cost = rate * trip miles.
+    depreciation_per_mile DECIMAL(14, 6) AS (CASE WHEN vehicle_estimated_yearly_milage > 0 THEN GREATEST(vehicle_purchase_price - vehicle_estimated_salvage_value, 0) / (vehicle_estimated_yearly_milage * 8) ELSE 0 END) STORED,
+    insurance_per_mile DECIMAL(14, 6) AS (CASE WHEN vehicle_estimated_yearly_milage > 0 THEN annual_insurance_cost / vehicle_estimated_yearly_milage ELSE 0 END) STORED,
+    maintenance_per_mile DECIMAL(14, 6) AS (CASE WHEN vehicle_estimated_yearly_milage > 0 THEN annual_maintenance_cost / vehicle_estimated_yearly_milage ELSE 0 END) STORED,
+
     PRIMARY KEY (tenant_id, vehicle_id),
     KEY (vehicle_id)
 );
@@ -89,6 +96,10 @@ CREATE TABLE supply (
 
     PRIMARY KEY (tenant_id, supply_id),
     KEY (supply_id),
+    -- Lookup indexes for planner queries (what is available where)
+    KEY idx_supply_product_location (tenant_id, product_code, location_id),
+    KEY idx_supply_location_product (tenant_id, location_id, product_code),
+    KEY idx_supply_entity_product (tenant_id, entity_id, product_code),
     FOREIGN KEY (tenant_id, entity_id) REFERENCES entities(tenant_id, entity_id),
     FOREIGN KEY (tenant_id, location_id) REFERENCES locations(tenant_id, location_id),
     FOREIGN KEY (tenant_id, product_code) REFERENCES products_master(tenant_id, product_code) ON DELETE CASCADE
@@ -105,6 +116,8 @@ CREATE TABLE demand (
 
     PRIMARY KEY (tenant_id, demand_id),
     KEY (demand_id),
+    KEY idx_demand_product_location (tenant_id, product_code, location_id),
+    KEY idx_demand_location_product (tenant_id, location_id, product_code),
     FOREIGN KEY (tenant_id, location_id) REFERENCES locations(tenant_id, location_id),
     FOREIGN KEY (tenant_id, product_code) REFERENCES products_master(tenant_id, product_code) ON DELETE CASCADE
 );
@@ -116,9 +129,12 @@ CREATE TABLE routes (
     name VARCHAR(100),
     origin_location_id INT NOT NULL,
     dest_location_id INT NOT NULL,
+    trip_miles DECIMAL(10, 2) DEFAULT NULL, -- Cached round-trip distance; NULL until looked up
+    trip_minutes DECIMAL(10, 2) DEFAULT NULL, -- Cached round-trip drive time, looked up with trip_miles
 
     PRIMARY KEY (tenant_id, route_id),
     KEY (route_id),
+    KEY idx_routes_name (tenant_id, name),
     FOREIGN KEY (tenant_id, origin_location_id) REFERENCES locations(tenant_id, location_id),
     FOREIGN KEY (tenant_id, dest_location_id) REFERENCES locations(tenant_id, location_id)
 );
@@ -179,7 +195,64 @@ CREATE TABLE manifest_items (
     FOREIGN KEY (demand_id) REFERENCES demand(demand_id) ON DELETE SET NULL
 );
 
--- 11. Triggers for Inventory Management
+-- 11. Background Job Runs (one row per scheduled job, not tenant data)
+CREATE TABLE job_runs (
+    job_name VARCHAR(64) NOT NULL,
+    last_started_at DATETIME NOT NULL,
+    last_duration_ms INT NOT NULL DEFAULT 0,
+    last_rows_affected INT DEFAULT NULL,
+    last_status ENUM('ok', 'error') NOT NULL,
+    last_error VARCHAR(255) DEFAULT NULL,
+    last_node VARCHAR(255) DEFAULT NULL,
+    run_count INT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (job_name)
+);
+
+-- 12. Background Task Queue (one row per tenant + task key, so re-enqueues dedupe)
+CREATE TABLE task_queue (
+    tenant_id INT NOT NULL,
+    task_key VARCHAR(128) NOT NULL,
+    kind VARCHAR(64) NOT NULL,
+    payload TEXT,
+    status ENUM('queued', 'running', 'done', 'dead') NOT NULL DEFAULT 'queued', -- dead: out of attempts
+    rerun TINYINT(1) NOT NULL DEFAULT 0, -- Enqueued again while running
+    attempts INT NOT NULL DEFAULT 0, -- Claims since the task last succeeded or was re-enqueued
+    last_error VARCHAR(255) DEFAULT NULL,
+    claim_token CHAR(36) DEFAULT NULL,
+    node VARCHAR(255) DEFAULT NULL,
+    enqueued_at DATETIME(3) NOT NULL,
+    run_after DATETIME(3) NOT NULL, -- Not claimed before this; pushed back after each failure
+    started_at DATETIME(3) DEFAULT NULL,
+    finished_at DATETIME(3) DEFAULT NULL,
+
+    PRIMARY KEY (tenant_id, task_key),
+    KEY idx_task_queue_claim (status, run_after)
+);
+
+-- 13. Resource Versions (bumped on writes; drive ETag/Last-Modified on GETs)
+CREATE TABLE resource_versions (
+    tenant_id INT NOT NULL,
+    resource VARCHAR(64) NOT NULL, -- e.g. 'routes', 'route:12', 'assets'
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME(3) NOT NULL,
+
+    PRIMARY KEY (tenant_id, resource)
+);
+
+-- 14. Route Geometry Cache (one driving route per origin/dest pair, drawn by the map view)
+CREATE TABLE route_geometries (
+    tenant_id INT NOT NULL,
+    pair_key CHAR(64) NOT NULL, -- sha256 of the origin and destination coordinates or addresses
+    geojson MEDIUMTEXT NOT NULL,
+    distance_miles DECIMAL(10, 2),
+    duration_minutes DECIMAL(10, 2),
+    created_at DATETIME NOT NULL,
+
+    PRIMARY KEY (tenant_id, pair_key)
+);
+
+-- 15. Triggers for Inventory Management
 DELIMITER $$
 
 CREATE TRIGGER trg_manifest_insert AFTER INSERT ON manifest_items
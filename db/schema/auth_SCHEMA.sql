@@ -22,6 +22,25 @@ CREATE TABLE users (
   totp_confirmed BOOLEAN NOT NULL DEFAULT FALSE,
   last_active    DATETIME DEFAULT CURRENT_TIMESTAMP,
 
-
+  KEY idx_users_role_active (role, last_active), -- Anonymous pool claims and expiry cleanup
   CONSTRAINT fk_users_tenant FOREIGN KEY (tenant_id) REFERENCES tenants(tenant_id) ON DELETE CASCADE
-);
\ No newline at end of file
+);
+
+-- Shared sliding-window rate limit counters (one row per key per fixed window)
+CREATE TABLE rate_limits (
+  bucket        VARCHAR(32) NOT NULL,
+  rate_key      VARCHAR(255) NOT NULL,
+  window_start  BIGINT NOT NULL,
+  hits          INT NOT NULL DEFAULT 0,
+
+  PRIMARY KEY (bucket, rate_key, window_start),
+  KEY idx_rate_limits_window (bucket, window_start) -- Pruning expired windows
+);
+
+
+-- Tenants deleted from auth_db whose local_food_db data is still to be removed.
+-- Rows are deleted once their data is gone, so an interrupted cleanup resumes here.
+CREATE TABLE tenant_cleanup_queue (
+  tenant_id  BIGINT PRIMARY KEY,
+  queued_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -1,3 +1,6 @@
+import hashlib
+import json
+import time
 from typing import Optional
 from db.functions.tenant_functions import (
     scoped_read as read, 
@@ -6,13 +9,39 @@ from db.functions.tenant_functions import (
     scoped_delete as delete
 )
 import logic
+import columnar_export
 from db.functions import scenario_management
+from db.functions.connect import get_db
+from db.functions import task_queue, resource_versions
 
 # =============================================================================
 # HELPERS
 # =============================================================================
 
 
+def _enrich_manifest_item(i, p=None):
+    """
+    Maps one raw DB manifest item to the frontend structure with its metrics.
+    """
+    metrics = logic.calculate_manifest_item_metrics(i, p)
+
+    return {
+        "manifest_item_id": i.get('manifest_item_id'),
+        "product_id": i.get('product_id'), 
+        "product_name": i.get('product_name'),
+        "quantity": metrics['quantity'],
+        "unit_price": metrics['unit_price'],
+        "items_per_unit": metrics['items_per_unit'],
+        "cost_per_item": i.get('cost_per_item'),
+        "unit_weight": i.get('unit_weight_lbs'),
+        "unit_volume": i.get('unit_volume'),
+        # Enriched metrics
+        "line_total": metrics['line_total'],
+        "line_cogs": metrics['line_cogs'],
+        "line_weight": metrics['line_weight'],
+        "line_volume": metrics['line_volume']
+    }
+
 def _enrich_manifest_items(items):
     """
     Maps raw DB manifest items to frontend structure and calculates metrics.
@@ -25,24 +54,7 @@ def _enrich_manifest_items(items):
         if i.get('price_per_item') is None and i.get('unit_price') is None:
              p = get_product(i['product_id'])
 
-        metrics = logic.calculate_manifest_item_metrics(i, p)
-
-        out.append({
-            "manifest_item_id": i.get('manifest_item_id'),
-            "product_id": i.get('product_id'), 
-            "product_name": i.get('product_name'),
-            "quantity": metrics['quantity'],
-            "unit_price": metrics['unit_price'],
-            "items_per_unit": metrics['items_per_unit'],
-            "cost_per_item": i.get('cost_per_item'),
-            "unit_weight": i.get('unit_weight_lbs'),
-            "unit_volume": i.get('unit_volume'),
-            # Enriched metrics
-            "line_total": metrics['line_total'],
-            "line_cogs": metrics['line_cogs'],
-            "line_weight": metrics['line_weight'],
-            "line_volume": metrics['line_volume']
-        })
+        out.append(_enrich_manifest_item(i, p))
     
     out.sort(key=lambda x: x["product_name"].lower())
     return out
@@ -90,6 +102,51 @@ def _calculate_vehicle_costs(vehicle_id, header):
     return logic.calculate_operating_costs(v, miles)
 
 
+def _cache_trip_length(route, conn=None):
+    """
+    Looks up (Mapbox) the round trip of a route row or header that has none
+    cached, stores it on the route and copies it into the dict, so the cost
+    pipeline reads it from there. Failed lookups are not cached.
+    """
+    miles, minutes = logic.get_trip_length(route)
+    route['trip_miles'], route['trip_minutes'] = miles, minutes
+    if miles:
+        scenario_management.set_route_trip_miles(route['route_id'], miles, trip_minutes=minutes, conn=conn)
+
+
+def _cache_missing_trip_miles(conn, routes=None, **filters):
+    """
+    Looks up (Mapbox) and caches the round-trip miles of every route used by
+    the matching scenarios that has none yet. Runs once per route, not per
+    scenario; failed lookups are not cached, so a later refresh retries them.
+
+    :param routes: get_routes_missing_trip_miles() rows if already fetched
+    """
+    if routes is None:
+        routes = scenario_management.get_routes_missing_trip_miles(conn=conn, **filters)
+    for route in routes:
+        _cache_trip_length(route, conn=conn)
+
+
+def _refresh_snapshots_bulk(*, vehicle_id=None, driver_id=None, location_id=None):
+    """
+    Re-snapshots every scenario using the vehicle, driver or location in one
+    set-based call. Vehicle and location changes need each route's round-trip
+    miles; driver changes only touch wages.
+    """
+    conn = get_db()
+    try:
+        if vehicle_id is not None or location_id is not None:
+            _cache_missing_trip_miles(conn, vehicle_id=vehicle_id, location_id=location_id)
+
+        return scenario_management.refresh_scenarios_bulk(
+            vehicle_id=vehicle_id, driver_id=driver_id, location_id=location_id, conn=conn
+        )
+    finally:
+        if conn:
+            conn.close()
+
+
 CSV_EXPORT_COLUMNS = [
     "scenario_id", "run_date", "route_name", 
     "origin_name", "dest_name", "total_distance_miles",
@@ -105,6 +162,19 @@ CSV_EXPORT_COLUMNS = [
     "drive_minutes_est", "load_minutes_plan", "unload_minutes_plan"
 ]
 
+MANIFEST_EXPORT_COLUMNS = [
+    "product_name", "quantity", "items_per_unit",
+    "unit_price", "line_total",
+    "cost_per_item", "line_cogs",
+    "unit_weight", "line_weight",
+    "unit_volume", "line_volume"
+]
+
+MANIFEST_LINE_EXPORT_COLUMNS = ["scenario_id", "run_date", "route_name", "product_id"] + MANIFEST_EXPORT_COLUMNS
+
+# Scenarios costed per connection while streaming an export
+EXPORT_CHUNK_SIZE = 50
+
 # =============================================================================
 # CREATE
 # =============================================================================
@@ -231,19 +301,56 @@ def get_vehicle(vehicle_id: int):
     return None
 
 
+def _iter_route_internals(chunk_size=None):
+    """
+    Yields (manifest, costs) for every scenario, computed `chunk_size`
+    scenarios per database connection. Only the scenario ids are held in
+    memory, so callers can stream the results however many scenarios a
+    tenant has.
+    """
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    ids = [s['scenario_id'] for s in read.view_scenarios_scoped(columns=["scenario_id"])]
+
+    for start in range(0, len(ids), chunk_size):
+        conn = get_db()
+        try:
+            for scenario_id in ids[start:start + chunk_size]:
+                result_sets = scenario_management.get_complete_route_details(scenario_id, conn=conn)
+                if result_sets and result_sets[0]:
+                    header = result_sets[0][0]
+                    items = result_sets[1]
+                    manifest, costs, _ = _calculate_route_internals(header, items)
+                    yield manifest, costs
+        finally:
+            if conn:
+                conn.close()
+
+
+def iter_all_routes_raw(chunk_size=None):
+    """
+    Yields the cost dict of every scenario.
+    """
+    for _, costs in _iter_route_internals(chunk_size):
+        yield costs
+
+
+def iter_all_manifest_lines(chunk_size=None):
+    """
+    Yields every enriched manifest line of every scenario, tagged with its
+    scenario_id, run_date and route_name.
+    """
+    for manifest, costs in _iter_route_internals(chunk_size):
+        for line in manifest:
+            yield {
+                "scenario_id": costs["scenario_id"],
+                "run_date": costs["run_date"],
+                "route_name": costs["route_name"],
+                **line,
+            }
+
+
 def get_all_routes_raw():
-    # Use optimized fetch for all scenarios
-    scenarios = read.view_scenarios_scoped()
-    out = []
-    for s in scenarios:
-        # Reuse the optimized complete fetch
-        result_sets = scenario_management.get_complete_route_details(s['scenario_id'])
-        if result_sets and result_sets[0]:
-            header = result_sets[0][0]
-            items = result_sets[1]
-            _, costs, _ = _calculate_route_internals(header, items)
-            out.append(costs)
-    return out
+    return list(iter_all_routes_raw())
 
 
 def get_route_raw(route_id):
@@ -307,6 +414,7 @@ def update_location(
             avg_load_minutes=logic.safe_int(avg_load_minutes, 30),
             avg_unload_minutes=logic.safe_int(avg_unload_minutes, 30)
         )
+        _refresh_snapshots_later("location", location_id)
         return True, None
     except Exception as e:
         return False, str(e)
@@ -320,6 +428,7 @@ def update_driver(driver_id: int, name: str, hourly_drive_wage: str, hourly_load
             hourly_drive_wage=logic.safe_float(hourly_drive_wage),
             hourly_load_wage=logic.safe_float(hourly_load_wage)
         )
+        _refresh_snapshots_later("driver", driver_id)
         return True, None
     except Exception as e:
         return False, str(e)
@@ -356,16 +465,7 @@ def update_vehicle(
             storage_type=storage_type
         )
 
-        scenarios = read.view_scenarios_scoped()
-        for s in scenarios:
-            if s.get('vehicle_id') == vehicle_id:
-                sid = s.get('scenario_id')
-                result_sets = scenario_management.get_complete_route_details(sid)
-                if result_sets and result_sets[0]:
-                    header = result_sets[0][0]
-                    dep, ins, maint = _calculate_vehicle_costs(vehicle_id, header)
-                    scenario_management.refresh_scenario(sid, dep or 0.0, ins or 0.0, maint or 0.0)
-
+        _refresh_snapshots_later("vehicle", vehicle_id)
         return True, None
     except Exception as e:
         return False, str(e)
@@ -542,10 +642,95 @@ def get_route(route_id: int):
     return route_view
 
 
+def _map_point(endpoints, prefix):
+    """
+    [lng, lat] from the location's stored coordinates, falling back to its
+    address string when they are missing (forms store 0, 0).
+    """
+    lat = logic.safe_float(endpoints.get(f"{prefix}_latitude"))
+    lng = logic.safe_float(endpoints.get(f"{prefix}_longitude"))
+    if lat or lng:
+        return [lng, lat]
+    return f"{endpoints.get(f'{prefix}_address_street')} {endpoints.get(f'{prefix}_city')} {endpoints.get(f'{prefix}_state')}"
+
+
+def get_route_map_info(route_id: int):
+    """
+    Names, addresses and map points of a route's origin and destination,
+    without the manifest or cost pipeline. None if the route does not exist.
+    """
+    endpoints = scenario_management.get_route_map_endpoints(route_id)
+    if not endpoints:
+        return None
+
+    origin = _map_point(endpoints, "origin")
+    dest = _map_point(endpoints, "dest")
+    return {
+        "route_id": route_id,
+        "origin_name": endpoints.get("origin_name"),
+        "dest_name": endpoints.get("dest_name"),
+        "origin_address": f"{endpoints.get('origin_address_street')} {endpoints.get('origin_city')} {endpoints.get('origin_state')}",
+        "dest_address": f"{endpoints.get('dest_address_street')} {endpoints.get('dest_city')} {endpoints.get('dest_state')}",
+        "origin": origin,
+        "dest": dest,
+        # Same endpoints -> same key, whichever routes or scenarios use them
+        "pair_key": hashlib.sha256(json.dumps([origin, dest]).encode()).hexdigest(),
+    }
+
+
+def get_route_geometry(route_id: int):
+    """
+    GeoJSON FeatureCollection of the route line plus origin/destination
+    points. The Directions lookup runs once per origin/dest pair; later
+    requests are served from route_geometries.
+
+    Returns None if the route does not exist, or a collection with no
+    features if Mapbox could not route it.
+    """
+    info = get_route_map_info(route_id)
+    if info is None:
+        return None
+
+    cached = scenario_management.get_route_geometry(info["pair_key"])
+    if cached:
+        return json.loads(cached["geojson"])
+
+    fetched = logic.fetch_mapbox_route_geometry(info["origin"], info["dest"])
+    if fetched is None:
+        # Not cached, so a later view retries the lookup
+        return {"type": "FeatureCollection", "features": [], "properties": {}}
+
+    summary = {
+        "distance_miles": fetched["distance_miles"],
+        "duration_minutes": fetched["duration_minutes"],
+    }
+    collection = {
+        "type": "FeatureCollection",
+        "properties": summary,
+        "features": [
+            {"type": "Feature", "properties": {"kind": "route", **summary}, "geometry": fetched["geometry"]},
+            {"type": "Feature", "properties": {"kind": "origin"},
+             "geometry": {"type": "Point", "coordinates": fetched["origin"]}},
+            {"type": "Feature", "properties": {"kind": "dest"},
+             "geometry": {"type": "Point", "coordinates": fetched["dest"]}},
+        ],
+    }
+    try:
+        scenario_management.save_route_geometry(
+            info["pair_key"], json.dumps(collection, separators=(",", ":")),
+            fetched["distance_miles"], fetched["duration_minutes"]
+        )
+    except Exception as e:
+        print(f"Route geometry cache write failed: {type(e).__name__}")
+    return collection
+
+
 def get_dashboard_data():
     """
     Aggregates all data needed for the main routes dashboard.
-    Enriches routes with calculated costs, manifest items, and resolved names.
+    Enriches routes with calculated costs, manifest totals, and resolved names.
+    Manifest totals come from one summary query; full manifests are loaded
+    per route on demand (get_route_manifest).
 
     Returns:
         dict: A dictionary containing:
@@ -564,41 +749,48 @@ def get_dashboard_data():
     locations_map = {l["location_id"]: l["name"] for l in locations}
     vehicles_map = {v["vehicle_id"]: v for v in vehicles}
 
+    headers, previews = scenario_management.get_route_summaries()
+    headers_map = {h["scenario_id"]: h for h in headers}
+    previews_map = {}
+    for p in previews:
+        previews_map.setdefault(p["scenario_id"], []).append({
+            "product_name": p.get("product_name"),
+            "quantity": logic.safe_float(p.get("quantity")),
+        })
+
     for r in routes:
         # Resolve Location Names
         r["origin_name"] = locations_map.get(r["origin_location_id"], f"#{r['origin_location_id']}")
         r["dest_name"] = locations_map.get(r["dest_location_id"], f"#{r['dest_location_id']}")
 
-        # Fetch full route details (costs, manifest)
-        # This calls get_route -> get_complete_route_details -> calculate_trip_costs
-        full_route = get_route(r["route_id"])
-        
-        r["total_cost"] = full_route.get("calc_total_cost", 0.0) if full_route else 0.0
-        r["manifest_items"] = []
-        r["fuel_cost"] = 0.0
-        r["depreciation_cost"] = 0.0
+        r["total_cost"] = 0.0
         r["manifest_count"] = 0
+        r["manifest_preview"] = previews_map.get(r["route_id"], [])
         r["item_revenue"] = 0.0
-
-        if full_route:
-            r["fuel_cost"] = full_route.get("fuel_cost", 0.0)
-            r["depreciation_cost"] = full_route.get("depreciation_cost", 0.0)
-            r["manifest_count"] = full_route.get("line_item_count", 0)
-            
-            manifest_subtotal = full_route.get("calculated_revenue", 0.0)
+        r["net_trip_profit"] = 0.0
+
+        header = headers_map.get(r["route_id"])
+        if header:
+            # Same cost path as get_route, fed SQL totals instead of lines
+            costs = logic.calculate_trip_costs(header, [], {
+                "line_item_count": header.get("line_item_count"),
+                "calculated_revenue": logic.safe_float(header.get("calculated_revenue")),
+                "total_cogs": logic.safe_float(header.get("total_cogs")),
+                "total_weight_lbs": logic.safe_float(header.get("total_weight_lbs")),
+                "total_volume": logic.safe_float(header.get("total_volume")),
+            })
+
+            r["total_cost"] = costs["total_cost"]
+            r["manifest_count"] = costs["line_item_count"]
+
+            manifest_subtotal = costs["calculated_revenue"]
             r["item_revenue"] = manifest_subtotal
-            
+
             # Add item revenue to base sales amount
             base_sales = r.get("sales_amount") or 0.0
             r["sales_amount"] = base_sales + manifest_subtotal
-            
-            r["manifest_items"] = full_route.get("manifest", [])
 
-            pricing = full_route.get("pricing", {})
-            trip = pricing.get("trip", {})
-            r["net_trip_profit"] = trip.get("net_trip_profit", 0.0)
-        else:
-            r["net_trip_profit"] = 0.0
+            r["net_trip_profit"] = costs["profit_est_calculated"]
 
         # Resolve Vehicle Name
         vid = r.get("vehicle_id")
@@ -759,7 +951,113 @@ def recalculate_route_costs(route_id: int):
         return True, None
     except Exception as e:
         return False, str(e)
-    
+
+
+def recalculate_all_routes(vehicle_id=None, driver_id=None, date_from=None, date_to=None, gas_price=None):
+    """
+    Recalculates the snapshots of every route matching the optional filters
+    in one set-based update, optionally applying a new gas price.
+
+    Routes without cached trip miles need one Mapbox lookup each. With a task
+    dispatcher running, those lookups and a second refresh of the affected
+    scenarios run in the background and the response counts them as
+    trip_miles_pending; otherwise they run inline first.
+
+    Returns (True, stats) with the scenario count, elapsed seconds,
+    scenarios per second and trip_miles_pending, or (False, error).
+    """
+    filters = {"vehicle_id": vehicle_id, "driver_id": driver_id, "date_from": date_from, "date_to": date_to}
+    start = time.perf_counter()
+    pending = 0
+    conn = get_db()
+    try:
+        missing = scenario_management.get_routes_missing_trip_miles(conn=conn, **filters)
+        if missing and task_queue.is_running():
+            pending = len(missing)
+            key = ":".join(str(v or "") for v in filters.values())
+            task_queue.enqueue("recalculate_all", key, {
+                **{k: str(v) if v is not None else None for k, v in filters.items()},
+                "gas_price": gas_price,
+            })
+        else:
+            _cache_missing_trip_miles(conn, routes=missing)
+        count = scenario_management.recalculate_scenarios(gas_price=gas_price, conn=conn, **filters)
+    except Exception as e:
+        return False, str(e)
+    finally:
+        if conn:
+            conn.close()
+
+    elapsed = time.perf_counter() - start
+    return True, {
+        "scenarios": count,
+        "seconds": round(elapsed, 3),
+        "scenarios_per_second": round(count / elapsed, 1) if elapsed > 0 else None,
+        "trip_miles_pending": pending,
+    }
+
+
+def _recalculate_all_task(gas_price=None, **filters):
+    _cache_missing_trip_miles(None, **filters)
+    scenario_management.recalculate_scenarios(gas_price=gas_price, **filters)
+    resource_versions.bump("routes", "routes:bulk")
+
+
+def _recalculate_route_task(route_id):
+    ok, err = recalculate_route_costs(route_id)
+    if not ok:
+        raise RuntimeError(err)
+    resource_versions.bump("routes", f"route:{route_id}")
+
+
+def _refresh_snapshots_task(**keys):
+    _refresh_snapshots_bulk(**keys)
+    resource_versions.bump("routes", "routes:bulk")
+
+
+def _refresh_snapshots_later(kind, key_id):
+    """
+    Queues the snapshot refresh for one vehicle, driver or location (kind),
+    or runs it inline when this process has no task dispatcher.
+    """
+    keys = {f"{kind}_id": key_id}
+    if not task_queue.is_running():
+        _refresh_snapshots_task(**keys)
+        return
+    task_queue.enqueue("refresh_snapshots", f"{kind}:{key_id}", keys)
+
+
+def queue_route_recalc(route_id: int):
+    """
+    Queues recalculate_route_costs for a route and returns right away.
+    Repeated requests for the same route collapse into one task. Without a
+    task dispatcher in this process the recalculation runs inline.
+
+    Returns (True, queued) or (False, error message).
+    """
+    if not task_queue.is_running():
+        ok, err = recalculate_route_costs(route_id)
+        return (True, False) if ok else (False, err)
+    try:
+        task_queue.enqueue("recalculate_route", route_id, {"route_id": route_id})
+        return True, True
+    except Exception as e:
+        return False, str(e)
+
+
+def get_route_recalc_status(route_id: int):
+    """
+    Returns the queued recalculation's status ('queued', also while waiting
+    to retry, 'running', 'done' or 'dead') and last error, or None if none
+    was ever queued.
+    """
+    return task_queue.get_status("recalculate_route", route_id)
+
+
+task_queue.register_handler("refresh_snapshots", _refresh_snapshots_task)
+task_queue.register_handler("recalculate_route", _recalculate_route_task)
+task_queue.register_handler("recalculate_all", _recalculate_all_task)
+
 # =============================================================================
 # ROUTE/SCENARIO ASSET MANAGEMENT
 # =============================================================================
@@ -801,10 +1099,13 @@ def assign_driver_to_route(route_id: int, driver_id: Optional[int]):
 def get_route_manifest(route_id: int):
     """
     Fetches manifest items for a specific route using the optimized stored procedure.
+    Returns None if the route does not exist.
     """
     result_sets = scenario_management.get_complete_route_details(route_id)
 
-    if not result_sets or len(result_sets) < 2:
+    if not result_sets or not result_sets[0]:
+        return None
+    if len(result_sets) < 2:
         return []
 
     items = result_sets[1]
@@ -812,6 +1113,57 @@ def get_route_manifest(route_id: int):
     return _enrich_manifest_items(items)
 
 
+def get_route_lines(route_id: int):
+    """
+    Header and raw manifest lines of a route in one fetch, without the cost
+    pipeline. Doubles as the existence check for manifest edits.
+
+    Returns:
+        dict: {"header": dict, "items": List[dict]}, or None if the route does not exist.
+    """
+    result_sets = scenario_management.get_complete_route_details(route_id)
+    if not result_sets or not result_sets[0]:
+        return None
+    return {
+        "header": result_sets[0][0],
+        "items": list(result_sets[1]) if len(result_sets) > 1 else [],
+    }
+
+
+def _manifest_totals(route):
+    """
+    Route totals recomputed from the in-memory lines after an edit, so the
+    response needs no second fetch. The trip length comes from the route's
+    cached miles; Mapbox is only asked (and the result cached) when none are.
+    """
+    header = route["header"]
+    if header.get('trip_miles') is None or header.get('trip_minutes') is None:
+        try:
+            _cache_trip_length(header)
+        except Exception as e:
+            print(f"Trip length cache failed: {type(e).__name__}")
+
+    items = route["items"]
+    metrics = [logic.calculate_manifest_item_metrics(i) for i in items]
+    totals = {
+        "total_cogs": round(sum(m['line_cogs'] for m in metrics), 2),
+        "calculated_revenue": round(sum(m['line_total'] for m in metrics), 2),
+        "total_weight_lbs": round(sum(m['line_weight'] for m in metrics), 2),
+        "total_volume": round(sum(m['line_volume'] for m in metrics), 2)
+    }
+    costs = logic.calculate_trip_costs(route["header"], items, totals)
+
+    entered_revenue = logic.safe_float(route["header"].get('entered_revenue'))
+    return {
+        "manifest_subtotal": costs["calculated_revenue"],
+        "total_cost": costs["total_cost"],
+        "entered_revenue": entered_revenue,
+        "sales_amount": entered_revenue + costs["calculated_revenue"],
+        "manifest_count": costs["line_item_count"],
+        "net_trip_profit": costs["profit_est_calculated"],
+    }
+
+
 def add_product_to_route(
     route_id: int, 
     product_id, 
@@ -820,16 +1172,29 @@ def add_product_to_route(
     items_per_unit: Optional[float] = None,
     cost_per_item: Optional[float] = None,
     unit_weight: Optional[float] = None,
-    unit_volume: Optional[float] = None):
-    prod = get_product(product_id)
+    unit_volume: Optional[float] = None,
+    route: Optional[dict] = None,
+    product: Optional[dict] = None):
+    """
+    Adds a product to the route's manifest, or updates its line if the
+    product is already loaded.
+
+    :param route: get_route_lines() result if the caller already has it
+    :param product: get_product() result if the caller already has it
+
+    Returns (True, delta) with the changed line and the new route totals, or
+    (False, error message).
+    """
+    prod = product or get_product(product_id)
     if not prod:
         return False, "Product not found"
-    
-    # Optimization: Fetch raw items directly to avoid overhead of calculating costs
-    # just to check for existence.
-    result_sets = scenario_management.get_complete_route_details(route_id)
-    items = result_sets[1] if result_sets and len(result_sets) > 1 else []
 
+    if route is None:
+        route = get_route_lines(route_id)
+    if route is None:
+        return False, "Route not found"
+
+    items = route["items"]
     existing_item = next((i for i in items if str(i.get('product_id')) == str(product_id)), None)
 
     if existing_item:
@@ -845,12 +1210,13 @@ def add_product_to_route(
                 snapshot_unit_volume=unit_volume,
                 snapshot_price_per_item=price_per_item
             )
-            return True, None
         except Exception as e:
             return False, str(e)
+        manifest_item_id = existing_item['manifest_item_id']
+        items.remove(existing_item)
     else:
         try:
-            scenario_management.add_manifest_items(
+            manifest_item_id = scenario_management.add_manifest_items(
                 scenario_id=route_id,
                 item_name=prod['name'],
                 quantity_loaded=quantity,
@@ -860,62 +1226,91 @@ def add_product_to_route(
                 unit_weight_lbs=unit_weight,
                 unit_volume=unit_volume
             )
-            return True, None
         except Exception as e:
             return False, str(e)
 
+    # Read back the stored line: the delta and totals follow the DB values
+    # (column rounding, proc defaults), not the submitted form values
+    try:
+        line = scenario_management.get_manifest_line(manifest_item_id)
+    except Exception as e:
+        return False, str(e)
+    if line is None:
+        return False, "Manifest line not found"
+    items.append(line)
+
+    return True, {"line": _enrich_manifest_item(line, prod), **_manifest_totals(route)}
 
-def remove_product_from_route(route_id: int, product_id):
+
+def remove_product_from_route(route_id: int, product_id, route: Optional[dict] = None):
+    """
+    Removes a product's line from the route's manifest.
+
+    Returns (True, delta) with the removed product id and the new route
+    totals, or (False, error message).
+    """
     target_code = str(product_id)
 
-    result_sets = scenario_management.get_complete_route_details(route_id)
-    items = result_sets[1] if result_sets and len(result_sets) > 1 else []
+    if route is None:
+        route = get_route_lines(route_id)
+    if route is None:
+        return False, "Route not found"
 
-    item_to_delete = None
-    for item in items:
-        if str(item.get('product_id')) == target_code:
-            item_to_delete = item.get('manifest_item_id')
-            break
-    
-    if item_to_delete:
-        try:
-            scenario_management.remove_manifest_item(manifest_item_id=item_to_delete)
-            return True, None
-        except Exception as e:
-            return False, str(e)
-            
-    return False, "Item not found in manifest"
+    item_to_delete = next((i for i in route["items"] if str(i.get('product_id')) == target_code), None)
+    if not item_to_delete:
+        return False, "Item not found in manifest"
+
+    try:
+        scenario_management.remove_manifest_item(manifest_item_id=item_to_delete['manifest_item_id'])
+    except Exception as e:
+        return False, str(e)
+
+    route["items"].remove(item_to_delete)
+    return True, {"removed_product_id": target_code, **_manifest_totals(route)}
 
 # =============================================================================
 # CSV EXPORT
 # =============================================================================
 
 
-def export_routes_csv(details_list, output_handle):
-    csv_str = logic.generate_csv_export(details_list, columns=CSV_EXPORT_COLUMNS)
-    output_handle.write(csv_str)
+def iter_routes_csv(details_iter):
+    """
+    Yields the all-routes CSV line by line from an iterable of cost dicts.
+    """
+    return logic.iter_csv_export(details_iter, CSV_EXPORT_COLUMNS)
 
 
-def export_route_detailed_csv(details, output_handle):
-    # 1. Route Summary (Header)
-    costs = details.get('costs', {})
-    
-    summary_csv = logic.generate_csv_export([costs], columns=CSV_EXPORT_COLUMNS)
-    
-    output_handle.write("ROUTE_SUMMARY\n")
-    output_handle.write(summary_csv)
-    output_handle.write("\n")
-    
-    # 2. Manifest Items
-    enriched_items = details.get('manifest', [])
-        
-    items_cols = [
-        "product_name", "quantity", "items_per_unit", 
-        "unit_price", "line_total", 
-        "cost_per_item", "line_cogs",
-        "unit_weight", "line_weight", 
-        "unit_volume", "line_volume"
-    ]
-    items_csv = logic.generate_csv_export(enriched_items, columns=items_cols)
-    output_handle.write("MANIFEST_ITEMS\n")
-    output_handle.write(items_csv)
+def iter_manifest_lines_csv(lines_iter):
+    """
+    Yields the all-manifest-lines CSV line by line from an iterable of lines.
+    """
+    return logic.iter_csv_export(lines_iter, MANIFEST_LINE_EXPORT_COLUMNS)
+
+
+def iter_route_detailed_csv(details):
+    """
+    Yields a single route's CSV: a ROUTE_SUMMARY section with its costs,
+    then a MANIFEST_ITEMS section with one line per manifest item.
+    """
+    yield "ROUTE_SUMMARY\n"
+    yield from logic.iter_csv_export([details.get('costs', {})], CSV_EXPORT_COLUMNS)
+    yield "\n"
+    yield "MANIFEST_ITEMS\n"
+    yield from logic.iter_csv_export(details.get('manifest', []), MANIFEST_EXPORT_COLUMNS)
+
+
+# =============================================================================
+# PARQUET EXPORT
+# =============================================================================
+
+
+def export_routes_parquet():
+    return columnar_export.to_parquet_bytes(
+        iter_all_routes_raw(), CSV_EXPORT_COLUMNS, columnar_export.ROUTE_COST_TYPES
+    )
+
+
+def export_manifest_lines_parquet():
+    return columnar_export.to_parquet_bytes(
+        iter_all_manifest_lines(), MANIFEST_LINE_EXPORT_COLUMNS, columnar_export.MANIFEST_LINE_TYPES
+    )
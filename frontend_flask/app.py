@@ -17,6 +17,8 @@ from products_bp import products_bp
 from assets_bp import assets_bp
 from auth_bp import auth_bp
 from auth.middleware import install_auth_middleware
+from conditional import install_version_bumps
+from db.functions import task_queue
 
 
 
@@ -26,6 +28,9 @@ from products_import_bp import products_import_bp
 from drivers_import_bp import drivers_import_bp
 from vehicles_import_bp import vehicles_import_bp
 from routes_import_bp import routes_import_bp
+from supply_import_bp import supply_import_bp
+from demand_import_bp import demand_import_bp
+from supply_demand_bp import supply_demand_bp
 
 
 load_dotenv()
@@ -37,7 +42,12 @@ app.config.update({
     'JWT_ISSUER': os.getenv("JWT_ISSUER", "local-food-app"),
     'JWT_AUDIENCE': os.getenv("JWT_AUDIENCE", "local-food-api"),
     'SECRET_KEY': os.getenv("SECRET_KEY", "dev-secret-key"),
-    'ANON_RECOVERY_TTL_SECONDS': int(os.getenv("ANON_RECOVERY_TTL_SECONDS", 7 * 24 * 3600))
+    'ANON_RECOVERY_TTL_SECONDS': int(os.getenv("ANON_RECOVERY_TTL_SECONDS", 7 * 24 * 3600)),
+    'BULK_LOAD_IMPORTS': os.getenv("BULK_LOAD_IMPORTS", "false").lower() in ("1", "true", "yes"),
+    'SCHEDULER_ENABLED': os.getenv("SCHEDULER_ENABLED", "false").lower() in ("1", "true", "yes"),
+    'ANON_CLEANUP_INTERVAL_SECONDS': int(os.getenv("ANON_CLEANUP_INTERVAL_SECONDS", 3600)),
+    'TASK_QUEUE_ENABLED': os.getenv("TASK_QUEUE_ENABLED", "false").lower() in ("1", "true", "yes"),
+    'TASK_PURGE_AGE_SECONDS': int(os.getenv("TASK_PURGE_AGE_SECONDS", 24 * 3600))
 })
 
 # Register Blueprints
@@ -53,14 +63,41 @@ app.register_blueprint(products_import_bp)
 app.register_blueprint(drivers_import_bp)
 app.register_blueprint(vehicles_import_bp)
 app.register_blueprint(routes_import_bp)
+app.register_blueprint(supply_import_bp)
+app.register_blueprint(demand_import_bp)
+app.register_blueprint(supply_demand_bp)
 
 # Install Auth Middleware
 install_auth_middleware(app)
 
+# Bump resource versions after writes (ETag / 304 support on GETs)
+install_version_bumps(app)
+
+# Background maintenance jobs (one node runs each job per interval)
+if app.config['SCHEDULER_ENABLED']:
+    from db.functions import scheduler
+    from auth.cleanup_anonymous import cleanup as cleanup_anonymous
+
+    scheduler.register_job("anon_cleanup", app.config['ANON_CLEANUP_INTERVAL_SECONDS'], cleanup_anonymous)
+    scheduler.register_job("task_purge", 3600, lambda: task_queue.purge(app.config['TASK_PURGE_AGE_SECONDS']))
+    scheduler.start()
+
+# Background task queue for slow post-write recalculations. Opt-in, like the
+# scheduler: processes without it (tests, benchmarks, scripts) do the work inline
+if app.config['TASK_QUEUE_ENABLED']:
+    task_queue.start(app)
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
+@app.get("/health/tasks")
+def task_metrics():
+    try:
+        return task_queue.metrics()
+    except Exception as e:
+        return {"error": type(e).__name__}, 503
+
 @app.route('/logout')
 def logout():
     resp = make_response(redirect(url_for('auth.login')))
@@ -1,18 +1,17 @@
 from flask import Blueprint, request, jsonify, current_app, render_template, redirect, url_for, g, make_response
-from auth.passwords import verify_password, DUMMY_HASH, hash_password
+from auth.passwords import verify_password, DUMMY_HASH, hash_password, needs_rehash, rehash_in_background, HashingBusy
 from auth.user_management import get_user_by_username, create_user, set_totp_secret, get_user_totp_secret, upgrade_anonymous_user
-from auth.user_management import set_totp_confirmed, get_user_for_reset, update_user_password, create_anonymous_user, update_user_activity
+from auth.user_management import set_totp_confirmed, get_user_for_reset, update_user_password
+from auth.activity import record_activity
+from auth import anon_pool
 from auth.totp import generate_secret, verify_code, get_totp_uri, generate_qr_base64
 from auth.tokens import mint_access_token, verify_access_token, sign_reset_token, verify_reset_token, sign_recovery_cookie, verify_recovery_cookie
-from collections import defaultdict
-from time import time
+from auth import rate_limit
 
 #Rate limiting arguments for password reset auth
-_reset_rate = defaultdict(list)
 RESET_LIMIT = 5
 RESET_WINDOW = 3600
 
-_anon_rate = defaultdict(list)
 ANON_LIMIT = 5
 ANON_WINDOW = 3600
 
@@ -46,10 +45,19 @@ def login():
     
     # Timing attack mitigation: Always verify a hash
     target_hash = user["password_hash"] if user else DUMMY_HASH
-    if not user or not verify_password(target_hash, password):
-        return jsonify({"error": "Invalid credentials"}), 401
-
-    token = mint_access_token(user_id=user["user_id"], tenant_id=user["tenant_id"], username=username)
+    try:
+        if not verify_password(target_hash, password) or not user:
+            return jsonify({"error": "Invalid credentials"}), 401
+    except HashingBusy:
+        return jsonify({"error": "Server busy, try again shortly"}), 503
+
+    # Upgrade hashes made with old parameters while we have the plain password
+    if needs_rehash(user["password_hash"]):
+        user_id = user["user_id"]
+        rehash_in_background(password, lambda new_hash: update_user_password(user_id, new_hash))
+
+    token = mint_access_token(user_id=user["user_id"], tenant_id=user["tenant_id"], username=username,
+                              totp_confirmed=bool(user["totp_confirmed"]))
     return jsonify({"token": token})
 
 @auth_bp.route("/register", methods=["GET", "POST"])
@@ -110,6 +118,10 @@ def register():
         return render_template('register.html',
                                error=str(e),
                                form_data={"username": username, "email": email})
+    except HashingBusy:
+        return render_template('register.html',
+                               error="Server busy, try again shortly.",
+                               form_data={"username": username, "email": email}), 503
     except Exception as e:
         current_app.logger.error(f"Registration Error: {e}")
         return render_template('register.html',
@@ -137,7 +149,12 @@ def totp_confirm():
     secret = get_user_totp_secret(g.user_id)
     if verify_code(secret, code):
         set_totp_confirmed(g.user_id, True)
-        return redirect(url_for("routes.routes_list"))
+        # Re-mint so later requests don't have to look the flag up
+        token = mint_access_token(user_id=g.user_id, tenant_id=g.tenant_id, username=g.username,
+                                  totp_confirmed=True)
+        resp = make_response(redirect(url_for("routes.routes_list")))
+        resp.set_cookie("token", token, httponly=True, samesite="Lax", max_age=current_app.config["JWT_ACCESS_TTL_SECONDS"])
+        return resp
 
     # Re-generate QR for re-render on error
     uri = get_totp_uri(secret, g.username)
@@ -194,18 +211,16 @@ def reset_password_complete():
     except ValueError as e:
         return render_template("reset_new_password.html",
                                reset_token=token, error=str(e))
+    except HashingBusy:
+        return render_template("reset_new_password.html",
+                               reset_token=token, error="Server busy, try again shortly."), 503
 
     update_user_password(user_id, hashed)
     return redirect(url_for("auth.login"))
 
 
 def check_anon_rate(ip):
-    now = time()
-    _anon_rate[ip] = [t for t in _anon_rate[ip] if now - t < ANON_WINDOW]
-    if len(_anon_rate[ip]) >= ANON_LIMIT:
-        return False
-    _anon_rate[ip].append(now)
-    return True
+    return rate_limit.allow("anon", ip, ANON_LIMIT, ANON_WINDOW)
 
 
 @auth_bp.get("/try")
@@ -226,7 +241,7 @@ def try_anonymous():
             user_id, tenant_id = result
             token = mint_access_token(user_id=user_id, tenant_id=tenant_id, is_anon=True)
             recovery = sign_recovery_cookie(user_id, tenant_id)
-            update_user_activity(user_id=user_id)
+            record_activity(user_id)
             resp = make_response(redirect(url_for("routes.routes_list")))
             resp.set_cookie("token", token, httponly=True, samesite="Lax", max_age=current_app.config["JWT_ACCESS_TTL_SECONDS"])
             resp.set_cookie("anon_recovery", recovery, httponly=True, samesite="Lax", max_age=current_app.config["ANON_RECOVERY_TTL_SECONDS"])
@@ -234,7 +249,11 @@ def try_anonymous():
     if not check_anon_rate(request.remote_addr):
         return render_template("login.html", error="Too many attempts. Try again later", jwt_ttl=current_app.config["JWT_ACCESS_TTL_SECONDS"]), 429
 
-    user_id, tenant_id = create_anonymous_user()
+    try:
+        # Falls back to hashing a fresh password when the pool is empty
+        user_id, tenant_id = anon_pool.claim()
+    except HashingBusy:
+        return render_template("login.html", error="Server busy, try again shortly", jwt_ttl=current_app.config["JWT_ACCESS_TTL_SECONDS"]), 503
     token = mint_access_token(user_id=user_id, tenant_id=tenant_id, is_anon=True)
     recovery = sign_recovery_cookie(user_id, tenant_id)
     resp = make_response(redirect(url_for("routes.routes_list")))
@@ -244,9 +263,4 @@ def try_anonymous():
 
 
 def check_reset_rate(username):
-    now = time()
-    _reset_rate[username] = [t for t in _reset_rate[username] if now - t < RESET_WINDOW]
-    if len(_reset_rate[username]) >= RESET_LIMIT:
-        return False
-    _reset_rate[username].append(now)
-    return True
\ No newline at end of file
+    return rate_limit.allow("reset", username, RESET_LIMIT, RESET_WINDOW)
\ No newline at end of file
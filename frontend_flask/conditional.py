@@ -0,0 +1,112 @@
+import hashlib
+import os
+from functools import wraps
+
+from flask import g, make_response, request
+
+from db.functions import resource_versions
+
+"""
+Conditional GET (ETag / Last-Modified) for pages built from tenant data.
+
+@conditional("routes", "route:{route_id}") stamps a view's response with an
+ETag and Last-Modified derived from the tenant's resource versions (resource
+names are formatted with the view arguments). A request whose If-None-Match
+or If-Modified-Since still matches gets a 304 before the view runs, so no
+route, cost or Mapbox work is done for unchanged pages.
+
+install_version_bumps(app) bumps the versions after every successful write
+request, based on the blueprint that handled it. Background tasks that
+change data bump their own resources when they finish.
+
+APP_VERSION is mixed into every ETag so a deploy with new templates does not
+serve 304s for pages rendered by the old code.
+"""
+
+APP_VERSION = os.getenv("APP_VERSION", "")
+
+_WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Blueprints whose writes change route data; everything else is master data
+_ROUTE_BLUEPRINTS = {"routes"}
+_BULK_ROUTE_BLUEPRINTS = {"routes_import"}
+_SKIP_BLUEPRINTS = {"auth"}
+
+
+def conditional(*resources):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**kwargs):
+            # Versions are per tenant; without one there is nothing to stamp
+            if g.get("tenant_id") is None:
+                return view(**kwargs)
+
+            names = [r.format(**kwargs) for r in resources]
+            try:
+                versions = resource_versions.get_versions(names)
+            except Exception as e:
+                # Without versions there is nothing to validate against
+                print(f"Resource version lookup failed: {type(e).__name__}")
+                return view(**kwargs)
+
+            stamp = ";".join(f"{name}={versions[name][0]}" for name in names)
+            etag = hashlib.sha256(
+                f"{APP_VERSION}|{g.get('tenant_id')}|{request.path}|{stamp}".encode()
+            ).hexdigest()[:32]
+            modified = [updated for _, updated in versions.values() if updated is not None]
+            last_modified = max(modified).replace(microsecond=0) if modified else None
+
+            if _not_modified(etag, last_modified):
+                resp = make_response("", 304)
+            else:
+                resp = make_response(view(**kwargs))
+                if resp.status_code != 200:
+                    return resp
+
+            resp.set_etag(etag, weak=True)
+            if last_modified is not None:
+                resp.last_modified = last_modified
+            # Always revalidate; the data is per user and can change any time
+            resp.headers["Cache-Control"] = "private, no-cache"
+            return resp
+        return wrapper
+    return decorator
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified.replace(tzinfo=request.if_modified_since.tzinfo) <= request.if_modified_since
+    return False
+
+
+def _written_resources():
+    blueprint = request.blueprint
+    if blueprint in _SKIP_BLUEPRINTS:
+        return []
+    if blueprint in _ROUTE_BLUEPRINTS:
+        route_id = (request.view_args or {}).get("route_id")
+        if route_id is not None:
+            return ["routes", f"route:{route_id}"]
+        return ["routes", "routes:bulk"]
+    if blueprint in _BULK_ROUTE_BLUEPRINTS:
+        return ["routes", "routes:bulk"]
+    return ["assets"]
+
+
+def install_version_bumps(app):
+    @app.after_request
+    def bump_versions_after_write(response):
+        if request.method not in _WRITE_METHODS or response.status_code >= 400:
+            return response
+        if g.get("tenant_id") is None:
+            return response
+
+        resources = _written_resources()
+        if resources:
+            try:
+                resource_versions.bump(*resources)
+            except Exception as e:
+                print(f"Resource version bump failed: {type(e).__name__}")
+        return response
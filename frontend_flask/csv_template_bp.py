@@ -49,6 +49,22 @@ CSV_TEMPLATES = {
         "origin_name",
         "dest_name",
     ],
+    "supply": [
+        "entity_name",
+        "location_name",
+        "product_code",
+        "quantity_available",
+        "unit_weight_lbs",
+        "unit_volume_cu_ft",
+        "items_per_handling_unit",
+        "cost_per_item",
+    ],
+    "demand": [
+        "location_name",
+        "product_code",
+        "quantity_needed",
+        "max_price",
+    ],
 }
 
 
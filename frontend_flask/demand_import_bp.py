@@ -0,0 +1,208 @@
+from flask import Blueprint, request, jsonify, render_template
+import csv
+import io
+
+import import_validation
+import bulk_import
+
+from db.functions.batch_writer import chunked, DEFAULT_BATCH_SIZE
+from db.functions.tenant_functions import (
+    scoped_read as read,
+    scoped_batch as batch
+)
+
+demand_import_bp = Blueprint(
+    "demand_import",
+    __name__,
+    url_prefix="/api/import/demand"
+)
+
+REQUIRED_HEADERS = {
+    "location_name",
+    "product_code",
+    "quantity_needed",
+    "max_price"
+}
+
+# Column order of the value tuples handed to the batched writer
+DEMAND_COLUMNS = [
+    "location_id",
+    "product_code",
+    "quantity_needed",
+    "max_price"
+]
+
+
+@demand_import_bp.route("/upload", methods=["GET"])
+def demand_upload_form():
+    return render_template(
+        "simple_csv_upload.html",
+        title="Demand Import",
+        post_url="/api/import/demand/upload"
+    )
+
+
+@demand_import_bp.route("/upload", methods=["POST"])
+def import_demand():
+
+    if "file" not in request.files:
+        return jsonify({"error": "No file uploaded"}), 400
+
+    file = request.files["file"]
+    if not file.filename.endswith(".csv"):
+        return jsonify({"error": "CSV required"}), 400
+
+    try:
+        content = file.read().decode("utf-8")
+        reader = csv.DictReader(io.StringIO(content))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+    headers = set(reader.fieldnames or [])
+
+    missing = REQUIRED_HEADERS - headers
+    unexpected = headers - REQUIRED_HEADERS
+
+    if missing or unexpected:
+        return jsonify({
+            "status": "error",
+            "missing_headers": sorted(missing),
+            "unexpected_headers": sorted(unexpected)
+        }), 400
+
+    if import_validation.is_dry_run(request.args):
+        try:
+            report = import_validation.dry_run("demand", content)
+        except Exception as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(report), 200
+
+    if bulk_import.is_bulk_load(request.args):
+        return bulk_import.run("demand", content)
+
+    # Projected lookups: only the columns needed to resolve names and keys
+    locations = read.view_locations_scoped(columns=["location_id", "name"])
+    products = read.view_products_master_scoped(columns=["product_code"])
+
+    locations_by_name = {l["name"]: l["location_id"] for l in locations}
+    product_codes = {p["product_code"] for p in products}
+
+    results = []
+    # key -> (row_idx, values); a later row for the same key supersedes the earlier one
+    pending = {}
+
+    for row_idx, row in enumerate(reader, start=2):
+        errors = []
+
+        location_name = row["location_name"].strip()
+        product_code = row["product_code"].strip()
+
+        location_id = locations_by_name.get(location_name)
+
+        if location_id is None:
+            errors.append(f"Location not found: {location_name}")
+        if not product_code:
+            errors.append("product_code is required")
+        elif product_code not in product_codes:
+            errors.append(f"Product not found: {product_code}")
+
+        def parse_float(field, default=None):
+            raw = (row[field] or "").strip()
+            if raw == "" and default is not None:
+                return default
+            try:
+                return float(raw)
+            except ValueError:
+                errors.append(f"Invalid {field}")
+                return None
+
+        quantity = parse_float("quantity_needed")
+        max_price = parse_float("max_price", 0.0)
+
+        if errors:
+            results.append({
+                "row": row_idx,
+                "status": "error",
+                "errors": errors
+            })
+            continue
+
+        key = (location_id, product_code)
+        values = (location_id, product_code, quantity, max_price)
+
+        if key in pending:
+            results.append({
+                "row": pending[key][0],
+                "status": "skipped",
+                "errors": [f"Superseded by row {row_idx}"]
+            })
+        pending[key] = (row_idx, values)
+
+    def fail(chunk, e):
+        for _, (row_idx, _) in chunk:
+            results.append({
+                "row": row_idx,
+                "status": "error",
+                "errors": [str(e)]
+            })
+
+    # Existing keys are resolved per chunk through the product_code index,
+    # so the cost tracks the upload rather than the size of the demand table
+    for pending_chunk in chunked(list(pending.items()), DEFAULT_BATCH_SIZE):
+        try:
+            existing = read.view_demand_by_product_scoped(
+                product_codes=sorted({key[1] for key, _ in pending_chunk})
+            )
+        except Exception as e:
+            fail(pending_chunk, e)
+            continue
+
+        existing_by_key = {
+            (d["location_id"], d["product_code"]): d["demand_id"]
+            for d in existing
+        }
+        inserts = [(k, v) for k, v in pending_chunk if k not in existing_by_key]
+        updates = [(k, v) for k, v in pending_chunk if k in existing_by_key]
+
+        if inserts:
+            try:
+                batch.insert_rows_scoped(
+                    table="demand",
+                    columns=DEMAND_COLUMNS,
+                    rows=[values for _, (_, values) in inserts]
+                )
+                for key, (row_idx, _) in inserts:
+                    results.append({
+                        "row": row_idx,
+                        "status": "success",
+                        "action": "created",
+                        "product_code": key[1]
+                    })
+            except Exception as e:
+                fail(inserts, e)
+
+        if updates:
+            try:
+                batch.update_rows_scoped(
+                    table="demand",
+                    key_column="demand_id",
+                    columns=DEMAND_COLUMNS,
+                    rows=[(existing_by_key[key], *values) for key, (_, values) in updates]
+                )
+                for key, (row_idx, _) in updates:
+                    results.append({
+                        "row": row_idx,
+                        "status": "success",
+                        "action": "updated",
+                        "demand_id": existing_by_key[key],
+                        "product_code": key[1]
+                    })
+            except Exception as e:
+                fail(updates, e)
+
+    results.sort(key=lambda r: r["row"])
+
+    return jsonify({
+        "status": "completed",
+        "results": results
+    }), 200
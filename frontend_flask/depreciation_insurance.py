@@ -2,6 +2,10 @@ from typing import Optional
 
 """
 Handles the calculations of Depreciation and Insurance costs.
+
+The per-mile rates are also stored on vehicles as generated columns
+(depreciation_per_mile, insurance_per_mile, maintenance_per_mile) using the
+same formulas; keep USEFUL_LIFE_YEARS in sync with SCHEMA.sql.
 """
 
 USEFUL_LIFE_YEARS = 8
@@ -44,4 +48,18 @@ def insurance_cost_per_mile(annual_insurance_cost, expected_annual_mileage) -> f
 
 def trip_insurance_cost(annual_insurance_cost, expected_annual_mileage, trip_miles) -> float:
     icpm = insurance_cost_per_mile(annual_insurance_cost, expected_annual_mileage)
-    return icpm * _to_float(trip_miles)
\ No newline at end of file
+    return icpm * _to_float(trip_miles)
+
+
+def vehicle_cost_rates(purchase_price, salvage_value, expected_annual_mileage,
+                       annual_insurance_cost, annual_maintenance_cost):
+    """
+    Returns (depreciation, insurance, maintenance) cost per mile.
+    """
+    annual_miles = _to_float(expected_annual_mileage)
+    total_projected_mileage = annual_miles * USEFUL_LIFE_YEARS if annual_miles > 0 else 0.0
+    return (
+        depreciation_cost_per_mile(purchase_price, salvage_value, total_projected_mileage),
+        insurance_cost_per_mile(annual_insurance_cost, annual_miles),
+        insurance_cost_per_mile(annual_maintenance_cost, annual_miles),
+    )
@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify, render_template
 import csv
 import io
 
+import import_validation
+
 from db.functions.tenant_functions import (
     scoped_read as read,
     scoped_create as create,
@@ -58,6 +60,13 @@ def import_drivers():
             "unexpected_headers": sorted(unexpected)
         }), 400
 
+    if import_validation.is_dry_run(request.args):
+        try:
+            report = import_validation.dry_run("drivers", content)
+        except Exception as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(report), 200
+
     existing_drivers = read.view_drivers_scoped()
     existing_by_name = {d["name"]: d for d in existing_drivers}
 
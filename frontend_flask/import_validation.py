@@ -0,0 +1,232 @@
+import io
+
+from db.functions.simple_functions.create import (
+    LOCATION_TYPES,
+    STORAGE_TYPES,
+    VEHICLE_STORAGE_TYPES
+)
+from db.functions.tenant_functions import scoped_read as read
+
+"""
+Dry-run validation for CSV imports.
+
+The whole file is parsed into a DataFrame and every check runs column-wise,
+so a large file gets a complete error report in one pass without writing
+anything to the database. Only read-only, projected lookups are made to
+resolve foreign-key names.
+
+pandas is imported on first use so app workers don't pay for it at startup.
+"""
+
+# Per import type:
+#   text:       columns that must not be blank (after strip)
+#   enums:      column -> allowed values (compared as written, like the writers do)
+#   numbers:    column -> (minimum, maximum, required); None means unbounded
+#   integers:   columns that must be whole numbers
+#   key:        columns that must be unique within the file
+#   references: column -> name of the lookup the value must resolve against
+IMPORT_SPECS = {
+    "locations": {
+        "text": ["name"],
+        "enums": {"type": LOCATION_TYPES},
+        "numbers": {
+            "latitude": (-90, 90, True),
+            "longitude": (-180, 180, True),
+            "avg_load_minutes": (0, None, True),
+            "avg_unload_minutes": (0, None, True),
+        },
+        "integers": ["avg_load_minutes", "avg_unload_minutes"],
+        "key": ["name"],
+        "references": {},
+    },
+    "products": {
+        "text": ["product_code", "name"],
+        "enums": {"storage_type": STORAGE_TYPES},
+        "numbers": {},
+        "integers": [],
+        "key": ["product_code"],
+        "references": {},
+    },
+    "drivers": {
+        "text": ["name"],
+        "enums": {},
+        "numbers": {
+            "hourly_drive_wage": (0, 999.99, True),
+            "hourly_load_wage": (0, 999.99, True),
+        },
+        "integers": [],
+        "key": ["name"],
+        "references": {},
+    },
+    "vehicles": {
+        "text": ["name"],
+        "enums": {"storage_type": VEHICLE_STORAGE_TYPES},
+        "numbers": {
+            "mpg": (0.1, 999.9, True),
+            "vehicle_purchase_price": (0, None, True),
+            "vehicle_estimated_yearly_milage": (0, None, True),
+            "vehicle_estimated_salvage_value": (0, None, True),
+            "annual_insurance_cost": (0, None, True),
+            "annual_maintenance_cost": (0, None, True),
+            "max_weight_lbs": (0, None, True),
+            "max_volume_cubic_ft": (0, None, True),
+        },
+        "integers": [],
+        "key": ["name"],
+        "references": {},
+    },
+    "routes": {
+        "text": ["name"],
+        "enums": {},
+        "numbers": {},
+        "integers": [],
+        "key": ["name"],
+        "references": {"origin_name": "locations", "dest_name": "locations"},
+    },
+    "supply": {
+        "text": ["product_code"],
+        "enums": {},
+        "numbers": {
+            "quantity_available": (0, None, True),
+            "unit_weight_lbs": (0, None, False),
+            "unit_volume_cu_ft": (0, None, False),
+            "items_per_handling_unit": (0.01, None, False),
+            "cost_per_item": (0, None, False),
+        },
+        "integers": [],
+        "key": ["entity_name", "location_name", "product_code"],
+        "references": {
+            "entity_name": "entities",
+            "location_name": "locations",
+            "product_code": "products",
+        },
+    },
+    "demand": {
+        "text": ["product_code"],
+        "enums": {},
+        "numbers": {
+            "quantity_needed": (0, None, True),
+            "max_price": (0, None, False),
+        },
+        "integers": [],
+        "key": ["location_name", "product_code"],
+        "references": {
+            "location_name": "locations",
+            "product_code": "products",
+        },
+    },
+}
+
+
+def is_dry_run(args):
+    return (args.get("dry_run") or "").strip().lower() in ("1", "true", "yes")
+
+
+def _load_reference(name):
+    """
+    Returns the set of names a reference column may resolve to.
+    Projected reads only, nothing is written.
+    """
+    if name == "locations":
+        return {l["name"] for l in read.view_locations_scoped(columns=["name"])}
+    if name == "entities":
+        return {e["name"] for e in read.view_entities_scoped(columns=["name"])}
+    if name == "products":
+        return {p["product_code"] for p in read.view_products_master_scoped(columns=["product_code"])}
+    raise ValueError(f"Unknown reference: {name}")
+
+
+def validate_frame(df, spec, references):
+    """
+    Runs every check in `spec` against the frame.
+
+    :param df: DataFrame of the CSV, all columns as str
+    :param references: reference name -> set of valid values
+    :return: DataFrame with columns (row, error), one line per problem
+    """
+    import pandas as pd
+
+    rows = pd.Series(df.index + 2, index=df.index)  # header is line 1
+    stripped = df.apply(lambda col: col.str.strip())
+    found = []
+
+    def flag(mask, message):
+        if mask.any():
+            msgs = message if isinstance(message, pd.Series) else pd.Series(message, index=df.index)
+            found.append(pd.DataFrame({"row": rows[mask], "error": msgs[mask]}))
+
+    for col in spec["text"]:
+        flag(stripped[col] == "", f"{col} is required")
+
+    for col, allowed in spec["enums"].items():
+        flag(~df[col].isin(allowed), f"Invalid {col}: " + df[col])
+
+    for col, (low, high, required) in spec["numbers"].items():
+        blank = stripped[col] == ""
+        values = pd.to_numeric(stripped[col], errors="coerce")
+        invalid = values.isna() & ~blank
+        flag(invalid, f"Invalid {col}")
+        if required:
+            flag(blank, f"{col} is required")
+        if low is not None:
+            flag(values < low, f"{col} must be >= {low}")
+        if high is not None:
+            flag(values > high, f"{col} must be <= {high}")
+        if col in spec["integers"]:
+            flag(values.notna() & (values % 1 != 0), f"{col} must be a whole number")
+
+    key = spec["key"]
+    if key:
+        dup = stripped.duplicated(subset=key, keep=False) & (stripped[key] != "").all(axis=1)
+        first = rows.groupby([stripped[c] for c in key]).transform("min")
+        flag(dup, "Duplicate " + "/".join(key) + " (first seen on row " + first.astype(str) + ")")
+
+    for col, ref in spec["references"].items():
+        present = stripped[col] != ""
+        flag(present & ~stripped[col].isin(references[ref]), f"{col} not found: " + stripped[col])
+
+    if not found:
+        return pd.DataFrame({"row": pd.Series(dtype="int64"), "error": pd.Series(dtype="object")})
+    return pd.concat(found, ignore_index=True)
+
+
+def load_frame(content):
+    """
+    Parses CSV text into a DataFrame with every column kept as str.
+    """
+    import pandas as pd
+
+    return pd.read_csv(io.StringIO(content), dtype=str, keep_default_na=False)
+
+
+def dry_run(import_type, content):
+    """
+    Validates a whole CSV without writing. Returns a JSON-ready report in the
+    same shape as the import results (row/status/errors).
+    """
+    return validation_report(import_type, load_frame(content))
+
+
+def validation_report(import_type, df):
+    """
+    Same as dry_run, for a frame that has already been parsed.
+    """
+    spec = IMPORT_SPECS[import_type]
+
+    references = {ref: _load_reference(ref) for ref in set(spec["references"].values())}
+    errors = validate_frame(df, spec, references)
+
+    grouped = errors.groupby("row", sort=True)["error"].apply(list)
+    results = [
+        {"row": int(row), "status": "error", "errors": msgs}
+        for row, msgs in grouped.items()
+    ]
+
+    return {
+        "status": "dry_run",
+        "valid": not results,
+        "row_count": int(len(df)),
+        "error_count": int(len(errors)),
+        "rows_with_errors": len(results),
+        "results": results
+    }
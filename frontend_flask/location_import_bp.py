@@ -2,6 +2,9 @@ from flask import Blueprint, request, jsonify, render_template
 import csv
 import io
 
+import import_validation
+import bulk_import
+
 from db.functions.tenant_functions import (
     scoped_read as read,
     scoped_create as create,
@@ -66,6 +69,16 @@ def import_locations():
             "unexpected_headers": sorted(unexpected)
         }), 400
 
+    if import_validation.is_dry_run(request.args):
+        try:
+            report = import_validation.dry_run("locations", content)
+        except Exception as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(report), 200
+
+    if bulk_import.is_bulk_load(request.args):
+        return bulk_import.run("locations", content)
+
     existing_locations = read.view_locations_scoped()
     existing_by_name = {l["name"]: l for l in existing_locations}
 
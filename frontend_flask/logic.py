@@ -1,8 +1,8 @@
+import csv
+import io
 from decimal import Decimal
-import pandas as pd
 import depreciation_insurance
 import os
-import requests
 from urllib.parse import quote
 
 """
@@ -228,6 +228,19 @@ def validate_load_form(form):
 # =============================================================================
 
 
+def _mapbox_geocode(requests, token, address):
+    """
+    Geocodes an address to [lng, lat], or None.
+    """
+    url = f"https://api.mapbox.com/geocoding/v5/mapbox.places/{quote(address)}.json"
+    resp = requests.get(url, params={"access_token": token, "limit": 1}, timeout=5)
+    if resp.status_code == 200:
+        feats = resp.json().get("features")
+        if feats:
+            return feats[0]["center"]
+    return None
+
+
 def fetch_mapbox_distance(origin_address, dest_address):
     """
     Calls Mapbox API to get distance (miles) and duration (minutes).
@@ -237,19 +250,12 @@ def fetch_mapbox_distance(origin_address, dest_address):
     if not token or not origin_address or not dest_address:
         return None, None
 
-    try:
-        # Helper to geocode address to [lng, lat]
-        def _geocode(addr):
-            url = f"https://api.mapbox.com/geocoding/v5/mapbox.places/{quote(addr)}.json"
-            resp = requests.get(url, params={"access_token": token, "limit": 1}, timeout=5)
-            if resp.status_code == 200:
-                feats = resp.json().get("features")
-                if feats:
-                    return feats[0]["center"]
-            return None
+    # Deferred: requests is only needed when a Mapbox token is configured
+    import requests
 
-        start_coords = _geocode(origin_address)
-        end_coords = _geocode(dest_address)
+    try:
+        start_coords = _mapbox_geocode(requests, token, origin_address)
+        end_coords = _mapbox_geocode(requests, token, dest_address)
 
         if start_coords and end_coords:
             # Mapbox Directions: {lng},{lat};{lng},{lat}
@@ -272,10 +278,60 @@ def fetch_mapbox_distance(origin_address, dest_address):
     return None, None
 
 
+def fetch_mapbox_route_geometry(origin, dest):
+    """
+    Calls Mapbox Directions for the full driving route between two points.
+    Each point is [lng, lat], or an address string that is geocoded first.
+
+    Returns {"geometry": GeoJSON LineString, "origin": [lng, lat],
+    "dest": [lng, lat], "distance_miles", "duration_minutes"} or None if failed.
+    """
+    token = os.getenv("MAPBOX_TOKEN")
+    if not token or not origin or not dest:
+        return None
+
+    import requests
+
+    try:
+        if isinstance(origin, str):
+            origin = _mapbox_geocode(requests, token, origin)
+        if isinstance(dest, str):
+            dest = _mapbox_geocode(requests, token, dest)
+        if not origin or not dest:
+            return None
+
+        coords_path = f"{origin[0]},{origin[1]};{dest[0]},{dest[1]}"
+        dir_url = f"https://api.mapbox.com/directions/v5/mapbox/driving/{coords_path}"
+        resp = requests.get(dir_url, params={
+            "access_token": token, "geometries": "geojson", "overview": "full", "steps": "false"
+        }, timeout=10)
+        if resp.status_code == 200:
+            routes = resp.json().get("routes")
+            if routes:
+                route = routes[0]
+                return {
+                    "geometry": route["geometry"],
+                    "origin": list(origin),
+                    "dest": list(dest),
+                    "distance_miles": round(route["distance"] * 0.000621371, 2),
+                    "duration_minutes": round(route["duration"] / 60.0, 2),
+                }
+    except Exception as e:
+        print(f"Mapbox API Error: {e}")
+
+    return None
+
+
 def get_trip_length(header):
     """
     Returns trip distance (miles) and time (minutes).
+
+    Uses the route's cached round trip (trip_miles, trip_minutes) when the
+    header carries it, and only asks Mapbox otherwise.
     """
+    if header.get('trip_miles') is not None and header.get('trip_minutes') is not None:
+        return float(header['trip_miles']), float(header['trip_minutes'])
+
     dest_address = f"{header.get('dest_address_street')} {header.get('dest_city')} {header.get('dest_state')}"
 
     origin_address = f"{header.get('origin_address_street')} {header.get('origin_city')} {header.get('origin_state')}"
@@ -286,42 +342,33 @@ def get_trip_length(header):
     return round(miles_est*2,2), round(time_est*2,2)
 
 
-def calculate_depreciation(purchase_price, salvage_value, yearly_mileage, trip_miles):
-    depreciation_cost = depreciation_insurance.trip_depreciation_cost(
-        purchase_price, salvage_value, yearly_mileage, trip_miles
-    )
-    return depreciation_cost
-
-
-def calculate_insurance(annual_insurance_cost, yearly_mileage, trip_miles):
-    insurance_cost = depreciation_insurance.trip_insurance_cost(annual_insurance_cost, yearly_mileage, trip_miles)
-    return insurance_cost
-
-
-def calculate_maintenance(annual_maintenance_cost, yearly_mileage, trip_miles):
-    # Maintenance is calculated same as insurance (Annual / Yearly Miles * Trip Miles)
-    return depreciation_insurance.trip_insurance_cost(annual_maintenance_cost, yearly_mileage, trip_miles)
-
-
 def calculate_operating_costs(vehicle, trip_miles):
     """
     Calculates operating costs (depreciation, insurance, maintenance) for a vehicle.
     Returns tuple: (depreciation_per_mile, daily_insurance, daily_maintenance)
+
+    Uses the per-mile rates stored on the vehicle row; they are only derived
+    here for vehicle dicts that did not come from the database.
     """
     if not vehicle:
         return Decimal("0.0"), Decimal("0.0"), Decimal("0.0")
 
-    # Extract values safely
-    purchase_price = vehicle.get('vehicle_purchase_price')
-    salvage_value = vehicle.get('vehicle_estimated_salvage_value')
-    yearly_mileage = vehicle.get('vehicle_estimated_yearly_milage')
-    annual_insurance = vehicle.get('annual_insurance_cost')
-    annual_maintenance = vehicle.get('annual_maintenance_cost')
-
-    dep = calculate_depreciation(purchase_price, salvage_value, yearly_mileage, trip_miles)
-    ins = calculate_insurance(annual_insurance, yearly_mileage, trip_miles)
-    maint = calculate_maintenance(annual_maintenance, yearly_mileage, trip_miles)
-
+    rates = (
+        vehicle.get('depreciation_per_mile'),
+        vehicle.get('insurance_per_mile'),
+        vehicle.get('maintenance_per_mile'),
+    )
+    if None in rates:
+        rates = depreciation_insurance.vehicle_cost_rates(
+            vehicle.get('vehicle_purchase_price'),
+            vehicle.get('vehicle_estimated_salvage_value'),
+            vehicle.get('vehicle_estimated_yearly_milage'),
+            vehicle.get('annual_insurance_cost'),
+            vehicle.get('annual_maintenance_cost'),
+        )
+
+    miles = safe_float(trip_miles)
+    dep, ins, maint = (safe_float(rate) * miles for rate in rates)
     return dep, ins, maint
 
 
@@ -417,7 +464,7 @@ def calculate_trip_costs(header, items, totals=None):
         "driver_unload_cost_est": round(driver_unload_cost, 2),
         "driver_cost_total_est": round(driver_total_cost, 2),
 
-        "line_item_count": len(items),
+        "line_item_count": safe_int(totals.get("line_item_count"), len(items)),
         "total_weight_lbs": round(total_weight, 2),
         "total_volume": round(total_volume, 2),
 
@@ -502,22 +549,22 @@ def aggregate_manifest_totals(items):
     }
 
 
-def generate_csv_export(data_list, columns=None):
+def iter_csv_export(rows, columns):
     """
-    Generates CSV string from list of dicts.
-    columns: Optional list of column names to include and order.
+    Yields CSV text line by line: a header of `columns`, then one line per
+    dict in `rows` (any iterable). Missing keys become empty cells and extra
+    keys are ignored, so rows can be streamed as they are computed.
     """
-    if not data_list:
-        return ""
-
-    df = pd.DataFrame(data_list)
-    if columns:
-        # Filter and order columns, ignoring those that don't exist in the data
-        valid_cols = [c for c in columns if c in df.columns]
-        if valid_cols:
-            df = df[valid_cols]
-
-    return df.to_csv(index=False)
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=columns, extrasaction="ignore", lineterminator="\n")
+
+    writer.writeheader()
+    yield buf.getvalue()
+    for row in rows:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerow(row)
+        yield buf.getvalue()
 
 def calculate_per_product_margin(manifest):
     """
@@ -1,7 +1,7 @@
-# map_route.py
 import os
-from flask import Blueprint, render_template, abort, jsonify
+from flask import Blueprint, render_template, abort, jsonify, url_for
 import access_db as db
+from conditional import conditional
 from dotenv import load_dotenv
 import os
 
@@ -20,18 +20,31 @@ def _get_mapbox_token_or_abort():
     return token
 
 @map_bp.get("/routes/<int:route_id>/map")
+# routes:bulk: the route importer can move a route's endpoints
+@conditional("route:{route_id}", "routes:bulk", "assets")
 def route_map_embed(route_id: int):
-    route = db.get_route(route_id)
+    route = db.get_route_map_info(route_id)
     if not route:
         abort(404)
 
-    start_address = route.get("origin_address")
-    end_address   = route.get("dest_address")
     mapbox_token  = _get_mapbox_token_or_abort()
 
     return render_template(
         "map_view.html", 
-        start_address=start_address,
-        end_address=end_address,
+        start_address=route.get("origin_address"),
+        end_address=route.get("dest_address"),
+        geometry_url=url_for("map.route_map_geometry", route_id=route_id),
         mapbox_token=mapbox_token,
-    )
\ No newline at end of file
+    )
+
+@map_bp.get("/routes/<int:route_id>/map/geometry")
+@conditional("route:{route_id}", "routes:bulk", "assets")
+def route_map_geometry(route_id: int):
+    # Cached per origin/dest pair; the browser never geocodes or routes itself
+    geometry = db.get_route_geometry(route_id)
+    if geometry is None:
+        return jsonify({"error": "Route not found"}), 404
+    if not geometry["features"]:
+        # Not a 200, so no ETag: the next view retries the Mapbox lookup
+        return jsonify({"error": "Route geometry unavailable", **geometry}), 503
+    return jsonify(geometry)
@@ -1,6 +1,7 @@
-from flask import Blueprint, render_template, request, redirect, url_for, abort, jsonify, Response
-import io
+from flask import Blueprint, render_template, request, redirect, url_for, abort, jsonify, Response, stream_with_context
+from datetime import date
 import access_db as db
+from conditional import conditional
 import logic
 
 """
@@ -9,30 +10,6 @@ Manages route and scenario routes.
 
 routes_bp = Blueprint("routes", __name__)
 
-def _get_route_response_data(route_id):
-    """Helper to build JSON response with totals and enriched manifest."""
-    route = db.get_route(route_id)
-    if not route:
-        return {"success": False, "message": "Route not found"}
-
-    total_cost = route.get("calc_total_cost", 0.0)
-
-    # Manifest is already enriched by db.get_route
-    manifest = route.get("manifest", [])
-    # Use the calculated revenue from the route header (calculated in logic.calculate_trip_costs)
-    manifest_subtotal = route.get("calculated_revenue", 0.0)
-
-    return {
-        "success": True,
-        "manifest": manifest,
-        "manifest_subtotal": manifest_subtotal,
-        "total_cost": total_cost,
-        "entered_revenue": float(route.get("sales_amount") or 0.0),
-        "sales_amount": float(route.get("sales_amount") or 0.0) + manifest_subtotal,
-        "manifest_count": len(manifest)
-    }
-
-
 def _build_routes_page_context(**kwargs):
     """
     Prepares all the data needed to display the 'Routes' page.
@@ -77,37 +54,63 @@ def _build_routes_page_context(**kwargs):
     return ctx
 
 @routes_bp.get("/routes")
+@conditional("routes", "assets")
 def routes_list():
     ctx = _build_routes_page_context()
     return render_template("routes_list.html", **ctx)
 
 
+def _export_format():
+    fmt = (request.args.get("format") or "csv").strip().lower()
+    if fmt not in ("csv", "parquet"):
+        abort(400, description="format must be csv or parquet")
+    return fmt
+
+
+def _parquet_response(data, filename):
+    return Response(
+        data,
+        mimetype="application/vnd.apache.parquet",
+        headers={"Content-disposition": f"attachment; filename={filename}"}
+    )
+
+
 @routes_bp.get("/routes/export")
+@conditional("routes", "assets")
 def routes_export_csv():
-    all_details = db.get_all_routes_raw()
-    
-    si = io.StringIO()
-    db.export_routes_csv(all_details, si)
-    output = si.getvalue()
-    
+    if _export_format() == "parquet":
+        return _parquet_response(db.export_routes_parquet(), "all_routes.parquet")
+
+    # Streamed: scenarios are costed in chunks while the CSV is being sent
+    rows = db.iter_routes_csv(db.iter_all_routes_raw())
     return Response(
-        output,
+        stream_with_context(rows),
         mimetype="text/csv",
         headers={"Content-disposition": "attachment; filename=all_routes.csv"}
     )
 
+@routes_bp.get("/routes/export/manifest")
+@conditional("routes", "assets")
+def routes_export_manifest():
+    if _export_format() == "parquet":
+        return _parquet_response(db.export_manifest_lines_parquet(), "manifest_lines.parquet")
+
+    rows = db.iter_manifest_lines_csv(db.iter_all_manifest_lines())
+    return Response(
+        stream_with_context(rows),
+        mimetype="text/csv",
+        headers={"Content-disposition": "attachment; filename=manifest_lines.csv"}
+    )
+
 @routes_bp.get("/routes/<int:route_id>/export")
+@conditional("route:{route_id}", "routes:bulk", "assets")
 def route_export_csv(route_id):
     details = db.get_route_raw(route_id)
     if not details:
         abort(404)
-        
-    si = io.StringIO()
-    db.export_route_detailed_csv(details, si)
-    output = si.getvalue()
-    
+
     return Response(
-        output,
+        stream_with_context(db.iter_route_detailed_csv(details)),
         mimetype="text/csv",
         headers={"Content-disposition": f"attachment; filename=route_{route_id}.csv"}
     )
@@ -156,12 +159,87 @@ def route_delete_post(route_id: int):
     return jsonify({"success": True})
 
 
+@routes_bp.post("/routes/recalc-all")
+def routes_recalc_all_post():
+    # Optional filters (vehicle, driver, run date range) and a new gas price
+    data = request.get_json(silent=True) or request.form
+    fields = {k: str(data.get(k) if data.get(k) is not None else "").strip()
+              for k in ("vehicle_id", "driver_id", "gas_price", "date_from", "date_to")}
+    errors = {}
+
+    vehicle_id = logic.parse_optional_int(fields["vehicle_id"], "vehicle_id", errors)
+    driver_id = logic.parse_optional_int(fields["driver_id"], "driver_id", errors)
+    gas_price = logic.parse_optional_float(fields["gas_price"], "gas_price", errors)
+
+    dates = {}
+    for key in ("date_from", "date_to"):
+        try:
+            dates[key] = date.fromisoformat(fields[key]) if fields[key] else None
+        except ValueError:
+            errors[key] = "Use YYYY-MM-DD."
+    if not errors and dates["date_from"] and dates["date_to"] and dates["date_from"] > dates["date_to"]:
+        errors["date_to"] = "Must be on or after date_from."
+
+    if errors:
+        return jsonify({"success": False, "errors": errors}), 400
+
+    ok, result = db.recalculate_all_routes(
+        vehicle_id=vehicle_id, driver_id=driver_id, gas_price=gas_price, **dates
+    )
+    if not ok:
+        return jsonify({"success": False, "message": result}), 400
+    return jsonify({"success": True, **result})
+
+
 @routes_bp.post("/routes/<int:route_id>/recalc")
 def route_recalc_post(route_id: int):
-    ok, err = db.recalculate_route_costs(route_id)
+    # Existence check only; the cost pipeline runs in the task
+    if not db.get_route_lines(route_id):
+        abort(404)
+
+    # Runs on the background task queue; poll the GET endpoint for completion
+    ok, result = db.queue_route_recalc(route_id)
     if not ok:
-        return jsonify({"success": False, "message": err}), 400
-    return jsonify({"success": True})
+        return jsonify({"success": False, "message": result}), 400
+    if not result:
+        # No dispatcher in this process; it already ran inline
+        return jsonify({"success": True, "queued": False})
+    return jsonify({
+        "success": True,
+        "queued": True,
+        "status_url": url_for("routes.route_recalc_status", route_id=route_id),
+    }), 202
+
+
+@routes_bp.get("/routes/<int:route_id>/recalc")
+def route_recalc_status(route_id: int):
+    task = db.get_route_recalc_status(route_id)
+    if not task:
+        abort(404)
+    return jsonify({
+        "status": task["status"],
+        "pending": task["status"] in ("queued", "running") or bool(task["rerun"]),
+        "message": task["last_error"],
+    })
+
+
+# Fields the manage-load modal needs per line
+MANIFEST_JSON_FIELDS = (
+    "product_id", "product_name", "quantity", "items_per_unit",
+    "unit_price", "cost_per_item", "unit_weight", "unit_volume",
+)
+
+
+@routes_bp.get("/routes/<int:route_id>/manifest.json")
+@conditional("route:{route_id}", "assets")
+def route_manifest_json(route_id: int):
+    manifest = db.get_route_manifest(route_id)
+    if manifest is None:
+        return jsonify({"success": False, "message": "Route not found"}), 404
+    return jsonify({
+        "success": True,
+        "manifest": [{k: item.get(k) for k in MANIFEST_JSON_FIELDS} for item in manifest],
+    })
 
 
 @routes_bp.post("/routes/<int:route_id>/assign-vehicle")
@@ -222,13 +300,15 @@ def route_assign_driver_post(route_id: int):
 
 @routes_bp.post("/routes/<int:route_id>/load/add")
 def route_load_add_post(route_id: int):
-    route = db.get_route(route_id)
+    # Lines only, no cost pipeline; reused by the add below
+    route = db.get_route_lines(route_id)
     if not route:
         abort(404)
 
     data, errors = logic.validate_load_form(request.form)
 
-    if data["product_id"] is not None and not db.get_product(data["product_id"]):
+    product = db.get_product(data["product_id"]) if data["product_id"] is not None else None
+    if data["product_id"] is not None and not product:
         errors["product_id"] = "That product does not exist."
 
     is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
@@ -249,7 +329,7 @@ def route_load_add_post(route_id: int):
         )
         return render_template("routes_list.html", **ctx), 400
 
-    ok, err = db.add_product_to_route(
+    ok, result = db.add_product_to_route(
         route_id=route_id, 
         product_id=data["product_id"], 
         quantity=data["quantity"],
@@ -257,13 +337,16 @@ def route_load_add_post(route_id: int):
         items_per_unit=data["items_per_unit"],
         cost_per_item=data["cost_per_item"],
         unit_weight=data["unit_weight"],
-        unit_volume=data["unit_volume"]
+        unit_volume=data["unit_volume"],
+        route=route,
+        product=product
     )
     
     if is_ajax:
         if not ok:
-            return jsonify({"success": False, "message": err}), 400
-        return jsonify(_get_route_response_data(route_id))
+            return jsonify({"success": False, "message": result}), 400
+        # Only the changed line and the new totals; the page patches its copy
+        return jsonify({"success": True, **result})
 
     if not ok:
         abort(400)
@@ -273,7 +356,7 @@ def route_load_add_post(route_id: int):
 
 @routes_bp.post("/routes/<int:route_id>/load/remove")
 def route_load_remove_post(route_id: int):
-    route = db.get_route(route_id)
+    route = db.get_route_lines(route_id)
     if not route:
         abort(404)
 
@@ -282,12 +365,12 @@ def route_load_remove_post(route_id: int):
         abort(400)
     product_id = product_raw
 
-    ok, err = db.remove_product_from_route(route_id=route_id, product_id=product_id)
+    ok, result = db.remove_product_from_route(route_id=route_id, product_id=product_id, route=route)
     
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         if not ok:
-            return jsonify({"success": False, "message": err}), 400
-        return jsonify(_get_route_response_data(route_id))
+            return jsonify({"success": False, "message": result}), 400
+        return jsonify({"success": True, **result})
 
     if not ok:
         abort(400)
@@ -370,6 +453,7 @@ def route_edit_post(route_id: int):
 
 
 @routes_bp.get("/routes/<int:route_id>/view")
+@conditional("routes", "assets")
 def route_view_get(route_id: int):
     route = db.get_route(route_id)
     if not route:
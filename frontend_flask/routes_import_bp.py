@@ -2,6 +2,9 @@ from flask import Blueprint, request, jsonify, render_template
 import csv
 import io
 
+import import_validation
+
+from db.functions.batch_writer import chunked
 from db.functions.tenant_functions import (
     scoped_read as read,
     scoped_create as create,
@@ -20,6 +23,22 @@ REQUIRED_HEADERS = {
     "dest_name"
 }
 
+# Rows per reference-resolution round trip
+REFERENCE_BATCH_SIZE = 500
+
+
+def _resolve_names(cache, names, lookup, id_field):
+    """
+    Resolves names not already in `cache` with one projected lookup and
+    caches the result (None when the name does not exist).
+    """
+    missing = [n for n in names if n and n not in cache]
+    if not missing:
+        return
+    found = {r["name"]: r[id_field] for r in lookup(names=missing)}
+    for n in missing:
+        cache[n] = found.get(n)
+
 
 @routes_import_bp.route("/upload", methods=["GET"])
 def routes_upload_form():
@@ -58,71 +77,92 @@ def import_routes():
             "unexpected_headers": sorted(unexpected)
         }), 400
 
-    locations = read.view_locations_scoped()
-    routes = read.view_routes_scoped()
+    if import_validation.is_dry_run(request.args):
+        try:
+            report = import_validation.dry_run("routes", content)
+        except Exception as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(report), 200
 
-    locations_by_name = {l["name"]: l for l in locations}
-    routes_by_name = {r["name"]: r for r in routes}
+    # name -> id caches, filled chunk by chunk with projected IN (...) lookups.
+    # None marks a name that was looked up and not found.
+    location_ids = {}
+    route_ids = {}
 
     results = []
 
-    for row_idx, row in enumerate(reader, start=2):
-        errors = []
-
-        name = row["name"].strip()
-        origin_name = row["origin_name"]
-        dest_name = row["dest_name"]
-
-        if not name:
-            errors.append("name is required")
-
-        origin = locations_by_name.get(origin_name)
-        dest = locations_by_name.get(dest_name)
-
-        if not origin:
-            errors.append(f"Origin not found: {origin_name}")
-        if not dest:
-            errors.append(f"Destination not found: {dest_name}")
-
-        if errors:
-            results.append({
-                "row": row_idx,
-                "status": "error",
-                "errors": errors
-            })
-            continue
-
-        payload = {
-            "name": name,
-            "origin_location_id": origin["location_id"],
-            "dest_location_id": dest["location_id"]
-        }
-
-        try:
-            if name in routes_by_name:
-                update.update_route_scoped(
-                    route_id=routes_by_name[name]["route_id"],
-                    **payload
-                )
-                action = "updated"
-                route_id = routes_by_name[name]["route_id"]
-            else:
-                route_id = create.add_route_scoped(**payload)
-                action = "created"
-
-            results.append({
-                "row": row_idx,
-                "status": "success",
-                "action": action,
-                "route_id": route_id
-            })
-
-        except Exception as e:
-            results.append({
-                "row": row_idx,
-                "status": "error",
-                "errors": [str(e)]
-            })
+    for chunk in chunked(enumerate(reader, start=2), REFERENCE_BATCH_SIZE):
+        _resolve_names(
+            location_ids,
+            {row["origin_name"] for _, row in chunk} | {row["dest_name"] for _, row in chunk},
+            read.view_locations_by_name_scoped,
+            "location_id"
+        )
+        _resolve_names(
+            route_ids,
+            {row["name"].strip() for _, row in chunk},
+            read.view_routes_by_name_scoped,
+            "route_id"
+        )
+
+        for row_idx, row in chunk:
+            errors = []
+
+            name = row["name"].strip()
+            origin_name = row["origin_name"]
+            dest_name = row["dest_name"]
+
+            if not name:
+                errors.append("name is required")
+
+            origin_id = location_ids.get(origin_name)
+            dest_id = location_ids.get(dest_name)
+
+            if origin_id is None:
+                errors.append(f"Origin not found: {origin_name}")
+            if dest_id is None:
+                errors.append(f"Destination not found: {dest_name}")
+
+            if errors:
+                results.append({
+                    "row": row_idx,
+                    "status": "error",
+                    "errors": errors
+                })
+                continue
+
+            payload = {
+                "name": name,
+                "origin_location_id": origin_id,
+                "dest_location_id": dest_id
+            }
+
+            try:
+                if route_ids.get(name) is not None:
+                    route_id = route_ids[name]
+                    update.update_route_scoped(
+                        route_id=route_id,
+                        **payload
+                    )
+                    action = "updated"
+                else:
+                    route_id = create.add_route_scoped(**payload)
+                    route_ids[name] = route_id
+                    action = "created"
+
+                results.append({
+                    "row": row_idx,
+                    "status": "success",
+                    "action": action,
+                    "route_id": route_id
+                })
+
+            except Exception as e:
+                results.append({
+                    "row": row_idx,
+                    "status": "error",
+                    "errors": [str(e)]
+                })
 
     return jsonify({
         "status": "completed",
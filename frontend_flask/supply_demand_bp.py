@@ -0,0 +1,66 @@
+from flask import Blueprint, request, jsonify
+
+from db.functions.tenant_functions import scoped_read as read
+
+"""
+Query endpoints for supply and demand. Filters map onto the composite
+(tenant_id, product_code, location_id ...) indexes, so lookups of what is
+available where don't scan the whole table.
+"""
+
+supply_demand_bp = Blueprint(
+    "supply_demand",
+    __name__,
+    url_prefix="/api"
+)
+
+MAX_LIMIT = 5000
+
+
+def _parse_filters(int_fields):
+    """
+    Reads product_code, the given integer filters and limit from the query string.
+    Returns (filters, limit, errors).
+    """
+    errors = {}
+    filters = {"product_code": (request.args.get("product_code") or "").strip() or None}
+
+    for field in int_fields:
+        raw = (request.args.get(field) or "").strip()
+        if not raw:
+            filters[field] = None
+            continue
+        try:
+            filters[field] = int(raw)
+        except ValueError:
+            errors[field] = "Must be a whole number."
+
+    limit = MAX_LIMIT
+    raw_limit = (request.args.get("limit") or "").strip()
+    if raw_limit:
+        try:
+            limit = min(max(int(raw_limit), 1), MAX_LIMIT)
+        except ValueError:
+            errors["limit"] = "Must be a whole number."
+
+    return filters, limit, errors
+
+
+@supply_demand_bp.get("/supply")
+def supply_query():
+    filters, limit, errors = _parse_filters(["location_id", "entity_id"])
+    if errors:
+        return jsonify({"status": "error", "errors": errors}), 400
+
+    rows = read.find_supply_scoped(limit=limit, **filters)
+    return jsonify({"status": "ok", "count": len(rows), "results": rows})
+
+
+@supply_demand_bp.get("/demand")
+def demand_query():
+    filters, limit, errors = _parse_filters(["location_id"])
+    if errors:
+        return jsonify({"status": "error", "errors": errors}), 400
+
+    rows = read.find_demand_scoped(limit=limit, **filters)
+    return jsonify({"status": "ok", "count": len(rows), "results": rows})
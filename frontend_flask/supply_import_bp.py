@@ -0,0 +1,228 @@
+from flask import Blueprint, request, jsonify, render_template
+import csv
+import io
+
+import import_validation
+import bulk_import
+
+from db.functions.batch_writer import chunked, DEFAULT_BATCH_SIZE
+from db.functions.tenant_functions import (
+    scoped_read as read,
+    scoped_batch as batch
+)
+
+supply_import_bp = Blueprint(
+    "supply_import",
+    __name__,
+    url_prefix="/api/import/supply"
+)
+
+REQUIRED_HEADERS = {
+    "entity_name",
+    "location_name",
+    "product_code",
+    "quantity_available",
+    "unit_weight_lbs",
+    "unit_volume_cu_ft",
+    "items_per_handling_unit",
+    "cost_per_item"
+}
+
+# Column order of the value tuples handed to the batched writer
+SUPPLY_COLUMNS = [
+    "entity_id",
+    "location_id",
+    "product_code",
+    "quantity_available",
+    "unit_weight_lbs",
+    "unit_volume_cu_ft",
+    "items_per_handling_unit",
+    "cost_per_item"
+]
+
+
+@supply_import_bp.route("/upload", methods=["GET"])
+def supply_upload_form():
+    return render_template(
+        "simple_csv_upload.html",
+        title="Supply Import",
+        post_url="/api/import/supply/upload"
+    )
+
+
+@supply_import_bp.route("/upload", methods=["POST"])
+def import_supply():
+
+    if "file" not in request.files:
+        return jsonify({"error": "No file uploaded"}), 400
+
+    file = request.files["file"]
+    if not file.filename.endswith(".csv"):
+        return jsonify({"error": "CSV required"}), 400
+
+    try:
+        content = file.read().decode("utf-8")
+        reader = csv.DictReader(io.StringIO(content))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+    headers = set(reader.fieldnames or [])
+
+    missing = REQUIRED_HEADERS - headers
+    unexpected = headers - REQUIRED_HEADERS
+
+    if missing or unexpected:
+        return jsonify({
+            "status": "error",
+            "missing_headers": sorted(missing),
+            "unexpected_headers": sorted(unexpected)
+        }), 400
+
+    if import_validation.is_dry_run(request.args):
+        try:
+            report = import_validation.dry_run("supply", content)
+        except Exception as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(report), 200
+
+    if bulk_import.is_bulk_load(request.args):
+        return bulk_import.run("supply", content)
+
+    # Projected lookups: only the columns needed to resolve names and keys
+    entities = read.view_entities_scoped(columns=["entity_id", "name"])
+    locations = read.view_locations_scoped(columns=["location_id", "name"])
+    products = read.view_products_master_scoped(columns=["product_code"])
+
+    entities_by_name = {e["name"]: e["entity_id"] for e in entities}
+    locations_by_name = {l["name"]: l["location_id"] for l in locations}
+    product_codes = {p["product_code"] for p in products}
+
+    results = []
+    # key -> (row_idx, values); a later row for the same key supersedes the earlier one
+    pending = {}
+
+    for row_idx, row in enumerate(reader, start=2):
+        errors = []
+
+        entity_name = row["entity_name"].strip()
+        location_name = row["location_name"].strip()
+        product_code = row["product_code"].strip()
+
+        entity_id = entities_by_name.get(entity_name)
+        location_id = locations_by_name.get(location_name)
+
+        if entity_id is None:
+            errors.append(f"Entity not found: {entity_name}")
+        if location_id is None:
+            errors.append(f"Location not found: {location_name}")
+        if not product_code:
+            errors.append("product_code is required")
+        elif product_code not in product_codes:
+            errors.append(f"Product not found: {product_code}")
+
+        def parse_float(field, default=None):
+            raw = (row[field] or "").strip()
+            if raw == "" and default is not None:
+                return default
+            try:
+                return float(raw)
+            except ValueError:
+                errors.append(f"Invalid {field}")
+                return None
+
+        quantity = parse_float("quantity_available")
+        unit_weight = parse_float("unit_weight_lbs", 0.0)
+        unit_volume = parse_float("unit_volume_cu_ft", 0.0)
+        items_per_unit = parse_float("items_per_handling_unit", 1.0)
+        cost = parse_float("cost_per_item", 0.0)
+
+        if errors:
+            results.append({
+                "row": row_idx,
+                "status": "error",
+                "errors": errors
+            })
+            continue
+
+        key = (entity_id, location_id, product_code)
+        values = (
+            entity_id, location_id, product_code, quantity,
+            unit_weight, unit_volume, items_per_unit, cost
+        )
+
+        if key in pending:
+            results.append({
+                "row": pending[key][0],
+                "status": "skipped",
+                "errors": [f"Superseded by row {row_idx}"]
+            })
+        pending[key] = (row_idx, values)
+
+    def fail(chunk, e):
+        for _, (row_idx, _) in chunk:
+            results.append({
+                "row": row_idx,
+                "status": "error",
+                "errors": [str(e)]
+            })
+
+    # Existing keys are resolved per chunk through the product_code index,
+    # so the cost tracks the upload rather than the size of the supply table
+    for pending_chunk in chunked(list(pending.items()), DEFAULT_BATCH_SIZE):
+        try:
+            existing = read.view_supply_by_product_scoped(
+                product_codes=sorted({key[2] for key, _ in pending_chunk})
+            )
+        except Exception as e:
+            fail(pending_chunk, e)
+            continue
+
+        existing_by_key = {
+            (s["entity_id"], s["location_id"], s["product_code"]): s["supply_id"]
+            for s in existing
+        }
+        inserts = [(k, v) for k, v in pending_chunk if k not in existing_by_key]
+        updates = [(k, v) for k, v in pending_chunk if k in existing_by_key]
+
+        if inserts:
+            try:
+                batch.insert_rows_scoped(
+                    table="supply",
+                    columns=SUPPLY_COLUMNS,
+                    rows=[values for _, (_, values) in inserts]
+                )
+                for key, (row_idx, _) in inserts:
+                    results.append({
+                        "row": row_idx,
+                        "status": "success",
+                        "action": "created",
+                        "product_code": key[2]
+                    })
+            except Exception as e:
+                fail(inserts, e)
+
+        if updates:
+            try:
+                batch.update_rows_scoped(
+                    table="supply",
+                    key_column="supply_id",
+                    columns=SUPPLY_COLUMNS,
+                    rows=[(existing_by_key[key], *values) for key, (_, values) in updates]
+                )
+                for key, (row_idx, _) in updates:
+                    results.append({
+                        "row": row_idx,
+                        "status": "success",
+                        "action": "updated",
+                        "supply_id": existing_by_key[key],
+                        "product_code": key[2]
+                    })
+            except Exception as e:
+                fail(updates, e)
+
+    results.sort(key=lambda r: r["row"])
+
+    return jsonify({
+        "status": "completed",
+        "results": results
+    }), 200
@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify, render_template
 import csv
 import io
 
+import import_validation
+
 from db.functions.tenant_functions import (
     scoped_read as read,
     scoped_create as create,
@@ -65,6 +67,13 @@ def import_vehicles():
             "unexpected_headers": sorted(unexpected)
         }), 400
 
+    if import_validation.is_dry_run(request.args):
+        try:
+            report = import_validation.dry_run("vehicles", content)
+        except Exception as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(report), 200
+
     existing_vehicles = read.view_vehicles_scoped()
     existing_by_name = {v["name"]: v for v in existing_vehicles}
 
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The app modules import each other flat (e.g. `import logic`), the way
+# app.py runs them from inside frontend_flask.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "frontend_flask"))
@@ -0,0 +1,72 @@
+import datetime
+import io
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import access_db
+import columnar_export
+
+
+def read_back(data):
+    return pq.ParquetFile(io.BytesIO(data))
+
+
+def test_01_every_export_column_has_a_type():
+    assert set(access_db.CSV_EXPORT_COLUMNS) <= set(columnar_export.ROUTE_COST_TYPES)
+    assert set(access_db.MANIFEST_LINE_EXPORT_COLUMNS) <= set(columnar_export.MANIFEST_LINE_TYPES)
+
+
+def test_02_route_cost_schema():
+    data = columnar_export.to_parquet_bytes([], access_db.CSV_EXPORT_COLUMNS, columnar_export.ROUTE_COST_TYPES)
+    schema = read_back(data).schema_arrow
+
+    assert schema.names == access_db.CSV_EXPORT_COLUMNS
+    assert schema.field("scenario_id").type == pa.int64()
+    assert schema.field("run_date").type == pa.date32()
+    assert schema.field("route_name").type == pa.string()
+    assert schema.field("total_cost").type == pa.decimal128(12, 2)
+    assert schema.field("margin_est_entered").type == pa.float64()
+
+
+def test_03_values_are_converted():
+    columns = ["scenario_id", "run_date", "route_name", "total_cost", "margin_est_entered"]
+    rows = [
+        {"scenario_id": "4", "run_date": datetime.date(2026, 5, 1), "route_name": "Run 1",
+         "total_cost": 12.3456, "margin_est_entered": "0.25", "ignored": "x"},
+        {"scenario_id": 5, "run_date": None, "total_cost": "", "margin_est_entered": None},
+    ]
+    table = pq.read_table(io.BytesIO(
+        columnar_export.to_parquet_bytes(rows, columns, columnar_export.ROUTE_COST_TYPES)
+    ))
+
+    assert table.column_names == columns
+    assert table.to_pylist() == [
+        {"scenario_id": 4, "run_date": datetime.date(2026, 5, 1), "route_name": "Run 1",
+         "total_cost": Decimal("12.35"), "margin_est_entered": 0.25},
+        {"scenario_id": 5, "run_date": None, "route_name": None,
+         "total_cost": None, "margin_est_entered": None},
+    ]
+
+
+def test_04_row_groups(monkeypatch):
+    monkeypatch.setattr(columnar_export, "ROW_GROUP_ROWS", 2)
+    rows = ({"scenario_id": i} for i in range(5))
+    parquet = read_back(columnar_export.to_parquet_bytes(rows, ["scenario_id"], columnar_export.ROUTE_COST_TYPES))
+
+    assert parquet.metadata.num_row_groups == 3
+    assert parquet.metadata.num_rows == 5
+    assert parquet.metadata.row_group(0).column(0).compression == "ZSTD"
+
+
+def test_05_manifest_line_schema():
+    data = columnar_export.to_parquet_bytes(
+        [{"scenario_id": 1, "product_id": 17, "quantity": "3", "line_total": 9}],
+        access_db.MANIFEST_LINE_EXPORT_COLUMNS, columnar_export.MANIFEST_LINE_TYPES
+    )
+    row = pq.read_table(io.BytesIO(data)).to_pylist()[0]
+
+    assert row["product_id"] == "17"
+    assert row["quantity"] == 3.0
+    assert row["line_total"] == Decimal("9.00")
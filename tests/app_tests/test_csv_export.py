@@ -0,0 +1,91 @@
+import csv
+import io
+
+import access_db
+import logic
+
+
+def parse(chunks):
+    return list(csv.reader(io.StringIO("".join(chunks))))
+
+
+def test_01_header_on_empty_data():
+    # Empty exports still carry the header, so the file has a stable shape
+    assert list(logic.iter_csv_export([], ["a", "b"])) == ["a,b\n"]
+
+
+def test_02_one_chunk_per_row():
+    chunks = list(logic.iter_csv_export(iter([{"a": 1, "b": 2}, {"a": 3, "b": 4}]), ["a", "b"]))
+    assert chunks == ["a,b\n", "1,2\n", "3,4\n"]
+
+
+def test_03_missing_and_extra_keys():
+    rows = [{"b": "x", "extra": "ignored"}, {"a": 1}]
+    assert parse(logic.iter_csv_export(rows, ["a", "b"])) == [["a", "b"], ["", "x"], ["1", ""]]
+
+
+def test_04_values_are_quoted():
+    rows = [{"name": 'Farm, "North"\nbarn', "n": 1}]
+    assert parse(logic.iter_csv_export(rows, ["name", "n"])) == [["name", "n"], ['Farm, "North"\nbarn', "1"]]
+
+
+def test_05_rows_are_consumed_lazily():
+    seen = []
+
+    def rows():
+        for i in range(3):
+            seen.append(i)
+            yield {"a": i}
+
+    chunks = logic.iter_csv_export(rows(), ["a"])
+    assert next(chunks) == "a\n"
+    assert seen == []
+    assert next(chunks) == "0\n"
+    assert seen == [0]
+
+
+def test_06_route_detailed_sections():
+    details = {
+        "costs": {"route_name": "Run 1", "total_cost": 12.5},
+        "manifest": [{"product_name": "Apples", "quantity": 4}],
+    }
+    lines = "".join(access_db.iter_route_detailed_csv(details)).split("\n")
+
+    assert lines[0] == "ROUTE_SUMMARY"
+    assert lines[1] == ",".join(access_db.CSV_EXPORT_COLUMNS)
+    assert lines[3] == ""
+    assert lines[4] == "MANIFEST_ITEMS"
+    assert lines[5] == ",".join(access_db.MANIFEST_EXPORT_COLUMNS)
+    assert lines[6].startswith("Apples,4,")
+
+
+def test_07_all_routes_costed_per_chunk(monkeypatch):
+    class Conn:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    conns = []
+    costed = []
+
+    def get_db():
+        conns.append(Conn())
+        return conns[-1]
+
+    def get_complete_route_details(scenario_id, conn=None):
+        costed.append((scenario_id, conns.index(conn)))
+        return [[{"scenario_id": scenario_id}], []]
+
+    monkeypatch.setattr(access_db.read, "view_scenarios_scoped",
+                        lambda columns=None: [{"scenario_id": i} for i in range(1, 6)])
+    monkeypatch.setattr(access_db, "get_db", get_db)
+    monkeypatch.setattr(access_db.scenario_management, "get_complete_route_details", get_complete_route_details)
+    monkeypatch.setattr(access_db, "_calculate_route_internals",
+                        lambda header, items: (None, {"scenario_id": header["scenario_id"]}, None))
+
+    rows = list(access_db.iter_all_routes_raw(chunk_size=2))
+
+    assert [r["scenario_id"] for r in rows] == [1, 2, 3, 4, 5]
+    assert costed == [(1, 0), (2, 0), (3, 1), (4, 1), (5, 2)]
+    assert all(c.closed for c in conns)
@@ -0,0 +1,116 @@
+import pandas as pd
+
+import import_validation
+
+LOCATION_HEADER = "name,type,latitude,longitude,avg_load_minutes,avg_unload_minutes"
+SUPPLY_HEADER = (
+    "entity_name,location_name,product_code,quantity_available,"
+    "unit_weight_lbs,unit_volume_cu_ft,items_per_handling_unit,cost_per_item"
+)
+
+
+def frame(header, *lines):
+    return import_validation.load_frame("\n".join((header,) + lines) + "\n")
+
+def errors_by_row(import_type, df, references=None):
+    spec = import_validation.IMPORT_SPECS[import_type]
+    errors = import_validation.validate_frame(df, spec, references or {})
+    return errors.groupby("row")["error"].apply(list).to_dict()
+
+
+def test_01_is_dry_run():
+    assert import_validation.is_dry_run({"dry_run": "1"})
+    assert import_validation.is_dry_run({"dry_run": " True "})
+    assert import_validation.is_dry_run({"dry_run": "yes"})
+    assert not import_validation.is_dry_run({"dry_run": "0"})
+    assert not import_validation.is_dry_run({})
+
+
+def test_02_load_frame_keeps_text():
+    df = frame("product_code,name,storage_type", "007, Apples ,Dry", "NA,,Dry")
+    assert list(df["product_code"]) == ["007", "NA"]
+    assert list(df["name"]) == [" Apples ", ""]
+
+
+def test_03_valid_file_has_no_errors():
+    df = frame(LOCATION_HEADER, "Farm A,Farm,44.9,-123.0,10,15")
+    assert errors_by_row("locations", df) == {}
+
+
+def test_04_required_enum_and_ranges():
+    df = frame(
+        LOCATION_HEADER,
+        " ,Farm,44.9,-123.0,10,15",
+        "Farm B,castle,91,-123.0,10,15",
+        "Farm C,Farm,abc,,10.5,-1",
+    )
+    errors = errors_by_row("locations", df)
+
+    # Row numbers are file lines, the header is line 1
+    assert errors[2] == ["name is required"]
+    assert errors[3] == ["Invalid type: castle", "latitude must be <= 90"]
+    assert sorted(errors[4]) == sorted([
+        "Invalid latitude",
+        "longitude is required",
+        "avg_unload_minutes must be >= 0",
+        "avg_load_minutes must be a whole number",
+    ])
+
+
+def test_05_optional_numbers_may_be_blank():
+    df = frame(
+        "location_name,product_code,quantity_needed,max_price",
+        "Store,APL,5,",
+        "Store,PER,5,-2",
+    )
+    references = {"locations": {"Store"}, "products": {"APL", "PER"}}
+    errors = errors_by_row("demand", df, references)
+    assert errors == {3: ["max_price must be >= 0"]}
+
+
+def test_06_duplicate_keys_point_at_first_row():
+    df = frame(
+        "product_code,name,storage_type",
+        "APL,Apples,Dry",
+        "PER,Pears,Dry",
+        " APL ,Apples again,Dry",
+    )
+    errors = errors_by_row("products", df)
+    assert errors[2] == ["Duplicate product_code (first seen on row 2)"]
+    assert errors[4] == ["Duplicate product_code (first seen on row 2)"]
+    assert 3 not in errors
+
+
+def test_07_unresolved_references():
+    df = frame(
+        SUPPLY_HEADER,
+        "Grower,Farm A,APL,10,,,,",
+        "Nobody,Farm A,XYZ,10,,,,",
+    )
+    references = {"entities": {"Grower"}, "locations": {"Farm A"}, "products": {"APL"}}
+    errors = errors_by_row("supply", df, references)
+    assert errors == {3: ["entity_name not found: Nobody", "product_code not found: XYZ"]}
+
+
+def test_08_report_shape(monkeypatch):
+    monkeypatch.setattr(import_validation, "_load_reference", lambda name: {"Farm A"})
+    content = "name,origin_name,dest_name\nRun 1,Farm A,Farm A\nRun 2,Farm A,Market\n"
+
+    report = import_validation.dry_run("routes", content)
+
+    assert report == {
+        "status": "dry_run",
+        "valid": False,
+        "row_count": 2,
+        "error_count": 1,
+        "rows_with_errors": 1,
+        "results": [{"row": 3, "status": "error", "errors": ["dest_name not found: Market"]}],
+    }
+
+
+def test_09_empty_report_is_valid():
+    spec = import_validation.IMPORT_SPECS["products"]
+    errors = import_validation.validate_frame(frame("product_code,name,storage_type"), spec, {})
+    assert isinstance(errors, pd.DataFrame)
+    assert list(errors.columns) == ["row", "error"]
+    assert errors.empty
@@ -0,0 +1,129 @@
+from datetime import date
+
+import pytest
+from flask import Flask
+
+import access_db
+import routes_bp
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Filters handed to access_db.recalculate_all_routes by the endpoint."""
+    calls = []
+
+    def fake_recalculate_all_routes(**kwargs):
+        calls.append(kwargs)
+        return True, {"scenarios": 3, "seconds": 0.01, "scenarios_per_second": 300.0, "trip_miles_pending": 0}
+
+    monkeypatch.setattr(routes_bp.db, "recalculate_all_routes", fake_recalculate_all_routes)
+    return calls
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(routes_bp.routes_bp)
+    return app.test_client()
+
+
+def test_01_no_filters(client, calls):
+    resp = client.post("/routes/recalc-all", json={})
+    assert resp.status_code == 200
+    assert resp.get_json()["scenarios"] == 3
+    assert calls == [{"vehicle_id": None, "driver_id": None, "gas_price": None, "date_from": None, "date_to": None}]
+
+
+def test_02_filters_are_parsed(client, calls):
+    resp = client.post("/routes/recalc-all", data={
+        "vehicle_id": " 4 ", "driver_id": "", "gas_price": "4.25",
+        "date_from": "2026-03-01", "date_to": "2026-03-31",
+    })
+    assert resp.status_code == 200
+    assert calls == [{
+        "vehicle_id": 4, "driver_id": None, "gas_price": 4.25,
+        "date_from": date(2026, 3, 1), "date_to": date(2026, 3, 31),
+    }]
+
+
+def test_03_invalid_filters(client, calls):
+    resp = client.post("/routes/recalc-all", json={"vehicle_id": "x", "gas_price": "cheap", "date_from": "03/01/2026"})
+    assert resp.status_code == 400
+    assert set(resp.get_json()["errors"]) == {"vehicle_id", "gas_price", "date_from"}
+    assert calls == []
+
+
+def test_04_date_range_order(client, calls):
+    resp = client.post("/routes/recalc-all", json={"date_from": "2026-04-01", "date_to": "2026-03-01"})
+    assert resp.status_code == 400
+    assert resp.get_json()["errors"] == {"date_to": "Must be on or after date_from."}
+    assert calls == []
+
+
+class FakeConn:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def recalc(monkeypatch):
+    """access_db.recalculate_all_routes against recorded scenario_management calls."""
+    seen = {"conn": FakeConn(), "missing": [], "cached": [], "enqueued": [], "recalculated": []}
+
+    monkeypatch.setattr(access_db, "get_db", lambda: seen["conn"])
+    monkeypatch.setattr(access_db.scenario_management, "get_routes_missing_trip_miles",
+                        lambda conn=None, **filters: seen["missing"])
+    monkeypatch.setattr(access_db, "_cache_missing_trip_miles",
+                        lambda conn, routes=None, **filters: seen["cached"].append(routes))
+    monkeypatch.setattr(access_db.task_queue, "enqueue",
+                        lambda kind, key, payload=None, **kwargs: seen["enqueued"].append((kind, key, payload)))
+
+    def fake_recalculate_scenarios(gas_price=None, conn=None, **filters):
+        seen["recalculated"].append(dict(filters, gas_price=gas_price))
+        return 2
+
+    monkeypatch.setattr(access_db.scenario_management, "recalculate_scenarios", fake_recalculate_scenarios)
+    return seen
+
+
+def test_05_missing_miles_cached_inline(recalc, monkeypatch):
+    monkeypatch.setattr(access_db.task_queue, "is_running", lambda: False)
+    recalc["missing"] = [{"route_id": 1}]
+
+    ok, stats = access_db.recalculate_all_routes(vehicle_id=4, gas_price=4.25)
+
+    assert ok
+    assert stats["scenarios"] == 2
+    assert stats["trip_miles_pending"] == 0
+    assert recalc["cached"] == [[{"route_id": 1}]]
+    assert recalc["enqueued"] == []
+    assert recalc["recalculated"] == [
+        {"vehicle_id": 4, "driver_id": None, "date_from": None, "date_to": None, "gas_price": 4.25}
+    ]
+    assert recalc["conn"].closed
+
+
+def test_06_missing_miles_queued(recalc, monkeypatch):
+    monkeypatch.setattr(access_db.task_queue, "is_running", lambda: True)
+    recalc["missing"] = [{"route_id": 1}, {"route_id": 2}]
+
+    ok, stats = access_db.recalculate_all_routes(date_from=date(2026, 3, 1), gas_price=4.25)
+
+    assert ok
+    assert stats["trip_miles_pending"] == 2
+    assert recalc["cached"] == []
+    kind, key, payload = recalc["enqueued"][0]
+    assert kind == "recalculate_all"
+    assert payload == {"vehicle_id": None, "driver_id": None, "date_from": "2026-03-01",
+                       "date_to": None, "gas_price": 4.25}
+
+
+def test_07_errors_are_returned(recalc, monkeypatch):
+    def fail(**kwargs):
+        raise RuntimeError("Failed to connect to database")
+
+    monkeypatch.setattr(access_db.task_queue, "is_running", lambda: False)
+    monkeypatch.setattr(access_db.scenario_management, "recalculate_scenarios", fail)
+
+    assert access_db.recalculate_all_routes() == (False, "Failed to connect to database")
+    assert recalc["conn"].closed
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+import access_db
+
+ENDPOINTS = {
+    "origin_name": "Farm A", "origin_address_street": "1 Farm Rd", "origin_city": "Salem", "origin_state": "OR",
+    "origin_latitude": 44.9, "origin_longitude": -123.0,
+    "dest_name": "Store B", "dest_address_street": "2 Main St", "dest_city": "Portland", "dest_state": "OR",
+    "dest_latitude": 0, "dest_longitude": 0,
+}
+
+
+@pytest.fixture
+def mapbox(monkeypatch):
+    """In-memory route_geometries table and a counted Directions lookup."""
+    state = {
+        "cache": {},
+        "fetches": [],
+        "endpoints": {1: dict(ENDPOINTS)},
+        "result": {
+            "geometry": {"type": "LineString", "coordinates": [[-123.0, 44.9], [-122.7, 45.5]]},
+            "origin": [-123.0, 44.9], "dest": [-122.7, 45.5],
+            "distance_miles": 47.1, "duration_minutes": 52.0,
+        },
+    }
+
+    def save(pair_key, geojson, distance_miles, duration_minutes):
+        state["cache"][pair_key] = {"geojson": geojson}
+
+    def fetch(origin, dest):
+        state["fetches"].append((origin, dest))
+        return state["result"]
+
+    monkeypatch.setattr(access_db.scenario_management, "get_route_map_endpoints",
+                        lambda route_id: state["endpoints"].get(route_id))
+    monkeypatch.setattr(access_db.scenario_management, "get_route_geometry", lambda key: state["cache"].get(key))
+    monkeypatch.setattr(access_db.scenario_management, "save_route_geometry", save)
+    monkeypatch.setattr(access_db.logic, "fetch_mapbox_route_geometry", fetch)
+    return state
+
+
+def test_01_map_points():
+    # Stored coordinates are used; 0, 0 falls back to the address
+    assert access_db._map_point(ENDPOINTS, "origin") == [-123.0, 44.9]
+    assert access_db._map_point(ENDPOINTS, "dest") == "2 Main St Portland OR"
+
+
+def test_02_miss_fetches_and_caches(mapbox):
+    collection = access_db.get_route_geometry(1)
+
+    assert len(mapbox["fetches"]) == 1
+    assert [f["properties"]["kind"] for f in collection["features"]] == ["route", "origin", "dest"]
+    assert collection["properties"] == {"distance_miles": 47.1, "duration_minutes": 52.0}
+
+    key = access_db.get_route_map_info(1)["pair_key"]
+    assert json.loads(mapbox["cache"][key]["geojson"]) == collection
+
+
+def test_03_hit_skips_mapbox(mapbox):
+    first = access_db.get_route_geometry(1)
+    second = access_db.get_route_geometry(1)
+
+    assert second == first
+    assert len(mapbox["fetches"]) == 1
+
+
+def test_04_routes_share_endpoints(mapbox):
+    mapbox["endpoints"][2] = dict(ENDPOINTS, origin_name="Farm A (renamed)")
+    access_db.get_route_geometry(1)
+    access_db.get_route_geometry(2)
+    assert len(mapbox["fetches"]) == 1
+
+    mapbox["endpoints"][3] = dict(ENDPOINTS, origin_latitude=44.95)
+    access_db.get_route_geometry(3)
+    assert len(mapbox["fetches"]) == 2
+
+
+def test_05_failed_lookup_is_not_cached(mapbox):
+    mapbox["result"] = None
+    assert access_db.get_route_geometry(1) == {"type": "FeatureCollection", "features": [], "properties": {}}
+    assert mapbox["cache"] == {}
+
+    access_db.get_route_geometry(1)
+    assert len(mapbox["fetches"]) == 2
+
+
+def test_06_cache_write_failure_still_returns(mapbox, monkeypatch):
+    def fail(*args):
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(access_db.scenario_management, "save_route_geometry", fail)
+    collection = access_db.get_route_geometry(1)
+    assert len(collection["features"]) == 3
+
+
+def test_07_unknown_route(mapbox):
+    assert access_db.get_route_geometry(99) is None
+    assert mapbox["fetches"] == []
@@ -0,0 +1,54 @@
+import pytest
+from flask import Flask
+
+import access_db
+import routes_bp
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(routes_bp.routes_bp)
+    return app.test_client()
+
+
+def test_01_manifest_json_fields(client, monkeypatch):
+    manifest = [{
+        "manifest_item_id": 9, "product_id": "APL", "product_name": "Apples", "quantity": 2.0,
+        "items_per_unit": 10.0, "unit_price": 1.25, "cost_per_item": 0.5, "unit_weight": 20.0,
+        "unit_volume": 1.5, "line_total": 25.0,
+    }]
+    monkeypatch.setattr(routes_bp.db, "get_route_manifest", lambda route_id: manifest if route_id == 4 else None)
+
+    resp = client.get("/routes/4/manifest.json")
+
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["success"] is True
+    assert body["manifest"] == [{k: manifest[0][k] for k in routes_bp.MANIFEST_JSON_FIELDS}]
+
+
+def test_02_unknown_route(client, monkeypatch):
+    monkeypatch.setattr(routes_bp.db, "get_route_manifest", lambda route_id: None)
+    resp = client.get("/routes/5/manifest.json")
+    assert resp.status_code == 404
+    assert resp.get_json()["success"] is False
+
+
+def test_03_get_route_manifest(monkeypatch):
+    result_sets = {
+        1: [[{"scenario_id": 1}], [{"product_name": "Apples", "quantity_loaded": 2, "price_per_item": 1.25,
+                                    "items_per_unit": 10, "product_id": "APL"}]],
+        2: [[{"scenario_id": 2}]],
+        3: [[]],
+    }
+    monkeypatch.setattr(access_db.scenario_management, "get_complete_route_details",
+                        lambda route_id: result_sets[route_id])
+
+    manifest = access_db.get_route_manifest(1)
+    assert len(manifest) == 1
+    assert manifest[0]["product_name"] == "Apples"
+    assert manifest[0]["line_total"] == 25.0
+
+    assert access_db.get_route_manifest(2) == []
+    assert access_db.get_route_manifest(3) is None
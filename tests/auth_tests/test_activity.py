@@ -0,0 +1,90 @@
+import pytest
+
+import auth.activity as activity
+import auth.user_management as user_management
+
+
+class FakeCursor:
+    def __init__(self, statements):
+        self.statements = statements
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, list(params)))
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self.statements)
+
+    def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """Collects every batch handed to update_users_activity; no flusher thread is started."""
+    batches = []
+    monkeypatch.setattr(activity, "update_users_activity", lambda batch: batches.append(dict(batch)))
+    monkeypatch.setattr(activity, "_ensure_flusher", lambda: None)
+    monkeypatch.setattr(activity, "_pending", {})
+    monkeypatch.setattr(activity, "_last_written", {})
+    return batches
+
+
+def test_01_flush_writes_one_batch(writes):
+    activity.record_activity(1)
+    activity.record_activity("2")
+    activity.record_activity(1)
+
+    assert activity.flush() == 2
+    assert len(writes) == 1
+    assert set(writes[0]) == {1, 2}
+
+    # Nothing left to write
+    assert activity.flush() == 0
+    assert len(writes) == 1
+
+
+def test_02_written_users_are_throttled(writes):
+    activity.record_activity(1)
+    activity.flush()
+
+    # Within the interval the user is not recorded again
+    activity.record_activity(1)
+    assert activity.flush() == 0
+    assert len(writes) == 1
+
+
+def test_03_failed_flush_is_retried(writes, monkeypatch):
+    def fail(batch):
+        raise ConnectionError("down")
+
+    activity.record_activity(1)
+    monkeypatch.setattr(activity, "update_users_activity", fail)
+    assert activity.flush() == 0
+
+    monkeypatch.setattr(activity, "update_users_activity", lambda batch: writes.append(dict(batch)))
+    assert activity.flush() == 1
+    assert set(writes[0]) == {1}
+
+
+def test_04_update_users_activity_batches():
+    conn = FakeConnection()
+    user_management.update_users_activity({1: 100.5, 2: 200, 3: 300}, conn=conn, batch_size=2)
+
+    assert len(conn.statements) == 2
+    assert conn.commits == 1
+
+    sql, params = conn.statements[0]
+    assert sql.count("WHEN %s THEN FROM_UNIXTIME(%s)") == 2
+    assert params == [1, 100, 2, 200, 1, 2]
+
+    sql, params = conn.statements[1]
+    assert sql.count("WHEN %s THEN FROM_UNIXTIME(%s)") == 1
+    assert params == [3, 300, 3]
@@ -0,0 +1,117 @@
+import pytest
+
+import auth.anon_pool as anon_pool
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = None
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append(sql)
+        if "GET_LOCK" in sql:
+            self.result = (1 if self.conn.lock_free else 0,)
+        else:
+            self.result = (1,)
+
+    def fetchone(self):
+        return self.result
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self, lock_free=True):
+        self.lock_free = lock_free
+        self.statements = []
+        self.closed = False
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def created(monkeypatch):
+    """Records inline creations; the filler thread is not started."""
+    users = []
+
+    def fake_create(role="Anonymous"):
+        users.append(role)
+        return 100 + len(users), 200 + len(users)
+
+    monkeypatch.setattr(anon_pool, "create_anonymous_user", fake_create)
+    monkeypatch.setattr(anon_pool, "_ensure_filler", lambda: None)
+    monkeypatch.setattr(anon_pool, "ANON_POOL_SIZE", 3)
+    return users
+
+
+def test_01_claim_from_pool(created, monkeypatch):
+    monkeypatch.setattr(anon_pool, "claim_anonymous_user", lambda: (5, 6))
+    assert anon_pool.claim() == (5, 6)
+    assert created == []
+
+
+def test_02_empty_pool_creates_inline(created, monkeypatch):
+    monkeypatch.setattr(anon_pool, "claim_anonymous_user", lambda: None)
+    assert anon_pool.claim() == (101, 201)
+    assert created == ["Anonymous"]
+
+
+def test_03_failed_claim_creates_inline(created, monkeypatch):
+    def fail():
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(anon_pool, "claim_anonymous_user", fail)
+    assert anon_pool.claim() == (101, 201)
+    assert created == ["Anonymous"]
+
+
+def test_04_disabled_pool_is_not_touched(created, monkeypatch):
+    def unexpected():
+        raise AssertionError("pool should not be used")
+
+    monkeypatch.setattr(anon_pool, "ANON_POOL_SIZE", 0)
+    monkeypatch.setattr(anon_pool, "claim_anonymous_user", unexpected)
+    assert anon_pool.claim() == (101, 201)
+
+
+def test_05_refill_tops_up_under_lock(created, monkeypatch):
+    conn = FakeConnection()
+    monkeypatch.setattr(anon_pool, "get_auth_db", lambda: conn)
+    monkeypatch.setattr(anon_pool, "count_anonymous_pool", lambda: 1)
+
+    assert anon_pool.refill() == 2
+    assert created == ["AnonymousPool", "AnonymousPool"]
+    assert any("RELEASE_LOCK" in s for s in conn.statements)
+    assert conn.closed
+
+
+def test_06_refill_skips_when_locked(created, monkeypatch):
+    conn = FakeConnection(lock_free=False)
+    monkeypatch.setattr(anon_pool, "get_auth_db", lambda: conn)
+    monkeypatch.setattr(anon_pool, "count_anonymous_pool", lambda: 0)
+
+    assert anon_pool.refill() == 0
+    assert created == []
+    assert not any("RELEASE_LOCK" in s for s in conn.statements)
+    assert conn.closed
+
+
+def test_07_claim_anonymous_user_rows(monkeypatch):
+    import auth.user_management as user_management
+
+    calls = []
+    results = [[{"user_id": 9, "tenant_id": 4}], []]
+
+    def fake_execute_proc(proc_name, args, conn=None):
+        calls.append(proc_name)
+        return results.pop(0)
+
+    monkeypatch.setattr(user_management, "_execute_proc", fake_execute_proc)
+    assert user_management.claim_anonymous_user() == (9, 4)
+    assert user_management.claim_anonymous_user() is None
+    assert calls == ["claim_anonymous_user", "claim_anonymous_user"]
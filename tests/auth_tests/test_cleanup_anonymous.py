@@ -0,0 +1,143 @@
+import os
+
+import pytest
+
+os.environ.setdefault("ANON_MAX_AGE_SECONDS", "3600")
+import auth.cleanup_anonymous as cleanup_anonymous
+
+
+class Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+class AuthDB:
+    """Expired tenants and the cleanup queue, as the auth procs would keep them."""
+    def __init__(self, expired, queued=()):
+        self.expired = sorted(expired)
+        self.queue = set(queued)
+        self.commits = 0
+        self.closed = False
+
+    def cursor(self, **kwargs):
+        return AuthCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        self.closed = True
+
+class AuthCursor:
+    def __init__(self, db):
+        self.db = db
+        self.results = []
+        self.rows = []
+
+    def callproc(self, name, args):
+        assert name == "clean_anon_users"
+        _, limit = args
+        chunk, self.db.expired = self.db.expired[:limit], self.db.expired[limit:]
+        self.db.queue.update(chunk)
+        self.results = [Result([(t,) for t in chunk])]
+
+    def stored_results(self):
+        return iter(self.results)
+
+    def execute(self, sql, params):
+        if sql.startswith("SELECT"):
+            after, limit = params
+            self.rows = [(t,) for t in sorted(self.db.queue) if t > after][:limit]
+        else:
+            self.db.queue.difference_update(params)
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+class MainDB:
+    def __init__(self, fail_after=None):
+        self.deleted = []
+        self.fail_after = fail_after
+        self.closed = False
+
+    def cursor(self, **kwargs):
+        return MainCursor(self)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+class MainCursor:
+    def __init__(self, db):
+        self.db = db
+
+    def callproc(self, name, args):
+        assert name == "delete_tenant_data"
+        if self.db.fail_after is not None and len(self.db.deleted) >= self.db.fail_after:
+            raise ConnectionError("main DB went away")
+        self.db.deleted.append([int(t) for t in args[0].split(",")])
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def chunk_size(monkeypatch):
+    monkeypatch.setattr(cleanup_anonymous, "CLEANUP_CHUNK_SIZE", 2)
+
+def use(monkeypatch, auth_db, main_db):
+    monkeypatch.setattr(cleanup_anonymous, "get_auth_db", lambda: auth_db)
+    monkeypatch.setattr(cleanup_anonymous, "get_db", lambda: main_db)
+
+
+def test_01_cleanup_in_chunks(monkeypatch):
+    auth_db, main_db = AuthDB(expired=[5, 1, 4, 2, 3]), MainDB()
+    use(monkeypatch, auth_db, main_db)
+
+    assert cleanup_anonymous.cleanup() == 5
+    assert main_db.deleted == [[1, 2], [3, 4], [5]]
+    assert auth_db.queue == set()
+    assert auth_db.closed and main_db.closed
+
+
+def test_02_exact_chunk_makes_one_empty_call():
+    auth_db = AuthDB(expired=[1, 2, 3, 4])
+    assert cleanup_anonymous._expire_auth_tenants(auth_db) == 4
+    # Two full chunks, then an empty one ends the loop
+    assert auth_db.commits == 3
+
+
+def test_03_main_db_outage_keeps_queue(monkeypatch):
+    auth_db = AuthDB(expired=[1, 2, 3])
+    use(monkeypatch, auth_db, None)
+
+    assert cleanup_anonymous.cleanup() == 0
+    assert auth_db.queue == {1, 2, 3}
+
+    # The next run picks the queued tenants up
+    main_db = MainDB()
+    use(monkeypatch, auth_db, main_db)
+    assert cleanup_anonymous.cleanup() == 3
+    assert main_db.deleted == [[1, 2], [3]]
+
+
+def test_04_interrupted_run_resumes(monkeypatch):
+    auth_db, main_db = AuthDB(expired=[1, 2, 3, 4, 5]), MainDB(fail_after=1)
+    use(monkeypatch, auth_db, main_db)
+
+    with pytest.raises(ConnectionError):
+        cleanup_anonymous.cleanup()
+    # Only the committed chunk left the queue
+    assert auth_db.queue == {3, 4, 5}
+
+    main_db = MainDB()
+    use(monkeypatch, auth_db, main_db)
+    assert cleanup_anonymous.cleanup() == 3
+    assert main_db.deleted == [[3, 4], [5]]
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+
+import pytest
+
+import auth.rate_limit as rate_limit
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Memory backend with an empty table and a clock at the start of a 60s window."""
+    clock = Clock(6000.0)
+    monkeypatch.setattr(rate_limit, "time", clock)
+    monkeypatch.setattr(rate_limit, "_counters", OrderedDict())
+    monkeypatch.setattr(rate_limit, "_backend", rate_limit._memory_hit)
+    return clock
+
+def hits(key, count, limit=3):
+    return [rate_limit.allow("login", key, limit, 60) for _ in range(count)]
+
+
+def test_01_limit_within_window(clock):
+    assert hits("1.2.3.4", 4) == [True, True, True, False]
+
+    # Buckets and keys are counted separately
+    assert rate_limit.allow("register", "1.2.3.4", 3, 60)
+    assert rate_limit.allow("login", "5.6.7.8", 3, 60)
+
+
+def test_02_rejected_attempts_are_not_counted(clock):
+    hits("1.2.3.4", 10)
+    assert rate_limit._counters[("login", "1.2.3.4")][1] == 3
+
+
+def test_03_previous_window_is_weighted(clock):
+    hits("1.2.3.4", 3)
+
+    # Halfway into the next window, 3 * 0.5 = 1.5 hits still overlap
+    clock.now += 90
+    assert hits("1.2.3.4", 3) == [True, True, False]
+
+    # Near the end of the window they barely count: 3 * 0.05 + 2 leaves room for one more
+    clock.now += 27
+    assert hits("1.2.3.4", 2) == [True, False]
+
+
+def test_04_gap_longer_than_a_window_resets(clock):
+    hits("1.2.3.4", 3)
+    clock.now += 180
+    assert hits("1.2.3.4", 4) == [True, True, True, False]
+
+
+def test_05_keys_are_lru_bounded(clock, monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_MAX_KEYS", 2)
+    rate_limit.allow("login", "a", 3, 60)
+    rate_limit.allow("login", "b", 3, 60)
+    rate_limit.allow("login", "a", 3, 60)
+    rate_limit.allow("login", "c", 3, 60)
+    assert list(rate_limit._counters) == [("login", "a"), ("login", "c")]
+
+
+def test_06_mysql_falls_back_to_memory(clock, monkeypatch):
+    monkeypatch.setattr(rate_limit, "get_auth_db", lambda: None)
+    rate_limit.set_backend("mysql")
+    assert hits("1.2.3.4", 4) == [True, True, True, False]
+
+
+def test_07_unknown_backend():
+    with pytest.raises(ValueError):
+        rate_limit.set_backend("redis")
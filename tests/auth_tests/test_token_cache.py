@@ -0,0 +1,107 @@
+import time
+from collections import OrderedDict
+
+import jwt
+import pytest
+from flask import Flask
+
+import auth.tokens as tokens
+
+SECRET = "test-jwt-secret-0123456789abcdefghij"
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(tokens, "_token_cache", OrderedDict())
+    app = Flask(__name__)
+    app.config.update(
+        JWT_SECRET=SECRET,
+        JWT_ISSUER="test-issuer",
+        JWT_AUDIENCE="test-audience",
+        JWT_ACCESS_TTL_SECONDS=600,
+    )
+    with app.app_context():
+        yield app
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Counts the tokens that actually reach jwt.decode."""
+    calls = []
+    real_decode = jwt.decode
+
+    def counting_decode(token, *args, **kwargs):
+        calls.append(token)
+        return real_decode(token, *args, **kwargs)
+
+    monkeypatch.setattr(tokens.jwt, "decode", counting_decode)
+    return calls
+
+def mint(user_id=7):
+    return tokens.mint_access_token(user_id=user_id, tenant_id=3)
+
+
+def test_01_second_verify_is_cached(app, decodes):
+    token = mint()
+    first = tokens.verify_access_token(token)
+    second = tokens.verify_access_token(token)
+
+    assert first == second
+    assert first["sub"] == "7"
+    assert decodes == [token]
+
+
+def test_02_cached_claims_are_copies(app, decodes):
+    token = mint()
+    tokens.verify_access_token(token)["tid"] = "999"
+    assert tokens.verify_access_token(token)["tid"] == "3"
+
+
+def test_03_expired_entry_is_not_served(app, decodes, monkeypatch):
+    token = mint()
+    tokens.verify_access_token(token)
+    digest = tokens._token_digest(token)
+
+    # Past exp the cached entry is dropped and the token goes back to jwt.decode
+    later = time.time() + 601
+    monkeypatch.setattr(tokens.time, "time", lambda: later)
+    assert tokens._cached_claims(digest) is None
+    assert digest not in tokens._token_cache
+
+
+def test_04_secret_rotation_misses(app, decodes):
+    token = mint()
+    tokens.verify_access_token(token)
+
+    app.config["JWT_SECRET"] = SECRET + "-rotated"
+    with pytest.raises(jwt.InvalidSignatureError):
+        tokens.verify_access_token(token)
+
+
+def test_05_lru_bound(app, decodes, monkeypatch):
+    monkeypatch.setattr(tokens, "TOKEN_CACHE_SIZE", 2)
+    a, b, c = mint(1), mint(2), mint(3)
+
+    tokens.verify_access_token(a)
+    tokens.verify_access_token(b)
+    tokens.verify_access_token(a)  # a is now the most recent
+    tokens.verify_access_token(c)  # evicts b
+    assert len(tokens._token_cache) == 2
+
+    decodes.clear()
+    tokens.verify_access_token(a)
+    tokens.verify_access_token(b)
+    assert decodes == [b]
+
+
+def test_06_cache_disabled(app, decodes, monkeypatch):
+    monkeypatch.setattr(tokens, "TOKEN_CACHE_SIZE", 0)
+    token = mint()
+    tokens.verify_access_token(token)
+    tokens.verify_access_token(token)
+    assert decodes == [token, token]
+    assert len(tokens._token_cache) == 0
+
+
+def test_07_missing_token(app):
+    with pytest.raises(jwt.InvalidTokenError):
+        tokens.verify_access_token("")
@@ -0,0 +1,94 @@
+import pytest
+import jwt
+from flask import Flask, g
+
+import auth.middleware as middleware
+import auth.tokens as tokens
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update(
+        SECRET_KEY="test-secret",
+        JWT_SECRET="test-jwt-secret-0123456789abcdefghij",
+        JWT_ISSUER="test-issuer",
+        JWT_AUDIENCE="test-audience",
+        JWT_ACCESS_TTL_SECONDS=600,
+    )
+    middleware.install_auth_middleware(app)
+
+    @app.route("/page")
+    def page():
+        return str(g.user_id)
+
+    @app.route("/totp_setup", endpoint="auth.totp_setup")
+    def totp_setup():
+        return "setup"
+
+    @app.route("/logout", endpoint="logout")
+    def logout():
+        return "logout"
+
+    return app
+
+@pytest.fixture
+def totp_lookups(monkeypatch):
+    """Records get_user_totp calls; the user is confirmed unless the test says otherwise."""
+    calls = []
+    result = {"totp_confirmed": True}
+
+    def fake_get_user_totp(user_id):
+        calls.append(user_id)
+        return result
+
+    monkeypatch.setattr(middleware, "get_user_totp", fake_get_user_totp)
+    return calls, result
+
+def mint(app, **kwargs):
+    with app.app_context():
+        return tokens.mint_access_token(user_id=7, tenant_id=3, username="grower", **kwargs)
+
+def get_page(app, token):
+    client = app.test_client()
+    client.set_cookie("token", token)
+    return client.get("/page")
+
+
+def test_01_claim_only_when_confirmed(app):
+    def claims(token):
+        return jwt.decode(token, "test-jwt-secret-0123456789abcdefghij", algorithms=["HS256"],
+                          audience="test-audience", issuer="test-issuer")
+
+    assert claims(mint(app, totp_confirmed=True))["totp"] is True
+    assert "totp" not in claims(mint(app))
+
+
+def test_02_confirmed_token_skips_lookup(app, totp_lookups):
+    calls, _ = totp_lookups
+    resp = get_page(app, mint(app, totp_confirmed=True))
+    assert resp.status_code == 200
+    assert resp.get_data(as_text=True) == "7"
+    assert calls == []
+
+
+def test_03_token_without_claim_is_looked_up(app, totp_lookups):
+    calls, _ = totp_lookups
+    resp = get_page(app, mint(app))
+    assert resp.status_code == 200
+    assert calls == ["7"]
+
+
+def test_04_unconfirmed_user_goes_to_setup(app, totp_lookups):
+    calls, result = totp_lookups
+    result["totp_confirmed"] = False
+    resp = get_page(app, mint(app))
+    assert resp.status_code == 302
+    assert resp.headers["Location"].endswith("/totp_setup")
+
+
+def test_05_anonymous_token_skips_lookup(app, totp_lookups):
+    calls, _ = totp_lookups
+    resp = get_page(app, mint(app, is_anon=True))
+    assert resp.status_code == 200
+    assert calls == []
@@ -18,7 +18,9 @@ SQL_FILES = [
     r"db/procedures/update_trip_header.sql",
     r"db/procedures/get_complete_route_details.sql",
     r"db/procedures/refresh_trip_snapshots.sql",
-    r"db/procedures/generate_test_data.sql"
+    r"db/procedures/generate_test_data.sql",
+    r"db/procedures/task_procs.sql",
+    r"db/procedures/map_procs.sql"
 ]
 
 def create_test_db():
@@ -181,3 +183,17 @@ def test_11_generate_test_data(connection):
     
     
     assert statement_count/2 == (count_after - count_before)
+
+
+def test_12_task_procs(connection):
+    count_before = get_db_proc_count(connection)
+    statement_count = execute_sql_script(connection, SQL_FILES[10])
+    count_after = get_db_proc_count(connection)
+    assert statement_count == (count_after - count_before)
+
+
+def test_13_map_procs(connection):
+    count_before = get_db_proc_count(connection)
+    statement_count = execute_sql_script(connection, SQL_FILES[11])
+    count_after = get_db_proc_count(connection)
+    assert statement_count == (count_after - count_before)
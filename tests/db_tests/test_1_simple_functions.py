@@ -8,6 +8,7 @@ import db.functions.simple_functions.create as create
 import db.functions.simple_functions.delete as delete
 import random
 import string
+from frontend_flask import depreciation_insurance
 
 dotenv.load_dotenv()
 
@@ -621,4 +622,103 @@ def test_08_routes(connection, features_dict, schema_types):
     assert len(rows_after) == len(all_rows) - 1
     
     deleted_row = read.view_routes(1, connection, ids=new_id)
-    assert len(deleted_row) == 0
\ No newline at end of file
+    assert len(deleted_row) == 0
+
+def test_09_find_supply_and_demand(connection):
+    # 1. Pick a product/location pair from the generated supply rows
+    supply_rows = read.view_supply(1, connection)
+    target = random.choice(supply_rows)
+    product_code = target['product_code']
+    location_id = target['location_id']
+
+    # 2. Filter by product only
+    rows = read.find_supply(1, connection, product_code=product_code)
+    expected = [s for s in supply_rows if s['product_code'] == product_code]
+    assert len(rows) == len(expected)
+    assert all(r['product_code'] == product_code for r in rows)
+
+    # 3. Filter by product + location, projected columns
+    rows = read.find_supply(1, connection, columns=['supply_id', 'location_id'],
+                            product_code=product_code, location_id=location_id)
+    assert len(rows) >= 1
+    assert set(rows[0].keys()) == {'supply_id', 'location_id'}
+    assert all(r['location_id'] == location_id for r in rows)
+
+    # 4. Entity filter
+    rows = read.find_supply(1, connection, entity_id=target['entity_id'])
+    assert all(r['entity_id'] == target['entity_id'] for r in rows)
+
+    # 5. No filters behaves like view_supply
+    assert len(read.find_supply(1, connection)) == len(supply_rows)
+
+    # 6. Demand filters, including a quoted product code that matches nothing
+    demand_rows = read.view_demand(1, connection)
+    d = random.choice(demand_rows)
+    rows = read.find_demand(1, connection, product_code=d['product_code'], location_id=d['location_id'])
+    assert any(r['demand_id'] == d['demand_id'] for r in rows)
+    assert read.find_demand(1, connection, product_code="x' OR '1'='1") == []
+
+
+def test_10_lookup_by_name(connection):
+    locations = read.view_locations(1, connection)
+    targets = random.sample(locations, 2)
+    names = [t['name'] for t in targets] + ["No Such Place", "O'Brien's"]
+
+    rows = read.view_locations_by_name(1, names, conn=connection)
+    assert {r['name']: r['location_id'] for r in rows} == {t['name']: t['location_id'] for t in targets}
+    assert set(rows[0].keys()) == {'location_id', 'name'}
+
+    routes = read.view_routes(1, connection)
+    rows = read.view_routes_by_name(1, [routes[0]['name']], conn=connection)
+    assert routes[0]['route_id'] in [r['route_id'] for r in rows]
+
+    assert read.view_locations_by_name(1, [], conn=connection) == []
+
+
+def test_11_supply_by_product(connection):
+    supply_rows = read.view_supply(1, connection)
+    codes = list({s['product_code'] for s in random.sample(supply_rows, 2)})
+
+    rows = read.view_supply_by_product(1, codes + ["x' OR '1'='1"], conn=connection)
+    expected = {s['supply_id'] for s in supply_rows if s['product_code'] in codes}
+    assert {r['supply_id'] for r in rows} == expected
+    assert set(rows[0].keys()) == {'supply_id', 'entity_id', 'location_id', 'product_code'}
+
+    assert read.view_supply_by_product(1, [], conn=connection) == []
+
+
+def test_12_vehicle_cost_rates(connection):
+    # Generated per-mile columns must agree with the Python fallback used by logic.calculate_operating_costs
+    for yearly_mileage in (40000, 0):
+        new_id = create.add_vehicle(
+            tenant_id=1, name="Rate Check", mpg=8.5,
+            purchase_price=90000, yearly_mileage=yearly_mileage, salvage_value=18000,
+            annual_insurance_cost=4200, annual_maintenance_cost=6100,
+            max_weight_lbs=20000, max_volume_cubic_ft=1200, storage_type="Dry",
+            conn=connection
+        )
+        connection.commit()
+
+        row = read.view_vehicles(1, connection, ids=new_id)[0]
+        expected = depreciation_insurance.vehicle_cost_rates(
+            row['vehicle_purchase_price'], row['vehicle_estimated_salvage_value'],
+            row['vehicle_estimated_yearly_milage'],
+            row['annual_insurance_cost'], row['annual_maintenance_cost']
+        )
+        stored = (row['depreciation_per_mile'], row['insurance_per_mile'], row['maintenance_per_mile'])
+        assert [float(v) for v in stored] == pytest.approx(expected, abs=1e-6)
+
+        delete.delete_vehicle(1, new_id, conn=connection)
+        connection.commit()
+
+
+def test_13_demand_by_product(connection):
+    demand_rows = read.view_demand(1, connection)
+    codes = list({d['product_code'] for d in random.sample(demand_rows, 2)})
+
+    rows = read.view_demand_by_product(1, codes + ["x' OR '1'='1"], conn=connection)
+    expected = {d['demand_id'] for d in demand_rows if d['product_code'] in codes}
+    assert {r['demand_id'] for r in rows} == expected
+    assert set(rows[0].keys()) == {'demand_id', 'location_id', 'product_code'}
+
+    assert read.view_demand_by_product(1, [], conn=connection) == []
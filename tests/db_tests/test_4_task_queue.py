@@ -0,0 +1,176 @@
+import pytest
+import os
+import uuid
+import mysql.connector
+import dotenv
+
+import db.functions.task_queue as task_queue
+
+dotenv.load_dotenv()
+
+KIND = "test_task"
+task_queue.register_handler(KIND, lambda **kwargs: None)
+
+
+def connect_db():
+    try:
+        config = {
+            'user': os.getenv("DB_USER"),
+            'password': os.getenv("DB_PASSWORD"),
+            'host': os.getenv("DB_HOST"),
+            'port': os.getenv("DB_PORT"),
+            'database': 'test_db',
+            'connection_timeout': 10
+        }
+        return mysql.connector.connect(**config)
+    except Exception:
+        return None
+
+@pytest.fixture(scope="session")
+def connection():
+    conn = connect_db()
+    yield conn
+    if conn:
+        conn.close()
+
+@pytest.fixture(scope="function")
+def key(connection):
+    """A fresh task key; its row is removed after the test."""
+    key = uuid.uuid4().hex[:12]
+    yield key
+    cur = connection.cursor()
+    cur.execute("DELETE FROM task_queue WHERE task_key = %s", (task_queue.task_key(KIND, key),))
+    connection.commit()
+    cur.close()
+
+
+def status(connection, key):
+    return task_queue.get_status(KIND, key, tenant_id=1, conn=connection)
+
+def claim_ours(connection, key):
+    """Claims every due task and returns ours, or None if it was not handed out."""
+    claimed = task_queue._claim(10, conn=connection)
+    return next((t for t in claimed if t['task_key'] == task_queue.task_key(KIND, key)), None)
+
+def make_due(connection, key):
+    """Skips the retry backoff so the task can be claimed right away."""
+    cur = connection.cursor()
+    cur.execute("UPDATE task_queue SET run_after = NOW(3) WHERE task_key = %s", (task_queue.task_key(KIND, key),))
+    connection.commit()
+    cur.close()
+
+def backoff_seconds(row):
+    return (row['run_after'] - row['finished_at']).total_seconds()
+
+
+def test_enqueue_dedupes(connection, key):
+    task_queue.enqueue(KIND, key, {"n": 1}, tenant_id=1, conn=connection)
+    task_queue.enqueue(KIND, key, {"n": 2}, tenant_id=1, conn=connection)
+
+    cur = connection.cursor()
+    cur.execute("SELECT COUNT(*) FROM task_queue WHERE task_key = %s", (task_queue.task_key(KIND, key),))
+    assert cur.fetchone()[0] == 1
+    cur.close()
+
+    row = status(connection, key)
+    assert row['status'] == 'queued'
+    assert row['attempts'] == 0
+
+
+def test_claim_and_complete(connection, key):
+    task_queue.enqueue(KIND, key, tenant_id=1, conn=connection)
+
+    task = claim_ours(connection, key)
+    assert task is not None
+    assert task['attempts'] == 1
+    assert status(connection, key)['status'] == 'running'
+
+    # A running task is not handed out twice
+    assert claim_ours(connection, key) is None
+
+    task_queue._finish(task, None, conn=connection)
+    row = status(connection, key)
+    assert row['status'] == 'done'
+    assert row['last_error'] is None
+
+
+def test_rerun_while_running(connection, key):
+    task_queue.enqueue(KIND, key, tenant_id=1, conn=connection)
+    task = claim_ours(connection, key)
+
+    task_queue.enqueue(KIND, key, tenant_id=1, conn=connection)
+    row = status(connection, key)
+    assert row['status'] == 'running'
+    assert row['rerun'] == 1
+
+    task_queue._finish(task, None, conn=connection)
+    row = status(connection, key)
+    assert row['status'] == 'queued'
+    assert row['rerun'] == 0
+    assert row['attempts'] == 0
+
+
+def test_retry_backoff(connection, key):
+    task_queue.enqueue(KIND, key, tenant_id=1, conn=connection)
+
+    task = claim_ours(connection, key)
+    task_queue._finish(task, "RuntimeError: boom", conn=connection)
+    row = status(connection, key)
+    assert row['status'] == 'queued'
+    assert row['attempts'] == 1
+    assert row['last_error'] == "RuntimeError: boom"
+    assert backoff_seconds(row) == task_queue.TASK_RETRY_BASE_SECONDS
+
+    # Not claimed again until the backoff has passed
+    assert claim_ours(connection, key) is None
+
+    make_due(connection, key)
+    task = claim_ours(connection, key)
+    assert task['attempts'] == 2
+    task_queue._finish(task, "RuntimeError: boom", conn=connection)
+    row = status(connection, key)
+    expected = min(task_queue.TASK_RETRY_BASE_SECONDS * 2, task_queue.TASK_RETRY_MAX_SECONDS)
+    assert backoff_seconds(row) == expected
+
+
+def test_dead_letter(connection, key):
+    task_queue.enqueue(KIND, key, tenant_id=1, conn=connection)
+
+    for _ in range(task_queue.TASK_MAX_ATTEMPTS):
+        make_due(connection, key)
+        task = claim_ours(connection, key)
+        assert task is not None
+        task_queue._finish(task, "RuntimeError: boom", conn=connection)
+
+    row = status(connection, key)
+    assert row['status'] == 'dead'
+    assert row['attempts'] == task_queue.TASK_MAX_ATTEMPTS
+
+    make_due(connection, key)
+    assert claim_ours(connection, key) is None
+
+    # Enqueueing again revives it with fresh attempts
+    task_queue.enqueue(KIND, key, tenant_id=1, conn=connection)
+    row = status(connection, key)
+    assert row['status'] == 'queued'
+    assert row['attempts'] == 0
+    assert claim_ours(connection, key) is not None
+
+
+def test_stale_task_reclaimed(connection, key):
+    task_queue.enqueue(KIND, key, tenant_id=1, conn=connection)
+    assert claim_ours(connection, key) is not None
+
+    # Simulate a worker that died mid-run
+    cur = connection.cursor()
+    cur.execute(
+        "UPDATE task_queue SET started_at = NOW(3) - INTERVAL %s SECOND WHERE task_key = %s",
+        (task_queue.TASK_STALE_SECONDS + 60, task_queue.task_key(KIND, key))
+    )
+    connection.commit()
+    cur.close()
+
+    task = claim_ours(connection, key)
+    assert task is not None
+    assert task['attempts'] == 2
+    assert status(connection, key)['last_error'] == "Worker did not finish the task"
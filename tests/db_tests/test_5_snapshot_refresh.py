@@ -0,0 +1,190 @@
+import pytest
+import os
+import uuid
+import mysql.connector
+import dotenv
+from decimal import Decimal
+from flask import Flask, g
+
+import db.functions.simple_functions.read as read
+import db.functions.simple_functions.create as create
+import db.functions.simple_functions.update as update
+import db.functions.simple_functions.delete as delete
+import db.functions.scenario_management as scenario_funcs
+
+dotenv.load_dotenv()
+
+
+def connect_db():
+    try:
+        config = {
+            'user': os.getenv("DB_USER"),
+            'password': os.getenv("DB_PASSWORD"),
+            'host': os.getenv("DB_HOST"),
+            'port': os.getenv("DB_PORT"),
+            'database': 'test_db',
+            'connection_timeout': 10
+        }
+        return mysql.connector.connect(**config)
+    except Exception:
+        return None
+
+@pytest.fixture(scope="session")
+def connection():
+    conn = connect_db()
+    yield conn
+    if conn:
+        conn.close()
+
+@pytest.fixture(autouse=True)
+def tenant():
+    """scenario_management reads the tenant from flask.g"""
+    with Flask(__name__).app_context():
+        g.tenant_id = 1
+        yield 1
+
+@pytest.fixture(scope="function")
+def fleet(connection):
+    """
+    A route, driver and vehicle of our own with two scenarios on them, so the
+    expected snapshots are exact. Vehicle rates: depreciation 1.0, insurance
+    0.2 and maintenance 0.1 per mile.
+    """
+    tag = uuid.uuid4().hex[:8]
+    origin = create.add_location(1, f"Origin_{tag}", "Farm", "1 Farm Rd", "Salem", "OR", "97301", None,
+                                 44.9, -123.0, 20, 0, conn=connection)
+    dest = create.add_location(1, f"Dest_{tag}", "Store", "2 Main St", "Portland", "OR", "97201", None,
+                               45.5, -122.7, 0, 25, conn=connection)
+    route = create.add_route(1, f"Route_{tag}", origin, dest, conn=connection)
+    driver = create.add_driver(1, f"Driver_{tag}", 20.00, 15.00, conn=connection)
+    vehicle = create.add_vehicle(1, f"Truck_{tag}", 10.0, 90000, 10000, 10000, 2000, 1000,
+                                 5000, 500, "Dry", conn=connection)
+
+    scenarios = [
+        scenario_funcs.create_scenario(route, 100, vehicle_id=vehicle, driver_id=driver, run_date=run_date,
+                                       current_gas_price=4.00, depreciation=1.5, daily_insurance=2.5,
+                                       daily_maintenance=3.5, conn=connection)
+        for run_date in ("2026-03-01", "2026-04-01")
+    ]
+
+    yield {
+        "origin": origin, "dest": dest, "route": route, "driver": driver, "vehicle": vehicle,
+        "scenarios": scenarios, "tag": tag,
+    }
+
+    for scenario_id in scenarios:
+        delete.delete_plan(1, scenario_id, conn=connection)
+    delete.delete_route(1, route, conn=connection)
+    delete.delete_driver(1, driver, conn=connection)
+    delete.delete_vehicle(1, vehicle, conn=connection)
+    delete.delete_location(1, origin, conn=connection)
+    delete.delete_location(1, dest, conn=connection)
+
+
+def snapshots(connection, scenario_ids):
+    rows = read.view_scenarios(1, conn=connection, ids=scenario_ids)
+    return sorted(rows, key=lambda r: r['scenario_id'])
+
+
+def test_01_refresh_requires_a_filter(connection):
+    with pytest.raises(ValueError):
+        scenario_funcs.refresh_scenarios_bulk(conn=connection)
+
+
+def test_02_refresh_by_driver(connection, fleet):
+    update.update_driver(1, fleet['driver'], f"Driver_{fleet['tag']}", 31.50, 22.25, conn=connection)
+
+    refreshed = scenario_funcs.refresh_scenarios_bulk(driver_id=fleet['driver'], conn=connection)
+
+    assert refreshed == 2
+    for row in snapshots(connection, fleet['scenarios']):
+        assert row['snapshot_driver_wage'] == Decimal("31.50")
+        assert row['snapshot_driver_load_wage'] == Decimal("22.25")
+
+
+def test_03_vehicle_costs_from_trip_miles(connection, fleet):
+    scenario_funcs.set_route_trip_miles(fleet['route'], 100, 120, conn=connection)
+
+    refreshed = scenario_funcs.refresh_scenarios_bulk(vehicle_id=fleet['vehicle'], conn=connection)
+
+    assert refreshed == 2
+    for row in snapshots(connection, fleet['scenarios']):
+        assert row['snapshot_vehicle_mpg'] == Decimal("10.0")
+        assert row['snapshot_depreciation_per_mile'] == Decimal("100.000")
+        assert row['snapshot_daily_insurance'] == Decimal("20.00")
+        assert row['snapshot_daily_maintenance_cost'] == Decimal("10.00")
+        # The gas price is left alone
+        assert row['snapshot_gas_price'] == Decimal("4.000")
+
+
+def test_04_uncached_route_keeps_vehicle_costs(connection, fleet):
+    refreshed = scenario_funcs.refresh_scenarios_bulk(vehicle_id=fleet['vehicle'], conn=connection)
+
+    assert refreshed == 2
+    for row in snapshots(connection, fleet['scenarios']):
+        assert row['snapshot_depreciation_per_mile'] == Decimal("1.500")
+        assert row['snapshot_daily_insurance'] == Decimal("2.50")
+        assert row['snapshot_daily_maintenance_cost'] == Decimal("3.50")
+
+
+def test_05_refresh_by_location(connection, fleet):
+    update.update_location(1, fleet['origin'], f"Origin_{fleet['tag']}", "Farm", "1 Farm Rd", "Salem", "OR",
+                           "97301", None, 44.9, -123.0, 45, 0, conn=connection)
+
+    # Matches the location as the route origin
+    refreshed = scenario_funcs.refresh_scenarios_bulk(location_id=fleet['origin'], conn=connection)
+
+    assert refreshed == 2
+    for row in snapshots(connection, fleet['scenarios']):
+        assert row['snapshot_planned_load_minutes'] == 45
+        assert row['snapshot_planned_unload_minutes'] == 25
+
+
+def test_06_unchanged_rows_are_still_counted(connection, fleet):
+    scenario_funcs.refresh_scenarios_bulk(driver_id=fleet['driver'], conn=connection)
+    assert scenario_funcs.refresh_scenarios_bulk(driver_id=fleet['driver'], conn=connection) == 2
+
+
+def test_07_recalculate_by_date_range(connection, fleet):
+    march, april = fleet['scenarios']
+
+    refreshed = scenario_funcs.recalculate_scenarios(
+        vehicle_id=fleet['vehicle'], date_from="2026-04-01", date_to="2026-04-30",
+        gas_price=5.125, conn=connection
+    )
+
+    assert refreshed == 1
+    rows = {r['scenario_id']: r for r in snapshots(connection, fleet['scenarios'])}
+    assert rows[march]['snapshot_gas_price'] == Decimal("4.000")
+    assert rows[april]['snapshot_gas_price'] == Decimal("5.125")
+
+
+def test_08_recalculate_without_gas_price(connection, fleet):
+    refreshed = scenario_funcs.recalculate_scenarios(driver_id=fleet['driver'], date_from="2026-03-01", conn=connection)
+
+    assert refreshed == 2
+    for row in snapshots(connection, fleet['scenarios']):
+        assert row['snapshot_gas_price'] == Decimal("4.000")
+
+
+def test_09_recalculate_unmatched_filters(connection, fleet):
+    assert scenario_funcs.recalculate_scenarios(
+        vehicle_id=fleet['vehicle'], date_to="2026-01-01", conn=connection
+    ) == 0
+
+
+def test_10_recalculate_all_includes_ours(connection, fleet):
+    total = len(read.view_scenarios(1, conn=connection, columns=["scenario_id"]))
+    assert scenario_funcs.recalculate_scenarios(conn=connection) == total
+
+
+def test_11_routes_missing_trip_miles(connection, fleet):
+    def missing_ids(**filters):
+        rows = scenario_funcs.get_routes_missing_trip_miles(conn=connection, **filters)
+        return [r['route_id'] for r in rows]
+
+    assert missing_ids(vehicle_id=fleet['vehicle']) == [fleet['route']]
+    assert missing_ids(vehicle_id=fleet['vehicle'], date_to="2026-01-01") == []
+
+    scenario_funcs.set_route_trip_miles(fleet['route'], 100, 120, conn=connection)
+    assert missing_ids(vehicle_id=fleet['vehicle']) == []
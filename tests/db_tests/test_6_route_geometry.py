@@ -0,0 +1,92 @@
+import pytest
+import os
+import uuid
+import mysql.connector
+import dotenv
+from decimal import Decimal
+from flask import Flask, g
+
+import db.functions.simple_functions.read as read
+import db.functions.scenario_management as scenario_funcs
+
+dotenv.load_dotenv()
+
+
+def connect_db():
+    try:
+        config = {
+            'user': os.getenv("DB_USER"),
+            'password': os.getenv("DB_PASSWORD"),
+            'host': os.getenv("DB_HOST"),
+            'port': os.getenv("DB_PORT"),
+            'database': 'test_db',
+            'connection_timeout': 10
+        }
+        return mysql.connector.connect(**config)
+    except Exception:
+        return None
+
+@pytest.fixture(scope="session")
+def connection():
+    conn = connect_db()
+    yield conn
+    if conn:
+        conn.close()
+
+@pytest.fixture(scope="function")
+def tenant():
+    """scenario_management reads the tenant from flask.g"""
+    with Flask(__name__).app_context():
+        g.tenant_id = 1
+        yield g
+
+@pytest.fixture(scope="function")
+def pair_key(connection):
+    """A fresh pair key; its rows are removed after the test."""
+    key = uuid.uuid4().hex * 2
+    yield key
+    cur = connection.cursor()
+    cur.execute("DELETE FROM route_geometries WHERE pair_key = %s", (key,))
+    connection.commit()
+    cur.close()
+
+
+def test_01_miss_then_hit(connection, tenant, pair_key):
+    assert scenario_funcs.get_route_geometry(pair_key, conn=connection) is None
+
+    scenario_funcs.save_route_geometry(pair_key, '{"type":"FeatureCollection"}', 47.1, 52, conn=connection)
+    row = scenario_funcs.get_route_geometry(pair_key, conn=connection)
+
+    assert row['geojson'] == '{"type":"FeatureCollection"}'
+    assert row['distance_miles'] == Decimal("47.10")
+    assert row['duration_minutes'] == Decimal("52.00")
+
+
+def test_02_save_replaces(connection, tenant, pair_key):
+    scenario_funcs.save_route_geometry(pair_key, '{"v":1}', 10, 10, conn=connection)
+    scenario_funcs.save_route_geometry(pair_key, '{"v":2}', 20, 25, conn=connection)
+
+    row = scenario_funcs.get_route_geometry(pair_key, conn=connection)
+    assert row['geojson'] == '{"v":2}'
+    assert row['distance_miles'] == Decimal("20.00")
+
+
+def test_03_cache_is_per_tenant(connection, tenant, pair_key):
+    scenario_funcs.save_route_geometry(pair_key, '{"v":1}', 10, 10, conn=connection)
+
+    tenant.tenant_id = 2
+    assert scenario_funcs.get_route_geometry(pair_key, conn=connection) is None
+
+
+def test_04_route_map_endpoints(connection, tenant):
+    scenarios = read.view_scenarios(1, conn=connection, limit=1)
+    if not scenarios:
+        pytest.fail("No Scenarios found in DB. Please seed data first.")
+    scenario = scenarios[0]
+
+    endpoints = scenario_funcs.get_route_map_endpoints(scenario['scenario_id'], conn=connection)
+    assert endpoints['route_id'] == scenario['route_id']
+    assert endpoints['origin_name']
+    assert endpoints['dest_name']
+
+    assert scenario_funcs.get_route_map_endpoints(0, conn=connection) is None
@@ -0,0 +1,132 @@
+import pytest
+import os
+import uuid
+import mysql.connector
+import dotenv
+from decimal import Decimal
+from flask import Flask, g
+
+import db.functions.simple_functions.create as create
+import db.functions.simple_functions.delete as delete
+import db.functions.scenario_management as scenario_funcs
+
+dotenv.load_dotenv()
+
+# (name, quantity, items_per_unit, price_per_item, cost_per_item, unit_weight, unit_volume)
+LINES = [
+    ("Carrots", 1, 12, 0.50, 0.25, 15, 1.0),
+    ("Apples", 2, 10, 1.25, 0.50, 20, 1.5),
+    ("Beets", 3, 1, 4.10, 2.05, 10, 0.5),
+]
+
+
+def connect_db():
+    try:
+        config = {
+            'user': os.getenv("DB_USER"),
+            'password': os.getenv("DB_PASSWORD"),
+            'host': os.getenv("DB_HOST"),
+            'port': os.getenv("DB_PORT"),
+            'database': 'test_db',
+            'connection_timeout': 10
+        }
+        return mysql.connector.connect(**config)
+    except Exception:
+        return None
+
+@pytest.fixture(scope="session")
+def connection():
+    conn = connect_db()
+    yield conn
+    if conn:
+        conn.close()
+
+@pytest.fixture(scope="function")
+def tenant():
+    """scenario_management reads the tenant from flask.g"""
+    with Flask(__name__).app_context():
+        g.tenant_id = 1
+        yield g
+
+@pytest.fixture(scope="function")
+def scenarios(connection, tenant):
+    """One scenario with the LINES manifest and one with an empty manifest."""
+    tag = uuid.uuid4().hex[:8]
+    origin = create.add_location(1, f"Origin_{tag}", "Farm", "1 Farm Rd", "Salem", "OR", "97301", None,
+                                 44.9, -123.0, 20, 0, conn=connection)
+    dest = create.add_location(1, f"Dest_{tag}", "Store", "2 Main St", "Portland", "OR", "97201", None,
+                               45.5, -122.7, 0, 25, conn=connection)
+    route = create.add_route(1, f"Route_{tag}", origin, dest, conn=connection)
+
+    loaded = scenario_funcs.create_scenario(route, 100, run_date="2026-03-01", conn=connection)
+    empty = scenario_funcs.create_scenario(route, 50, run_date="2026-03-02", conn=connection)
+    for name, qty, per_unit, price, cost, weight, volume in LINES:
+        scenario_funcs.add_manifest_items(
+            loaded, name, qty, cost_per_item=cost, items_per_unit=per_unit,
+            unit_weight_lbs=weight, unit_volume=volume, price_per_item=price, conn=connection
+        )
+
+    yield {"loaded": loaded, "empty": empty, "route_name": f"Route_{tag}"}
+
+    delete.delete_plan(1, loaded, conn=connection)
+    delete.delete_plan(1, empty, conn=connection)
+    delete.delete_route(1, route, conn=connection)
+    delete.delete_location(1, origin, conn=connection)
+    delete.delete_location(1, dest, conn=connection)
+
+
+def summaries(connection):
+    headers, previews = scenario_funcs.get_route_summaries(conn=connection)
+    return {h['scenario_id']: h for h in headers}, previews
+
+
+def test_01_manifest_totals(connection, scenarios):
+    headers, _ = summaries(connection)
+    header = headers[scenarios['loaded']]
+
+    assert header['route_name'] == scenarios['route_name']
+    assert header['line_item_count'] == 3
+    assert header['calculated_revenue'] == Decimal("43.30")
+    assert header['total_cogs'] == Decimal("19.15")
+    assert header['total_weight_lbs'] == Decimal("85.00")
+    assert header['total_volume'] == Decimal("5.50")
+
+
+def test_02_totals_match_route_details(connection, scenarios):
+    headers, _ = summaries(connection)
+    header = headers[scenarios['loaded']]
+
+    # The dashboard totals must agree with the lines the route page costs
+    items = scenario_funcs.get_complete_route_details(scenarios['loaded'], conn=connection)[1]
+    revenue = sum(
+        (i['price_per_item'] * i['quantity_loaded'] * i['items_per_unit']).quantize(Decimal("0.01"))
+        for i in items
+    )
+    assert len(items) == header['line_item_count']
+    assert revenue == header['calculated_revenue']
+
+
+def test_03_empty_manifest(connection, scenarios):
+    headers, previews = summaries(connection)
+    header = headers[scenarios['empty']]
+
+    assert header['line_item_count'] == 0
+    assert header['calculated_revenue'] == 0
+    assert header['total_weight_lbs'] == 0
+    assert not [p for p in previews if p['scenario_id'] == scenarios['empty']]
+
+
+def test_04_preview_is_first_two_by_name(connection, scenarios):
+    _, previews = summaries(connection)
+    ours = sorted(
+        (p['product_name'], p['quantity']) for p in previews if p['scenario_id'] == scenarios['loaded']
+    )
+    assert ours == [("Apples", Decimal("2.00")), ("Beets", Decimal("3.00"))]
+
+
+def test_05_summaries_are_tenant_scoped(connection, scenarios, tenant):
+    tenant.tenant_id = 2
+    headers, previews = summaries(connection)
+
+    assert scenarios['loaded'] not in headers
+    assert not [p for p in previews if p['scenario_id'] == scenarios['loaded']]